@@ -1,17 +1,58 @@
 
+import io
 import os
+import csv
+import time
 import functools
 from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, send_file
-from werkzeug.security import check_password_hash, generate_password_hash
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, send_file,
+                   Response, stream_with_context)
 from models import db, Contact, Payment
+from ratelimit import DEFAULT_STORE, RequestLimiter, TokenBuckets
+from passwords import HashingBusy, password_hasher
+from payment_stats import add_to_payment_stats, move_payment_stats, stats_queries
 import json
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
 # Admin credentials (in production, use environment variables)
 ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME', 'admin')
-ADMIN_PASSWORD_HASH = generate_password_hash(os.environ.get('admin', 'admin123'))
+
+@functools.cache
+def admin_password_hash():
+    """ADMIN_PASSWORD_HASH if set, else the plain password from the environment, hashed on first login."""
+    return os.environ.get('ADMIN_PASSWORD_HASH') or password_hasher.hash(os.environ.get('admin', 'admin123'))
+
+EXPORT_BATCH_SIZE = 1000
+
+# Dashboard counters are cached briefly and dropped whenever a contact or payment changes
+DASHBOARD_CACHE_TTL = float(os.environ.get('DASHBOARD_CACHE_TTL', 30))
+_dashboard_cache = {}
+
+STATS_TREND_DAYS = int(os.environ.get('STATS_TREND_DAYS', 30))
+
+# Login attempts share the main app's buckets (RATE_LIMIT_* settings)
+LOGIN_ATTEMPTS_PER_MINUTE = int(os.environ.get('LOGIN_ATTEMPTS_PER_MINUTE', 10))
+ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE = int(os.environ.get('ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE', 5))
+
+def _login_limited(retry_after):
+    flash(f'Too many login attempts. Please try again in {max(1, int(retry_after + 0.999))} seconds.', 'error')
+    return redirect(url_for('admin.login'))
+
+rate_limiter = RequestLimiter(
+    TokenBuckets(os.environ.get('RATE_LIMIT_STORE', DEFAULT_STORE)),
+    enabled=os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    proxy_count=int(os.environ.get('RATE_LIMIT_PROXY_COUNT', 0)),
+    on_limit=_login_limited,
+)
+
+def _stats_cursor():
+    """DB-API cursor in the session's transaction, for keeping ``payment_daily_stats`` in step."""
+    return db.session.connection().connection.cursor()
+
+def _stats_row(payment, **previous):
+    return dict(created_at=payment.created_at, level=payment.level, status=payment.status,
+                total_amount=payment.total_amount, **previous)
 
 def login_required(f):
     @functools.wraps(f)
@@ -22,12 +63,20 @@ def login_required(f):
     return decorated_function
 
 @admin_bp.route('/login', methods=['GET', 'POST'])
+@rate_limiter.limit('admin-login', LOGIN_ATTEMPTS_PER_MINUTE, 60,
+                    account_field='username', per_account=ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE)
 def login():
     if request.method == 'POST':
         username = request.form.get('username')
         password = request.form.get('password')
         
-        if username == ADMIN_USERNAME and check_password_hash(ADMIN_PASSWORD_HASH, password):
+        try:
+            valid = username == ADMIN_USERNAME and password_hasher.verify(admin_password_hash(), password)
+        except HashingBusy:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('admin_login.html'), 503
+        
+        if valid:
             session['admin_logged_in'] = True
             session['admin_username'] = username
             flash('Login successful!', 'success')
@@ -48,23 +97,30 @@ def logout():
 @admin_bp.route('/dashboard')
 @login_required
 def dashboard():
-    # Get statistics
-    total_contacts = Contact.query.count()
-    total_payments = Payment.query.count()
-    pending_payments = Payment.query.filter_by(status='pending').count()
-    approved_payments = Payment.query.filter_by(status='approved').count()
-    
-    # Recent submissions
-    recent_contacts = Contact.query.order_by(Contact.created_at.desc()).limit(5).all()
-    recent_payments = Payment.query.order_by(Payment.created_at.desc()).limit(5).all()
+    data = _dashboard_cache.get('data')
+    if data is None or data[0] < time.monotonic():
+        # All counters in one aggregate query
+        total_contacts, total_payments, pending_payments, approved_payments = db.session.query(
+            db.select(db.func.count(Contact.id)).scalar_subquery(),
+            db.func.count(Payment.id),
+            db.func.count(Payment.id).filter(Payment.status == 'pending'),
+            db.func.count(Payment.id).filter(Payment.status == 'approved'),
+        ).select_from(Payment).one()
+        
+        # Recent submissions
+        recent_contacts = Contact.query.order_by(Contact.created_at.desc()).limit(5).all()
+        recent_payments = Payment.query.order_by(Payment.created_at.desc()).limit(5).all()
+        
+        data = (time.monotonic() + DASHBOARD_CACHE_TTL, dict(
+            total_contacts=total_contacts,
+            total_payments=total_payments,
+            pending_payments=pending_payments,
+            approved_payments=approved_payments,
+            recent_contacts=recent_contacts,
+            recent_payments=recent_payments))
+        _dashboard_cache['data'] = data
     
-    return render_template('admin/admin_dashboard.html', 
-                         total_contacts=total_contacts,
-                         total_payments=total_payments,
-                         pending_payments=pending_payments,
-                         approved_payments=approved_payments,
-                         recent_contacts=recent_contacts,
-                         recent_payments=recent_payments)
+    return render_template('admin/admin_dashboard.html', **data[1])
 
 @admin_bp.route('/contacts')
 @login_required
@@ -86,6 +142,7 @@ def delete_contact(contact_id):
     contact = Contact.query.get_or_404(contact_id)
     db.session.delete(contact)
     db.session.commit()
+    _dashboard_cache.clear()
     flash('Contact deleted successfully!', 'success')
     return redirect(url_for('admin.contacts'))
 
@@ -116,13 +173,18 @@ def view_payment(payment_id):
 @admin_bp.route('/payments/<int:payment_id>/update_status', methods=['POST'])
 @login_required
 def update_payment_status(payment_id):
-    payment = Payment.query.get_or_404(payment_id)
     new_status = request.form.get('status')
     
     if new_status in ['pending', 'approved', 'rejected']:
+        # Locked so a concurrent change cannot move the rollup from a stale status
+        payment = Payment.query.filter_by(id=payment_id).with_for_update().first_or_404()
+        previous_status = payment.status
         payment.status = new_status
         payment.updated_at = datetime.utcnow()
+        db.session.flush()
+        move_payment_stats(_stats_cursor(), [_stats_row(payment, previous_status=previous_status)])
         db.session.commit()
+        _dashboard_cache.clear()
         flash(f'Payment status updated to {new_status}!', 'success')
     else:
         flash('Invalid status!', 'error')
@@ -132,9 +194,9 @@ def update_payment_status(payment_id):
 @admin_bp.route('/payments/<int:payment_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_payment(payment_id):
-    payment = Payment.query.get_or_404(payment_id)
-    
     if request.method == 'POST':
+        payment = Payment.query.filter_by(id=payment_id).with_for_update().first_or_404()
+        previous = dict(previous_level=payment.level, previous_amount=payment.total_amount)
         payment.full_name = request.form.get('full_name')
         payment.matric_number = request.form.get('matric_number')
         payment.level = int(request.form.get('level', 0))
@@ -144,16 +206,20 @@ def edit_payment(payment_id):
         payment.transaction_ref = request.form.get('transaction_ref')
         payment.updated_at = datetime.utcnow()
         
+        db.session.flush()
+        move_payment_stats(_stats_cursor(), [_stats_row(payment, **previous)])
         db.session.commit()
+        _dashboard_cache.clear()
         flash('Payment updated successfully!', 'success')
         return redirect(url_for('admin.view_payment', payment_id=payment_id))
     
+    payment = Payment.query.get_or_404(payment_id)
     return render_template('admin/admin_edit_payment.html', payment=payment)
 
 @admin_bp.route('/payments/<int:payment_id>/delete', methods=['POST'])
 @login_required
 def delete_payment(payment_id):
-    payment = Payment.query.get_or_404(payment_id)
+    payment = Payment.query.filter_by(id=payment_id).with_for_update().first_or_404()
     
     # Delete associated receipt file if exists
     if payment.receipt_filename:
@@ -162,7 +228,10 @@ def delete_payment(payment_id):
             os.remove(receipt_path)
     
     db.session.delete(payment)
+    db.session.flush()
+    add_to_payment_stats(_stats_cursor(), [_stats_row(payment)], sign=-1)
     db.session.commit()
+    _dashboard_cache.clear()
     flash('Payment deleted successfully!', 'success')
     return redirect(url_for('admin.payments'))
 
@@ -176,82 +245,63 @@ def view_receipt(filename):
         flash('Receipt file not found!', 'error')
         return redirect(url_for('admin.payments'))
 
+def _stream_csv(query, header, values):
+    """Yield CSV chunks for a query, fetched in batches from a server-side cursor."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+    writer.writerow(header)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for i, record in enumerate(query.yield_per(EXPORT_BATCH_SIZE), start=1):
+        writer.writerow(['' if v is None else v for v in values(record)])
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _csv_response(prefix, rows):
+    filename = f"{prefix}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return Response(stream_with_context(rows), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 @admin_bp.route('/export/contacts')
 @login_required
 def export_contacts():
-    contacts = Contact.query.all()
-    
-    # Create CSV content
-    csv_content = "ID,Name,Email,Subject,Message,Created At\n"
-    for contact in contacts:
-        csv_content += f'"{contact.id}","{contact.name}","{contact.email}","{contact.subject}","{contact.message.replace(chr(34), chr(34)+chr(34))}","{contact.created_at}"\n'
-    
-    # Save to file
-    filename = f"contacts_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    filepath = os.path.join('uploads', filename)
-    os.makedirs('uploads', exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(csv_content)
-    
-    return send_file(filepath, as_attachment=True, download_name=filename)
+    query = Contact.query.order_by(Contact.created_at.desc())
+    rows = _stream_csv(
+        query,
+        ['ID', 'Name', 'Email', 'Subject', 'Message', 'Created At'],
+        lambda c: (c.id, c.name, c.email, c.subject, c.message, c.created_at))
+    return _csv_response('contacts', rows)
 
 @admin_bp.route('/export/payments')
 @login_required
 def export_payments():
-    payments = Payment.query.all()
-    
-    # Create CSV content
-    csv_content = "ID,Full Name,Matric Number,Level,Email,Phone,Total Amount,Status,Transaction Ref,Created At\n"
-    for payment in payments:
-        csv_content += f'"{payment.id}","{payment.full_name}","{payment.matric_number}","{payment.level}","{payment.email}","{payment.phone_number}","{payment.total_amount}","{payment.status}","{payment.transaction_ref or ""}","{payment.created_at}"\n'
-    
-    # Save to file
-    filename = f"payments_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    filepath = os.path.join('uploads', filename)
-    os.makedirs('uploads', exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(csv_content)
-    
-    return send_file(filepath, as_attachment=True, download_name=filename)
+    query = Payment.query.order_by(Payment.created_at.desc())
+    rows = _stream_csv(
+        query,
+        ['ID', 'Full Name', 'Matric Number', 'Level', 'Email', 'Phone',
+         'Total Amount', 'Status', 'Transaction Ref', 'Created At'],
+        lambda p: (p.id, p.full_name, p.matric_number, p.level, p.email, p.phone_number,
+                   p.total_amount, p.status, p.transaction_ref, p.created_at))
+    return _csv_response('payments', rows)
 
 @admin_bp.route('/stats')
 @login_required
 def stats():
-    # Payment statistics by level
-    level_stats = db.session.query(
-        Payment.level,
-        db.func.count(Payment.id),
-        db.func.sum(Payment.total_amount)
-    ).group_by(Payment.level).all()
-
-    # Payment statistics by status
-    status_stats = db.session.query(
-        Payment.status,
-        db.func.count(Payment.id),
-        db.func.sum(Payment.total_amount)
-    ).group_by(Payment.status).all()
-
-    # Detect which database we're using
-    engine_name = db.engine.name  # 'postgresql', 'sqlite', etc.
-
-    # Monthly payment trends
-    if engine_name == 'sqlite':
-        month_expr = db.func.strftime('%Y-%m', Payment.created_at)
-    else:
-        month_expr = db.func.to_char(Payment.created_at, 'YYYY-MM')
-
-    monthly_stats = db.session.query(
-        month_expr.label('month'),
-        db.func.count(Payment.id).label('count'),
-        db.func.sum(Payment.total_amount).label('total')
-    ).group_by('month').order_by('month').all()
-
-    return render_template(
-        'admin_stats.html',
-        level_stats=level_stats,
-        status_stats=status_stats,
-        monthly_stats=monthly_stats
-    )
-
+    # Sums over the payment_daily_stats rollup, the same queries as the main app's /admin/stats
+    connection = db.session.connection()
+    level_stats, status_stats, monthly_stats, daily_stats = [
+        connection.exec_driver_sql(sql, params).all() for sql, params in stats_queries(STATS_TREND_DAYS)]
+    status_totals = {row.status: row.count for row in status_stats}
+    return render_template('admin_stats.html',
+                           level_stats=level_stats,
+                           status_stats=status_stats,
+                           monthly_stats=monthly_stats,
+                           daily_stats=daily_stats,
+                           trend_days=STATS_TREND_DAYS,
+                           approved_count=status_totals.get('approved', 0),
+                           pending_count=status_totals.get('pending', 0),
+                           total_amount=sum(row.total or 0 for row in status_stats))
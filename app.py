@@ -1,27 +1,52 @@
+import io
 import os
+import base64
+import hashlib
 import re
+import csv
+import time
+import atexit
+import threading
 import json
 import logging
+import math
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 from functools import wraps
 from urllib.parse import urlparse
 
 from flask import (
-    Flask, render_template, request, flash, redirect,
-    url_for, jsonify, send_file, session
+    Flask, render_template, request, flash, redirect, before_render_template, template_rendered,
+    url_for, jsonify, send_file, session, g, Response, stream_with_context, has_request_context
 )
 from flask_mail import Mail, Message
-from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
+from markupsafe import Markup, escape
 
 import psycopg
+from psycopg.pq import TransactionStatus
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool, PoolTimeout
+
+from course_search import CourseSearchIndex
+from images import ImagePipeline, MIME_TYPES, DEFAULT_WIDTHS
+from assets import AssetBundles, BUNDLES, compress
+from notifications import EmailOutbox, queue_email, queue_emails
+from storage import create_storage, is_content_key
+from thumbnails import ReceiptThumbnailer, thumbnail_key
+from replicas import ReplicaRouter
+from async_db import AsyncReadPool
+from ratelimit import DEFAULT_STORE, RequestLimiter, TokenBuckets
+from passwords import HashingBusy, password_hasher
+from payment_stats import add_to_payment_stats, move_payment_stats, rebuild_payment_stats, stats_queries
+from migrations import Migration, apply_migrations, schema_version
+from profiling import (DEFAULT_PROFILE_STORE, EndpointStats, ErrorCounter, ProfilingCursor, RequestProfile,
+                       current_profile)
 
 # =========================================================
 # --- CONFIGURATION ---
 # =========================================================
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
 
 app = Flask(__name__)
 
@@ -47,12 +72,19 @@ app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1 hour
 # =========================================================
 app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
 app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = True
+app.config['MAIL_USE_TLS'] = os.environ.get('MAIL_USE_TLS', 'true').lower() in ('1', 'true', 'yes')
 app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
 app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER')
 mail = Mail(app)
 
+# Outgoing mail is queued in the email_outbox table and sent by a background thread
+MAIL_QUEUE_BATCH_SIZE = int(os.environ.get('MAIL_QUEUE_BATCH_SIZE', 50))
+MAIL_QUEUE_WORKERS = int(os.environ.get('MAIL_QUEUE_WORKERS', 2))
+MAIL_QUEUE_RATE = float(os.environ.get('MAIL_QUEUE_RATE', 5))  # messages per second
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.environ.get('MAIL_QUEUE_MAX_ATTEMPTS', 5))
+RESULT_NOTICE_DELAY = int(os.environ.get('RESULT_NOTICE_DELAY', 300))  # coalesces per-course uploads
+
 # =========================================================
 # --- UPLOAD CONFIG ---
 # =========================================================
@@ -65,206 +97,803 @@ def allowed_file(filename):
 
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Receipts are stored content-addressed ('local' sharded directories or the 'memory' object-store stand-in)
+RECEIPT_STORAGE = os.environ.get('RECEIPT_STORAGE', 'local')
+RECEIPT_MAX_AGE = 7 * 24 * 3600  # receipt keys are content hashes, so they never change
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+receipt_storage = create_storage(RECEIPT_STORAGE, app.config['UPLOAD_FOLDER'])
+receipt_thumbnails = ReceiptThumbnailer(receipt_storage, workers=int(os.environ.get('THUMBNAIL_WORKERS', 2)))
+
 # =========================================================
 # --- DATABASE CONNECTION HELPERS ---
 # =========================================================
-def get_db_connection():
-    """Get a psycopg connection to the PostgreSQL database."""
-    url = os.environ.get("DATABASE_URL")
-    if not url:
-        raise RuntimeError("DATABASE_URL environment variable must be set")
-    
-    # Normalize URL for psycopg
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # seconds to wait for a free connection
+DB_POOL_MAX_IDLE = float(os.environ.get('DB_POOL_MAX_IDLE', 300))
+
+# Optional streaming replica for heavy read-only pages; writes always go to DATABASE_URL
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))  # seconds; beyond this reads use the primary
+REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', 2))
+REPLICA_RETRY_AFTER = float(os.environ.get('REPLICA_RETRY_AFTER', 30))  # after the replica was unreachable
+
+# Run the independent queries of the heavy read pages concurrently on psycopg's async pool
+ASYNC_READS = os.environ.get('ASYNC_READS', 'false').lower() in ('1', 'true', 'yes')
+ASYNC_DB_POOL_MIN_SIZE = int(os.environ.get('ASYNC_DB_POOL_MIN_SIZE', DB_POOL_MIN_SIZE))
+ASYNC_DB_POOL_MAX_SIZE = int(os.environ.get('ASYNC_DB_POOL_MAX_SIZE', DB_POOL_MAX_SIZE))
+
+_db_pool = None
+_replica_pool = None
+_async_pools = {}
+_db_pool_lock = threading.Lock()
+
+def normalize_database_url(url):
+    """Return ``url`` in the form psycopg expects."""
     if url.startswith("postgres://"):
         url = url.replace("postgres://", "postgresql://", 1)
     elif url.startswith("postgresql+psycopg://"):
         url = url.replace("postgresql+psycopg://", "postgresql://", 1)
+    return url
+
+def get_database_url():
+    """Return DATABASE_URL normalized for psycopg."""
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        raise RuntimeError("DATABASE_URL environment variable must be set")
+    return normalize_database_url(url)
+
+def _open_pool(url, name):
+    return ConnectionPool(
+        url,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        timeout=DB_POOL_TIMEOUT,
+        max_idle=DB_POOL_MAX_IDLE,
+        kwargs={'row_factory': dict_row, 'autocommit': False, 'cursor_factory': ProfilingCursor},
+        check=ConnectionPool.check_connection,
+        name=name,
+        open=True,
+    )
+
+def get_db_pool():
+    """Get the process-wide connection pool, creating it on first use."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = _open_pool(get_database_url(), 'app')
+    return _db_pool
+
+def get_replica_pool():
+    """Get the pool for DATABASE_REPLICA_URL, creating it on first use."""
+    global _replica_pool
+    if _replica_pool is None:
+        with _db_pool_lock:
+            if _replica_pool is None:
+                _replica_pool = _open_pool(normalize_database_url(DATABASE_REPLICA_URL), 'replica')
+    return _replica_pool
+
+def get_async_read_pool(replica=False):
+    """Get the async pool for the primary (or the replica), creating it on first use."""
+    key = 'replica' if replica else 'primary'
+    pool = _async_pools.get(key)
+    if pool is None:
+        with _db_pool_lock:
+            pool = _async_pools.get(key)
+            if pool is None:
+                url = normalize_database_url(DATABASE_REPLICA_URL) if replica else get_database_url()
+                pool = _async_pools[key] = AsyncReadPool(
+                    url, min_size=ASYNC_DB_POOL_MIN_SIZE, max_size=ASYNC_DB_POOL_MAX_SIZE,
+                    timeout=DB_POOL_TIMEOUT, name=f'async-{key}')
+    return pool
+
+def close_db_pool():
+    """Close the connection pools (at exit, or before re-creating them)."""
+    global _db_pool, _replica_pool
+    with _db_pool_lock:
+        for pool in (_db_pool, _replica_pool, *_async_pools.values()):
+            if pool is not None:
+                pool.close()
+        _db_pool = _replica_pool = None
+        _async_pools.clear()
+
+atexit.register(close_db_pool)
+
+def reset_db_pools_after_fork():
+    """Drop pools inherited from the parent process and open a fresh primary pool.
+
+    Call first thing in a forked worker (gunicorn ``post_fork``). The
+    parent's pools own its sockets and maintenance threads, which do not
+    survive a fork; closing them from the child would also close the
+    parent's connections, so they are only forgotten.
+    """
+    global _db_pool, _replica_pool, _db_pool_lock
+    _db_pool_lock = threading.Lock()
+    _db_pool = _replica_pool = None
+    _async_pools.clear()
+    return get_db_pool()
+
+def get_db_connection():
+    """Check out a pooled psycopg connection.
+
+    Use as ``with get_db_connection() as conn:``. On exit the transaction is
+    committed (or rolled back if an exception escaped) and the connection is
+    returned to the pool.
+    """
+    return get_db_pool().connection()
+
+def get_request_db():
+    """Get the connection bound to the current request.
+
+    The connection is checked out of the pool on first use and released by
+    ``release_request_db`` at teardown, so every helper called while serving
+    one request shares a single checkout and transaction.
+    """
+    if 'db_conn' not in g:
+        g.db_conn = get_db_pool().getconn()
+    return g.db_conn
+
+replica_router = ReplicaRouter(
+    get_db_pool, get_replica_pool if DATABASE_REPLICA_URL else None,
+    max_lag=REPLICA_MAX_LAG,
+    check_interval=REPLICA_CHECK_INTERVAL,
+    retry_after=REPLICA_RETRY_AFTER,
+)
+
+def reads_pinned_to_primary():
+    """True for a while after this browser session changed something, so it reads its own writes."""
+    return has_request_context() and session.get('_primary_reads_until', 0) > time.time()
+
+def pin_reads_to_primary():
+    """Send this session's reads to the primary until the replica has had time to catch up."""
+    if replica_router.configured and has_request_context():
+        session['_primary_reads_until'] = time.time() + REPLICA_MAX_LAG
+
+def get_read_connection():
+    """Check out a connection for read-only work, from the replica when it is fresh enough.
+
+    Use as ``with get_read_connection() as conn:`` for queries that can
+    tolerate data up to REPLICA_MAX_LAG seconds old. Never write through it.
+    """
+    if not replica_router.configured or reads_pinned_to_primary():
+        return get_db_connection()
+    return replica_router.connection()
+
+def get_request_read_db():
+    """Like ``get_request_db`` for read-only queries; may be a replica connection.
+
+    Without a usable replica this is the request's primary connection, so
+    it costs no extra checkout.
+    """
+    if 'db_read_conn' not in g:
+        if not replica_router.configured or reads_pinned_to_primary():
+            return get_request_db()
+        pool, conn = replica_router.getconn()
+        if pool is get_db_pool():
+            pool.putconn(conn)
+            return get_request_db()
+        g.db_read_conn = (pool, conn)
+    return g.db_read_conn[1]
+
+def run_read_queries(queries, primary=False):
+    """Run independent read-only ``(sql, params)`` queries; returns each one's rows, in order.
+
+    With ASYNC_READS they run concurrently on the async pool (the replica's
+    when it is usable). Otherwise they run one after another on the
+    request's read connection. ``primary`` forces the primary database.
+    """
+    if not ASYNC_READS:
+        conn = get_request_db() if primary else get_request_read_db()
+        results = []
+        with conn.cursor() as cur:
+            for query, params in queries:
+                cur.execute(query, params)
+                results.append(cur.fetchall())
+        return results
+    
+    replica = (not primary and replica_router.configured and not reads_pinned_to_primary()
+               and replica_router.use_replica())
+    started = time.perf_counter()
+    try:
+        timed = get_async_read_pool(replica).fetch_many(queries)
+    except (psycopg.OperationalError, PoolTimeout) as e:
+        if not replica:
+            raise
+        replica_router.mark_down(e)
+        timed = get_async_read_pool().fetch_many(queries)
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record_concurrent([(query, seconds) for (query, _), (_, seconds) in zip(queries, timed)],
+                                  time.perf_counter() - started)
+    return [rows for rows, _ in timed]
+
+@app.teardown_appcontext
+def release_request_db(exc):
+    """Commit (or roll back on error) the request connection and return it to the pool."""
+    read = g.pop('db_read_conn', None)
+    if read is not None:
+        pool, read_conn = read
+        try:
+            read_conn.rollback()
+        except Exception as e:
+            app.logger.error(f"Error releasing request read connection: {e}")
+        finally:
+            pool.putconn(read_conn)
     
-    return psycopg.connect(url, row_factory=dict_row, autocommit=False)
+    conn = g.pop('db_conn', None)
+    if conn is None:
+        return
+    try:
+        if exc is None and conn.info.transaction_status != TransactionStatus.INERROR:
+            conn.commit()
+        else:
+            conn.rollback()
+    except Exception as e:
+        app.logger.error(f"Error releasing request connection: {e}")
+    finally:
+        get_db_pool().putconn(conn)
+
+def get_db_pool_stats():
+    """Return pool counters plus the current saturation."""
+    if _db_pool is None:
+        return {'pool_open': False}
+    stats = _db_pool.get_stats()
+    in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+    stats['pool_open'] = True
+    stats['pool_in_use'] = in_use
+    stats['pool_saturation'] = round(in_use / DB_POOL_MAX_SIZE, 3) if DB_POOL_MAX_SIZE else 0.0
+    stats.update(replica_router.stats())
+    if _replica_pool is not None:
+        stats['replica_pool'] = _replica_pool.get_stats()
+    for key, pool in _async_pools.items():
+        stats[f'async_{key}_pool'] = pool.stats()
+    return stats
+
+email_outbox = EmailOutbox(
+    app, mail, get_db_connection,
+    batch_size=MAIL_QUEUE_BATCH_SIZE,
+    workers=MAIL_QUEUE_WORKERS,
+    rate=MAIL_QUEUE_RATE,
+    max_attempts=MAIL_QUEUE_MAX_ATTEMPTS,
+)
+
+@app.before_request
+def start_email_outbox():
+    """Start the outbox dispatcher in this worker once mail is configured."""
+    if app.config.get('MAIL_DEFAULT_SENDER'):
+        email_outbox.start()
+
+# =========================================================
+# --- RATE LIMITING ---
+# =========================================================
+# Token buckets shared by all workers on the host (see ratelimit.py). Login,
+# registration, payment and contact POSTs are charged per client IP (and per
+# account for logins) before the form is parsed or a password is hashed;
+# payment uploads also count against a per-IP byte quota, checked against
+# Content-Length before the receipt is read.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', DEFAULT_STORE)
+RATE_LIMIT_PROXY_COUNT = int(os.environ.get('RATE_LIMIT_PROXY_COUNT', 0))  # proxies appending X-Forwarded-For
+LOGIN_ATTEMPTS_PER_MINUTE = int(os.environ.get('LOGIN_ATTEMPTS_PER_MINUTE', 10))  # per IP
+ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE = int(os.environ.get('ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE', 5))
+REGISTRATIONS_PER_HOUR = int(os.environ.get('REGISTRATIONS_PER_HOUR', 10))
+PAYMENT_SUBMISSIONS_PER_HOUR = int(os.environ.get('PAYMENT_SUBMISSIONS_PER_HOUR', 20))
+CONTACT_MESSAGES_PER_HOUR = int(os.environ.get('CONTACT_MESSAGES_PER_HOUR', 5))
+UPLOAD_QUOTA_BYTES_PER_HOUR = int(float(os.environ.get('UPLOAD_QUOTA_MB_PER_HOUR', 50)) * 1024 * 1024)
+
+def rate_limited_response(retry_after):
+    """429 for the payment form's fetch calls; otherwise flash and send the user back to the form."""
+    wait = max(1, math.ceil(retry_after))
+    message = f'Too many requests. Please try again in {wait} seconds.'
+    if request.endpoint in ('submit_payment', 'student_submit_payment'):
+        response = jsonify({'success': False, 'error': message})
+        response.status_code = 429
+    else:
+        flash(message, 'error')
+        response = redirect(url_for('index') + '#contact' if request.endpoint == 'contact' else request.path)
+    response.headers['Retry-After'] = str(wait)
+    return response
+
+rate_limiter = RequestLimiter(TokenBuckets(RATE_LIMIT_STORE), enabled=RATE_LIMIT_ENABLED,
+                              proxy_count=RATE_LIMIT_PROXY_COUNT, on_limit=rate_limited_response)
+
+payment_rate_limit = rate_limiter.limit('payment', PAYMENT_SUBMISSIONS_PER_HOUR, 3600,
+                                        upload_quota=UPLOAD_QUOTA_BYTES_PER_HOUR)
+
+# =========================================================
+# --- REQUEST PROFILING ---
+# =========================================================
+# Query count, DB time and render time per request, aggregated per endpoint
+# across the host's workers for /admin/perf; with SERVER_TIMING, also sent
+# to logged-in admins in a Server-Timing header
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+PROFILE_STORE = os.environ.get('PROFILE_STORE', DEFAULT_PROFILE_STORE)
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', 500))
+PROFILE_TOP_QUERIES = int(os.environ.get('PROFILE_TOP_QUERIES', 5))
+PROFILE_SAMPLE_SIZE = int(os.environ.get('PROFILE_SAMPLE_SIZE', 1000))  # recent requests kept per endpoint
+
+endpoint_stats = EndpointStats(PROFILE_STORE, PROFILE_SAMPLE_SIZE)
+atexit.register(endpoint_stats.flush)
+perf_logger = logging.getLogger('perf')
+app.logger.addHandler(ErrorCounter())
+
+@app.before_request
+def start_request_profile():
+    if PROFILING_ENABLED:
+        g.profile_token = current_profile.set(RequestProfile(PROFILE_TOP_QUERIES))
+
+@before_render_template.connect_via(app)
+def _template_render_started(sender, **extra):
+    profile = current_profile.get()
+    if profile is not None:
+        profile.render_started()
+
+@template_rendered.connect_via(app)
+def _template_render_finished(sender, **extra):
+    profile = current_profile.get()
+    if profile is not None:
+        profile.render_finished()
+
+@app.after_request
+def finish_request_profile(response):
+    """Add Server-Timing for admins, record the request for /admin/perf and log it if slow."""
+    profile = current_profile.get()
+    if profile is None:
+        return response
+    total = profile.elapsed()
+    endpoint = request.endpoint or 'unmatched'
+    if SERVER_TIMING and ADMIN_SESSION_KEY in session:
+        response.headers['Server-Timing'] = profile.server_timing(total)
+    if endpoint != 'static':
+        endpoint_stats.record(endpoint, total, profile, error=response.status_code >= 500)
+    if total * 1000 >= SLOW_REQUEST_MS:
+        entry = {
+            'event': 'slow_request',
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'method': request.method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(profile.db_time * 1000, 1),
+            'render_ms': round(profile.render_time * 1000, 1),
+            'queries': profile.queries,
+            'errors_logged': profile.errors,
+            'slowest_queries': profile.slowest(),
+        }
+        endpoint_stats.add_slow(entry)
+        perf_logger.warning(json.dumps(entry))
+    return response
+
+@app.teardown_request
+def clear_request_profile(exc):
+    token = g.pop('profile_token', None)
+    if token is not None:
+        current_profile.reset(token)
+
+# =========================================================
+# --- IN-PROCESS CACHE ---
+# =========================================================
+_MISSING = object()
+
+class TTLCache:
+    """Small thread-safe in-process cache whose entries expire after ``ttl`` seconds.
+
+    Each gunicorn worker keeps its own copy, so the TTL also bounds how stale
+    a value can be in workers that did not see an invalidation.
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+    
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def get_or_set(self, key, factory):
+        """Return the cached value for ``key``, computing it with ``factory()`` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+    
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+DASHBOARD_CACHE_TTL = float(os.environ.get('DASHBOARD_CACHE_TTL', 30))
+dashboard_cache = TTLCache(DASHBOARD_CACHE_TTL)
+
+LIST_COUNT_CACHE_TTL = float(os.environ.get('LIST_COUNT_CACHE_TTL', 60))
+list_count_cache = TTLCache(LIST_COUNT_CACHE_TTL)
+
+def invalidate_count_caches():
+    """Forget cached counters after students, payments, contacts or results change."""
+    dashboard_cache.invalidate()
+    list_count_cache.invalidate()
+    pin_reads_to_primary()
+
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 2000))
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR')  # optional on-disk tier
+
+class ResultPageCache:
+    """Rendered student result pages keyed by ``(student_id, results_version)``.
+
+    Only the newest version per student is kept. The memory tier is an LRU of
+    ``maxsize`` students. If ``directory`` is set, pages are also written
+    there (one file per student) so they survive restarts and are shared
+    between workers on the same host.
+    """
+    
+    def __init__(self, maxsize, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, student_id):
+        return os.path.join(self.directory, f"student_{int(student_id)}.html")
+    
+    def _remember(self, student_id, version, page):
+        with self._lock:
+            self._pages[student_id] = (version, page)
+            self._pages.move_to_end(student_id)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+    
+    def get(self, student_id, version):
+        with self._lock:
+            entry = self._pages.get(student_id)
+            if entry is not None and entry[0] == version:
+                self._pages.move_to_end(student_id)
+                return entry[1]
+        
+        if self.directory:
+            try:
+                with open(self._path(student_id), encoding='utf-8') as f:
+                    cached_version, page = f.read().split('\n', 1)
+                if int(cached_version) == version:
+                    self._remember(student_id, version, page)
+                    return page
+            except (OSError, ValueError):
+                pass
+        return None
+    
+    def set(self, student_id, version, page):
+        self._remember(student_id, version, page)
+        if self.directory:
+            path = self._path(student_id)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(f"{version}\n{page}")
+                os.replace(tmp_path, path)
+            except OSError as e:
+                app.logger.error(f"Error writing result page cache: {e}")
+
+result_page_cache = ResultPageCache(RESULT_CACHE_SIZE, RESULT_CACHE_DIR)
 
 # =========================================================
 # --- TABLE CREATION FUNCTIONS ---
 # =========================================================
 def create_tables():
-    """Create all necessary database tables using PostgreSQL."""
-    conn = get_db_connection()
+    """Bring the schema up to date by applying SCHEMA_MIGRATIONS.
+
+    When the database is already current this is a single version query.
+    Otherwise the pending migrations run under an advisory lock, so workers
+    that start together do not race each other.
+    """
     try:
-        with conn.cursor() as cur:
-            # Students table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS students (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(200) NOT NULL,
-                    matric_number VARCHAR(50) UNIQUE NOT NULL,
-                    level INTEGER NOT NULL,
-                    department VARCHAR(100),
-                    email VARCHAR(100),
-                    phone VARCHAR(20),
-                    password_hash VARCHAR(255) NOT NULL,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Admins table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS admins (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(200) NOT NULL,
-                    username VARCHAR(50) UNIQUE NOT NULL,
-                    password_hash VARCHAR(255) NOT NULL,
-                    role VARCHAR(20) NOT NULL,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Sessions table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id SERIAL PRIMARY KEY,
-                    session_name VARCHAR(20) UNIQUE NOT NULL,
-                    is_current BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Courses table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS courses (
-                    id SERIAL PRIMARY KEY,
-                    course_code VARCHAR(20) UNIQUE NOT NULL,
-                    course_title VARCHAR(200) NOT NULL,
-                    course_unit INTEGER NOT NULL,
-                    level INTEGER NOT NULL,
-                    semester INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Results table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS results (
-                    id SERIAL PRIMARY KEY,
-                    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
-                    course_code VARCHAR(20) NOT NULL,
-                    course_title VARCHAR(200) NOT NULL,
-                    course_unit INTEGER NOT NULL,
-                    score INTEGER NOT NULL,
-                    grade VARCHAR(2) NOT NULL,
-                    grade_point NUMERIC(3, 2) NOT NULL,
-                    semester INTEGER NOT NULL,
-                    session_id INTEGER REFERENCES sessions(id),
-                    uploaded_by INTEGER REFERENCES admins(id),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Contacts table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS contacts (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    email VARCHAR(120) NOT NULL,
-                    subject VARCHAR(200) NOT NULL,
-                    message TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Payments table
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS payments (
-                    id SERIAL PRIMARY KEY,
-                    full_name VARCHAR(100) NOT NULL,
-                    matric_number VARCHAR(50) NOT NULL,
-                    level INTEGER NOT NULL,
-                    email VARCHAR(120) NOT NULL,
-                    phone_number VARCHAR(20) NOT NULL,
-                    payment_items TEXT NOT NULL,
-                    total_amount NUMERIC(10, 2) NOT NULL,
-                    transaction_ref VARCHAR(100),
-                    payment_date DATE,
-                    receipt_filename VARCHAR(200),
-                    status VARCHAR(20) DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create indexes
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_students_matric ON students(matric_number)")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_admins_username ON admins(username)")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_payments_matric ON payments(matric_number)")
+        with get_db_connection() as conn, conn.cursor() as cur:
+            if schema_version(cur) >= SCHEMA_MIGRATIONS[-1].version:
+                conn.rollback()
+                return
             
+            for version in apply_migrations(cur, SCHEMA_MIGRATIONS):
+                app.logger.info(f"Applied schema migration {version}")
             conn.commit()
             app.logger.info("All tables created successfully")
     except Exception as e:
-        conn.rollback()
         app.logger.error(f"Error creating tables: {e}")
         raise
-    finally:
-        conn.close()
 
-def seed_database():
-    """Seed the database with default data."""
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            # Create default admin (username='admin', password='aeeAdmin')
-            cur.execute("SELECT id FROM admins WHERE username = %s", ('admin',))
-            if not cur.fetchone():
-                admin_hash = generate_password_hash('aeeAdmin')
-                cur.execute("""
-                    INSERT INTO admins (name, username, password_hash, role, is_active)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, ('System Administrator', 'admin', admin_hash, 'super_admin', True))
-                app.logger.info("✅ Default admin created (username=admin, password=aeeAdmin)")
-            
-            # Create default session
-            cur.execute("SELECT id FROM sessions WHERE session_name = %s", ('2024/2025',))
-            if not cur.fetchone():
-                cur.execute("""
-                    INSERT INTO sessions (session_name, is_current)
-                    VALUES (%s, %s)
-                """, ('2024/2025', True))
-                app.logger.info("✅ Default session 2024/2025 created")
-            
-            # Create sample courses
-            cur.execute("SELECT COUNT(*) as count FROM courses")
-            result = cur.fetchone()
-            if result['count'] == 0:
-                sample_courses = [
-                    ("AGE 101", "Introduction to Agricultural Engineering", 2, 100, 1),
-                    ("AGE 102", "Engineering Drawing and Design", 3, 100, 1),
-                    ("AGE 103", "Mathematics for Engineers I", 3, 100, 1),
-                    ("AGE 104", "Physics for Engineers", 3, 100, 1),
-                    ("AGE 105", "Chemistry for Engineers", 3, 100, 1),
-                    ("AGE 111", "Workshop Technology", 2, 100, 2),
-                    ("AGE 112", "Mathematics for Engineers II", 3, 100, 2),
-                    ("AGE 113", "Engineering Mechanics", 3, 100, 2),
-                    ("AGE 201", "Fluid Mechanics", 3, 200, 1),
-                    ("AGE 202", "Strength of Materials", 3, 200, 1),
-                    ("AGE 203", "Thermodynamics", 3, 200, 1),
-                    ("AGE 301", "Farm Power and Machinery", 3, 300, 1),
-                    ("AGE 302", "Soil and Water Engineering", 3, 300, 1),
-                    ("AGE 401", "Agricultural Processing Engineering", 3, 400, 1),
-                    ("AGE 501", "Project", 6, 500, 1),
-                ]
-                for code, title, unit, level, semester in sample_courses:
-                    cur.execute("""
-                        INSERT INTO courses (course_code, course_title, course_unit, level, semester)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (code, title, unit, level, semester))
-                app.logger.info("✅ Sample courses inserted")
-            
-            conn.commit()
-    except Exception as e:
-        conn.rollback()
-        app.logger.error(f"Error seeding database: {e}")
-        raise
-    finally:
-        conn.close()
+def _backfill_rollups(cur):
+    """Fill the semester summary and payment rollup from existing rows the first time they are created."""
+    cur.execute("""
+        INSERT INTO student_semester_summary (student_id, session_id, semester, total_units, total_points)
+        SELECT student_id, session_id, semester, SUM(course_unit), SUM(grade_point * course_unit)
+        FROM results
+        WHERE session_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM student_semester_summary)
+        GROUP BY student_id, session_id, semester
+    """)
+    if cur.rowcount > 0:
+        refresh_semester_gpas(cur)
+    
+    cur.execute("SELECT NOT EXISTS (SELECT 1 FROM payment_daily_stats) AS empty")
+    if cur.fetchone()['empty']:
+        rebuild_payment_stats(cur)
+
+# Stands in for the creation time of rows that never recorded one; they page as the oldest
+UNKNOWN_CREATED_AT = datetime(1970, 1, 1)
+
+def _backfill_created_at(cur):
+    """Give list-view rows without a ``created_at`` a fixed one, so the column can be NOT NULL."""
+    for table in ('students', 'contacts', 'payments'):
+        cur.execute(f"UPDATE {table} SET created_at = %s WHERE created_at IS NULL", (UNKNOWN_CREATED_AT,))
+    if cur.rowcount > 0:
+        # Payments without a day could not be counted in the rollup
+        rebuild_payment_stats(cur)
+
+def _dedupe_results(cur):
+    """Keep only the latest upload of each student/course/session/semester result."""
+    cur.execute("""
+        DELETE FROM results r
+        USING results newer
+        WHERE newer.student_id = r.student_id AND newer.course_code = r.course_code
+          AND newer.session_id = r.session_id AND newer.semester = r.semester
+          AND newer.id > r.id
+        RETURNING r.student_id, r.session_id, r.semester, r.course_unit, r.grade_point
+    """)
+    removed = cur.fetchall()
+    if removed:
+        app.logger.warning(f"Removed {len(removed)} duplicate result(s), keeping the latest upload of each")
+        remove_from_semester_summaries(cur, [(row['student_id'], row['session_id'], row['semester'],
+                                              row['course_unit'], row['grade_point']) for row in removed])
+        bump_results_version(cur, {row['student_id'] for row in removed})
+
+def _seed_defaults(cur):
+    """Insert the default admin, session and sample courses where they are missing."""
+    # Create default admin (username='admin', password='aeeAdmin')
+    cur.execute("SELECT id FROM admins WHERE username = %s", ('admin',))
+    if not cur.fetchone():
+        admin_hash = password_hasher.hash('aeeAdmin')
+        cur.execute("""
+            INSERT INTO admins (name, username, password_hash, role, is_active)
+            VALUES (%s, %s, %s, %s, %s)
+        """, ('System Administrator', 'admin', admin_hash, 'super_admin', True))
+        app.logger.info("✅ Default admin created (username=admin, password=aeeAdmin)")
+    
+    # Create default session
+    cur.execute("SELECT id FROM sessions WHERE session_name = %s", ('2024/2025',))
+    if not cur.fetchone():
+        cur.execute("""
+            INSERT INTO sessions (session_name, is_current)
+            VALUES (%s, %s)
+        """, ('2024/2025', True))
+        app.logger.info("✅ Default session 2024/2025 created")
+    
+    # Create sample courses
+    cur.execute("SELECT COUNT(*) as count FROM courses")
+    result = cur.fetchone()
+    if result['count'] == 0:
+        sample_courses = [
+            ("AGE 101", "Introduction to Agricultural Engineering", 2, 100, 1),
+            ("AGE 102", "Engineering Drawing and Design", 3, 100, 1),
+            ("AGE 103", "Mathematics for Engineers I", 3, 100, 1),
+            ("AGE 104", "Physics for Engineers", 3, 100, 1),
+            ("AGE 105", "Chemistry for Engineers", 3, 100, 1),
+            ("AGE 111", "Workshop Technology", 2, 100, 2),
+            ("AGE 112", "Mathematics for Engineers II", 3, 100, 2),
+            ("AGE 113", "Engineering Mechanics", 3, 100, 2),
+            ("AGE 201", "Fluid Mechanics", 3, 200, 1),
+            ("AGE 202", "Strength of Materials", 3, 200, 1),
+            ("AGE 203", "Thermodynamics", 3, 200, 1),
+            ("AGE 301", "Farm Power and Machinery", 3, 300, 1),
+            ("AGE 302", "Soil and Water Engineering", 3, 300, 1),
+            ("AGE 401", "Agricultural Processing Engineering", 3, 400, 1),
+            ("AGE 501", "Project", 6, 500, 1),
+        ]
+        for code, title, unit, level, semester in sample_courses:
+            cur.execute("""
+                INSERT INTO courses (course_code, course_title, course_unit, level, semester)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (code, title, unit, level, semester))
+        app.logger.info("✅ Sample courses inserted")
+        invalidate_course_index()
+
+# Applied in order by create_tables; never edit a migration once it has shipped, add a new one
+SCHEMA_MIGRATIONS = [
+    # The tables as they stood before versioned migrations. Every step is
+    # idempotent, so databases created by the old boot-time DDL adopt it safely
+    Migration(0, 'Base schema', [
+        # Students table
+        """
+        CREATE TABLE IF NOT EXISTS students (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            matric_number VARCHAR(50) UNIQUE NOT NULL,
+            level INTEGER NOT NULL,
+            department VARCHAR(100),
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            password_hash VARCHAR(255) NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Admins table
+        """
+        CREATE TABLE IF NOT EXISTS admins (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            role VARCHAR(20) NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Sessions table
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id SERIAL PRIMARY KEY,
+            session_name VARCHAR(20) UNIQUE NOT NULL,
+            is_current BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Courses table
+        """
+        CREATE TABLE IF NOT EXISTS courses (
+            id SERIAL PRIMARY KEY,
+            course_code VARCHAR(20) UNIQUE NOT NULL,
+            course_title VARCHAR(200) NOT NULL,
+            course_unit INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            semester INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Results table
+        """
+        CREATE TABLE IF NOT EXISTS results (
+            id SERIAL PRIMARY KEY,
+            student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            course_code VARCHAR(20) NOT NULL,
+            course_title VARCHAR(200) NOT NULL,
+            course_unit INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            grade VARCHAR(2) NOT NULL,
+            grade_point NUMERIC(3, 2) NOT NULL,
+            semester INTEGER NOT NULL,
+            session_id INTEGER REFERENCES sessions(id),
+            uploaded_by INTEGER REFERENCES admins(id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Contacts table
+        """
+        CREATE TABLE IF NOT EXISTS contacts (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(120) NOT NULL,
+            subject VARCHAR(200) NOT NULL,
+            message TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Payments table
+        """
+        CREATE TABLE IF NOT EXISTS payments (
+            id SERIAL PRIMARY KEY,
+            full_name VARCHAR(100) NOT NULL,
+            matric_number VARCHAR(50) NOT NULL,
+            level INTEGER NOT NULL,
+            email VARCHAR(120) NOT NULL,
+            phone_number VARCHAR(20) NOT NULL,
+            payment_items TEXT NOT NULL,
+            total_amount NUMERIC(10, 2) NOT NULL,
+            transaction_ref VARCHAR(100),
+            payment_date DATE,
+            receipt_filename VARCHAR(200),
+            status VARCHAR(20) DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Per-semester GPA/CGPA summary, maintained alongside inserts into results
+        """
+        CREATE TABLE IF NOT EXISTS student_semester_summary (
+            student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+            session_id INTEGER NOT NULL REFERENCES sessions(id),
+            semester INTEGER NOT NULL,
+            total_units INTEGER NOT NULL DEFAULT 0,
+            total_points NUMERIC(8, 2) NOT NULL DEFAULT 0,
+            gpa NUMERIC(4, 2) NOT NULL DEFAULT 0,
+            cgpa NUMERIC(4, 2) NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (student_id, session_id, semester)
+        )
+        """,
+        # Outgoing e-mail, drained by the background EmailOutbox dispatcher
+        """
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id SERIAL PRIMARY KEY,
+            recipient VARCHAR(120) NOT NULL,
+            subject VARCHAR(200) NOT NULL,
+            body TEXT NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            claimed_at TIMESTAMP,
+            sent_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Payment counts and totals per day, level and status, maintained alongside writes to payments
+        """
+        CREATE TABLE IF NOT EXISTS payment_daily_stats (
+            day DATE NOT NULL,
+            level INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            payment_count INTEGER NOT NULL DEFAULT 0,
+            total_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, level, status)
+        )
+        """,
+        # Bumped whenever a student's results change; keys the rendered result page cache
+        "ALTER TABLE students ADD COLUMN IF NOT EXISTS results_version INTEGER NOT NULL DEFAULT 0",
+        _backfill_rollups,
+        "CREATE INDEX IF NOT EXISTS idx_payments_matric ON payments(matric_number)",
+        "CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(next_attempt_at) WHERE status = 'pending'",
+        "CREATE INDEX IF NOT EXISTS idx_email_outbox_recipient ON email_outbox(recipient, subject) WHERE status = 'pending'",
+        # Keyset pagination indexes for the admin list views
+        "CREATE INDEX IF NOT EXISTS idx_payments_created ON payments(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_payments_status_created ON payments(status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_students_created ON students(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_created ON contacts(created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_payments_receipt ON payments(receipt_filename)",
+    ]),
+    Migration(1, 'Indexes for the results and payments hot queries', [
+        # One result per student, course, session and semester; its index also
+        # serves every "results of this student" lookup
+        _dedupe_results,
+        """ALTER TABLE results ADD CONSTRAINT results_student_course_session_semester_key
+           UNIQUE (student_id, course_code, session_id, semester)""",
+        # Foreign keys without an index make deletes of the parent row scan the child table
+        "CREATE INDEX IF NOT EXISTS idx_results_session ON results(session_id)",
+        "CREATE INDEX IF NOT EXISTS idx_results_uploaded_by ON results(uploaded_by)",
+        "CREATE INDEX IF NOT EXISTS idx_semester_summary_session ON student_semester_summary(session_id)",
+        # check_payment_status: index-only lookup of approved payments
+        "CREATE INDEX IF NOT EXISTS idx_payments_approved_matric ON payments(matric_number) WHERE status = 'approved'",
+        # Student login and registration look students up by e-mail
+        "CREATE INDEX IF NOT EXISTS idx_students_email ON students(email)",
+        # Duplicates of the indexes behind the UNIQUE constraints on these columns
+        "DROP INDEX IF EXISTS idx_students_matric",
+        "DROP INDEX IF EXISTS idx_admins_username",
+    ]),
+    Migration(2, 'Default admin, session and sample courses', [_seed_defaults]),
+    # Keyset pagination of the list views orders and encodes page tokens on created_at
+    Migration(3, 'created_at required on students, contacts and payments', [
+        _backfill_created_at,
+        "ALTER TABLE students ALTER COLUMN created_at SET NOT NULL",
+        "ALTER TABLE contacts ALTER COLUMN created_at SET NOT NULL",
+        "ALTER TABLE payments ALTER COLUMN created_at SET NOT NULL",
+    ]),
+]
 
 # =========================================================
 # --- AUTHENTICATION HELPERS ---
@@ -294,46 +923,49 @@ def admin_login_required(f):
     return decorated_function
 
 def get_current_student():
-    """Get the currently logged-in student."""
+    """Get the currently logged-in student (looked up once per request)."""
     student_id = session.get(STUDENT_SESSION_KEY)
     if not student_id:
         return None
     
-    try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM students WHERE id = %s", (student_id,))
-            student = cur.fetchone()
-            conn.close()
-            return student
-    except Exception as e:
-        app.logger.error(f"Error getting current student: {e}")
-        return None
+    if 'current_student' not in g:
+        conn = get_request_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM students WHERE id = %s", (student_id,))
+                g.current_student = cur.fetchone()
+        except Exception as e:
+            conn.rollback()
+            app.logger.error(f"Error getting current student: {e}")
+            return None
+    return g.current_student
 
 
 
 def get_current_admin():
-    """Get the currently logged-in admin."""
+    """Get the currently logged-in admin (looked up once per request)."""
     admin_id = session.get(ADMIN_SESSION_KEY)
     if not admin_id:
         return None
     
-    try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM admins WHERE id = %s", (admin_id,))
-            admin = cur.fetchone()
-            conn.close()
-            return admin
-    except Exception as e:
-        app.logger.error(f"Error getting current admin: {e}")
-        return None
+    if 'current_admin' not in g:
+        conn = get_request_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM admins WHERE id = %s", (admin_id,))
+                g.current_admin = cur.fetchone()
+        except Exception as e:
+            conn.rollback()
+            app.logger.error(f"Error getting current admin: {e}")
+            return None
+    return g.current_admin
 
 # =========================================================
 # --- VALIDATION HELPERS ---
 # =========================================================
 EMAIL_REGEX = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
 ALLOWED_LEVELS = {100, 200, 300, 400, 500}
+PAYMENT_STATUSES = ('pending', 'approved', 'rejected')
 
 def validate_matric_number(matric_number):
     """Validate matric number format."""
@@ -376,54 +1008,417 @@ def get_letter_grade(score):
     """Get letter grade based on score."""
     return 'A' if score >= 70 else 'B' if score >= 60 else 'C' if score >= 50 else 'D' if score >= 45 else 'E' if score >= 40 else 'F'
 
+def add_to_semester_summaries(cur, result_rows):
+    """Fold newly inserted results into ``student_semester_summary``.
+
+    ``result_rows`` are ``(student_id, session_id, semester, course_unit,
+    grade_point)`` tuples. Call this with the cursor that inserted the
+    results so the summary commits or rolls back with them.
+    """
+    deltas = {}
+    for student_id, session_id, semester, course_unit, grade_point in result_rows:
+        key = (student_id, int(session_id), semester)
+        units, points = deltas.get(key, (0, 0.0))
+        deltas[key] = (units + course_unit, points + course_unit * float(grade_point))
+    if not deltas:
+        return
+    
+    cur.executemany("""
+        INSERT INTO student_semester_summary (student_id, session_id, semester, total_units, total_points)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (student_id, session_id, semester) DO UPDATE
+        SET total_units = student_semester_summary.total_units + EXCLUDED.total_units,
+            total_points = student_semester_summary.total_points + EXCLUDED.total_points
+    """, [key + value for key, value in deltas.items()])
+    student_ids = list({key[0] for key in deltas})
+    cur.execute("DELETE FROM student_semester_summary WHERE student_id = ANY(%s) AND total_units <= 0",
+                (student_ids,))
+    refresh_semester_gpas(cur, student_ids)
+
+def remove_from_semester_summaries(cur, result_rows):
+    """Take deleted results back out of ``student_semester_summary``."""
+    add_to_semester_summaries(cur, [(student_id, session_id, semester, -course_unit, grade_point)
+                                    for student_id, session_id, semester, course_unit, grade_point in result_rows])
+
+def bump_results_version(cur, student_ids):
+    """Mark these students' results as changed so cached result pages are re-rendered."""
+    cur.execute("UPDATE students SET results_version = results_version + 1 WHERE id = ANY(%s)",
+                (list(student_ids),))
+
+def refresh_semester_gpas(cur, student_ids=None):
+    """Recompute GPA and running CGPA from the summary totals (all students if ``student_ids`` is None)."""
+    condition = "WHERE ss.student_id = ANY(%s)" if student_ids is not None else ""
+    cur.execute(f"""
+        UPDATE student_semester_summary s
+        SET gpa = c.gpa, cgpa = c.cgpa, updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT ss.student_id, ss.session_id, ss.semester,
+                   COALESCE(ROUND(ss.total_points / NULLIF(ss.total_units, 0), 2), 0) AS gpa,
+                   COALESCE(ROUND(SUM(ss.total_points) OVER w / NULLIF(SUM(ss.total_units) OVER w, 0), 2), 0) AS cgpa
+            FROM student_semester_summary ss
+            JOIN sessions se ON se.id = ss.session_id
+            {condition}
+            WINDOW w AS (PARTITION BY ss.student_id ORDER BY se.session_name, ss.semester)
+        ) c
+        WHERE s.student_id = c.student_id AND s.session_id = c.session_id AND s.semester = c.semester
+    """, (student_ids,) if student_ids is not None else None)
+
 def check_payment_status(matric_number):
     """Check if student has an approved payment."""
+    conn = get_request_db()
     try:
-        conn = get_db_connection()
         with conn.cursor() as cur:
             cur.execute("""
-                SELECT status FROM payments 
+                SELECT 1 FROM payments 
                 WHERE matric_number = %s AND status = 'approved'
                 LIMIT 1
             """, (matric_number,))
             result = cur.fetchone()
-        conn.close()
         return result is not None
     except Exception as e:
+        conn.rollback()
         app.logger.error(f"Error checking payment status: {e}")
         return False
 
+# =========================================================
+# --- PAGINATION HELPERS ---
+# =========================================================
+LIST_PAGE_SIZE = 20
+
+def encode_page_token(row):
+    """Build an opaque page token from a row's (created_at, id) key."""
+    payload = json.dumps([row['created_at'].isoformat(), row['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_page_token(token):
+    """Decode a page token back into (created_at, id), or None if it is invalid."""
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+def get_list_total(cur, table, where='', params=()):
+    """Row count for a list view, cached for LIST_COUNT_CACHE_TTL seconds."""
+    def count():
+        cur.execute(f"SELECT COUNT(*) as count FROM {table} {'WHERE ' + where if where else ''}", params)
+        return cur.fetchone()['count']
+    return list_count_cache.get_or_set((table, where, tuple(params)), count)
+
+def load_list_page(table, where='', params=(), per_page=LIST_PAGE_SIZE):
+    """Load one newest-first page of ``table`` using keyset pagination.
+
+    Pages are keyed on ``(created_at, id)`` and addressed by the opaque
+    ``after``/``before`` tokens in the query string, so deep pages cost the
+    same as the first one. ``table`` and ``where`` must be trusted SQL;
+    values go in ``params``.
+    """
+    after = decode_page_token(request.args.get('after', ''))
+    before = None if after else decode_page_token(request.args.get('before', ''))
+    
+    conditions = [where] if where else []
+    args = list(params)
+    order = 'DESC'
+    if after:
+        conditions.append("(created_at, id) < (%s, %s)")
+        args.extend(after)
+    elif before:
+        conditions.append("(created_at, id) > (%s, %s)")
+        args.extend(before)
+        order = 'ASC'
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    
+    with get_request_db().cursor() as cur:
+        cur.execute(f"""
+            SELECT * FROM {table}
+            {where_sql}
+            ORDER BY created_at {order}, id {order}
+            LIMIT %s
+        """, args + [per_page + 1])
+        rows = cur.fetchall()
+        total = get_list_total(cur, table, where, params)
+    
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if before:
+        rows.reverse()
+    has_prev = has_more if before else bool(after)
+    has_next = bool(before) or has_more
+    
+    return {
+        'items': rows,
+        'total': total,
+        'prev_token': encode_page_token(rows[0]) if has_prev and rows else None,
+        'next_token': encode_page_token(rows[-1]) if has_next and rows else None,
+    }
+
+# =========================================================
+# --- EMAIL NOTIFICATIONS ---
+# =========================================================
+def payment_status_email(payment):
+    """(recipient, subject, body) telling a student their payment status changed."""
+    return (payment['email'],
+            f"Payment {payment['status']}",
+            f"Dear {payment['full_name']},\n\n"
+            f"Your payment submission for matric number {payment['matric_number']} "
+            f"(₦{payment['total_amount']:,}) has been {payment['status']}.\n\n"
+            f"Department of Agricultural and Environmental Engineering, University of Ibadan")
+
+def account_approved_email(student):
+    """(recipient, subject, body) telling a student their account was approved."""
+    return (student['email'],
+            "Your student account has been approved",
+            f"Dear {student['name']},\n\n"
+            f"Your account for matric number {student['matric_number']} has been approved. "
+            f"You can now log in to view your results.\n\n"
+            f"Department of Agricultural and Environmental Engineering, University of Ibadan")
+
+def results_published_email(student):
+    """(recipient, subject, body) telling a student new results are available."""
+    return (student['email'],
+            "New results published",
+            f"Dear {student['name']},\n\n"
+            f"New results have been published for matric number {student['matric_number']}. "
+            f"Log in to your student dashboard to view them.\n\n"
+            f"Department of Agricultural and Environmental Engineering, University of Ibadan")
+
+# =========================================================
+# --- RESPONSIVE IMAGES ---
+# =========================================================
+IMAGE_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR', os.path.join('cache', 'images'))
+IMAGE_WIDTHS = [int(w) for w in os.environ['IMAGE_WIDTHS'].split(',')] if os.environ.get('IMAGE_WIDTHS') else DEFAULT_WIDTHS
+IMAGE_MAX_AGE = 365 * 24 * 3600  # variant names are content-hashed
+
+image_pipeline = ImagePipeline(os.path.join(app.static_folder, 'images'), IMAGE_CACHE_DIR, IMAGE_WIDTHS)
+
+if os.environ.get('IMAGE_PREBUILD', '').lower() in ('1', 'true', 'yes') and image_pipeline.available:
+    threading.Thread(target=image_pipeline.build, name='image-prebuild', daemon=True).start()
+
+@app.template_global()
+def image_url(filename, width=None, fmt=None):
+    """URL of one variant of ``static/images/<filename>``; the largest fallback format by default."""
+    info = image_pipeline.source(filename)
+    if info is None:
+        return url_for('static', filename=f'images/{filename}')
+    widths = image_pipeline.variant_widths(info)
+    width = min((w for w in widths if w >= width), default=widths[-1]) if width else widths[-1]
+    name = image_pipeline.variant_name(filename, width, fmt or info.fallback_format)
+    return url_for('optimized_image', name=name)
+
+@app.template_global()
+def background_image(filename, width=None):
+    """CSS declarations for a background image, preferring AVIF/WebP where supported."""
+    info = image_pipeline.source(filename)
+    fallback = image_url(filename, width)
+    if info is None:
+        return Markup(f"background-image: url('{escape(fallback)}');")
+    candidates = ', '.join(f"url('{escape(image_url(filename, width, fmt))}') type('{MIME_TYPES[fmt]}')"
+                           for fmt in image_pipeline.variant_formats(info))
+    return Markup(f"background-image: url('{escape(fallback)}'); background-image: image-set({candidates});")
+
+@app.template_global()
+def responsive_image(filename, alt='', sizes='100vw', lazy=True, **attrs):
+    """``<picture>`` with AVIF/WebP sources and a srcset for every width of ``static/images/<filename>``.
+
+    ``sizes`` should describe the rendered width (e.g. ``'120px'``) so the
+    browser can pick the smallest adequate file. Extra keyword arguments
+    become attributes of the ``<img>``; use ``class_`` for ``class``.
+    """
+    info = image_pipeline.source(filename)
+    img_attrs = {'alt': alt}
+    if lazy:
+        img_attrs.update(loading='lazy', decoding='async')
+    img_attrs.update({k.rstrip('_').replace('_', '-'): v for k, v in attrs.items()})
+
+    if info is None:
+        img_attrs['src'] = url_for('static', filename=f'images/{filename}')
+        return Markup('<img %s>' % ' '.join(f'{k}="{escape(v)}"' for k, v in img_attrs.items()))
+
+    def srcset(fmt):
+        return ', '.join(f"{url_for('optimized_image', name=name)} {w}w"
+                         for name, w in image_pipeline.srcset(filename, fmt))
+
+    sources = ''.join(f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(fmt)}" sizes="{escape(sizes)}">'
+                      for fmt in image_pipeline.formats)
+    img_attrs.setdefault('width', info.width)
+    img_attrs.setdefault('height', info.height)
+    img_attrs.update(src=image_url(filename), srcset=srcset(info.fallback_format), sizes=sizes)
+    img = '<img %s>' % ' '.join(f'{k}="{escape(v)}"' for k, v in img_attrs.items())
+    return Markup(f'<picture>{sources}{img}</picture>')
+
+@app.route('/images/<path:name>')
+def optimized_image(name):
+    """Serve (rendering on first use) a resized variant of a static image."""
+    try:
+        path, current = image_pipeline.derivative(name)
+    except Exception as e:
+        app.logger.error(f"Error rendering image {name}: {e}")
+        return "Image unavailable", 500
+    if current:
+        return redirect(url_for('optimized_image', name=current))
+    if path is None:
+        return "Not found", 404
+    response = send_file(os.path.abspath(path), mimetype=MIME_TYPES[name.rsplit('.', 1)[1]],
+                         max_age=IMAGE_MAX_AGE, conditional=True)
+    response.headers['Cache-Control'] = f'public, max-age={IMAGE_MAX_AGE}, immutable'
+    return response
+
+# =========================================================
+# --- STATIC ASSET BUNDLES ---
+# =========================================================
+ASSET_MAX_AGE = 365 * 24 * 3600  # bundle names are content-hashed
+
+asset_bundles = AssetBundles(app.static_folder)
+
+def precompressed_response(content, encodings, mimetype, etag):
+    """Response with the best encoding the client accepts out of ``encodings``.
+
+    The ETag is suffixed with the encoding so each representation validates separately.
+    """
+    encoding = next((e for e in ('br', 'gzip') if e in encodings and request.accept_encodings[e]), None)
+    response = Response(encodings[encoding] if encoding else content, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.set_etag(f"{etag}-{encoding or 'identity'}")
+    return response
+
+@app.template_global()
+def asset_url(name):
+    """URL of the current fingerprinted build of bundle ``name`` ('public.js', 'style.css', ...)."""
+    return url_for('asset', filename=asset_bundles.get(name).filename)
+
+@app.route('/assets/<filename>')
+def asset(filename):
+    """Serve a bundle, pre-compressed with brotli or gzip when the client accepts it."""
+    bundle = asset_bundles.find(filename)
+    if bundle is None:
+        return "Not found", 404
+    
+    response = precompressed_response(bundle.content, bundle.encodings, bundle.mimetype, bundle.filename)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response.make_conditional(request)
+
+# =========================================================
+# --- FULL-PAGE CACHE ---
+# =========================================================
+PAGE_CACHE_CHECK_INTERVAL = float(os.environ.get('PAGE_CACHE_CHECK_INTERVAL', 2))  # seconds between staleness checks
+
+class PageCache:
+    """Fully rendered, pre-compressed responses for pages that do not depend on the visitor.
+
+    An entry is keyed by template name and remembers what it was rendered
+    from: the template file, the asset bundle names and the image digests.
+    At most every ``check_interval`` seconds a hit re-checks those and
+    renders again if any of them changed.
+    """
+    
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._pages = {}
+        self._lock = threading.Lock()
+    
+    def _dependencies(self):
+        return (tuple(asset_bundles.get(name).filename for name in BUNDLES),
+                tuple(sorted(image_pipeline.digests().items())))
+    
+    def _render(self, template):
+        body = render_template(template).encode('utf-8')
+        return {
+            'body': body,
+            'encodings': compress(body),
+            'etag': hashlib.sha256(body).hexdigest()[:16],
+            'last_modified': datetime.utcnow().replace(microsecond=0),
+            'dependencies': self._dependencies(),
+            'checked_at': time.monotonic(),
+        }
+    
+    def _is_fresh(self, template, entry):
+        if time.monotonic() - entry['checked_at'] < self.check_interval:
+            return True
+        if not app.jinja_env.get_template(template).is_up_to_date:
+            app.jinja_env.cache.clear()
+            return False
+        if self._dependencies() != entry['dependencies']:
+            return False
+        entry['checked_at'] = time.monotonic()
+        return True
+    
+    def get(self, template):
+        """Return the cached entry for ``template``, rendering it if missing or stale."""
+        entry = self._pages.get(template)
+        if entry is not None and self._is_fresh(template, entry):
+            return entry
+        with self._lock:
+            current = self._pages.get(template)
+            if current is entry:  # not already replaced by another thread
+                current = self._render(template)
+                self._pages[template] = current
+        return current
+    
+    def warm(self, templates):
+        """Render ``templates`` ahead of the first visitor."""
+        with app.test_request_context('/'):
+            for template in templates:
+                try:
+                    self.get(template)
+                except Exception as e:
+                    app.logger.error(f"Error pre-rendering {template}: {e}")
+
+page_cache = PageCache(PAGE_CACHE_CHECK_INTERVAL)
+
+def cached_page(template):
+    """Serve ``template`` from the page cache with ETag/Last-Modified validation."""
+    if session.get('_flashes'):
+        # Flashed messages are per visitor; render them fresh and keep them out of caches
+        response = app.make_response(render_template(template))
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    entry = page_cache.get(template)
+    response = precompressed_response(entry['body'], entry['encodings'], 'text/html', entry['etag'])
+    response.headers['Cache-Control'] = 'no-cache'
+    response.last_modified = entry['last_modified']
+    return response.make_conditional(request)
+
+CACHED_PAGES = ['index.html', 'students.html', 'news.html', 'staff.html', 'academic_program.html', 'admin/payment.html']
+
+if os.environ.get('PAGE_CACHE_PREWARM', 'true').lower() in ('1', 'true', 'yes'):
+    threading.Thread(target=page_cache.warm, args=(CACHED_PAGES,), name='page-cache-warm', daemon=True).start()
+
 # =========================================================
 # --- PUBLIC ROUTES ---
 # =========================================================
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return cached_page('index.html')
 
 @app.route('/students')
 def students():
-    return render_template('students.html')
+    return cached_page('students.html')
 
 @app.route('/news')
 def news():
-    return render_template('news.html')
+    return cached_page('news.html')
 
 @app.route('/staff')
 def staff():
-    return render_template('staff.html')
+    return cached_page('staff.html')
 
 @app.route('/payment')
 def payment():
-    return render_template('admin/payment.html')
+    return cached_page('admin/payment.html')
 
 @app.route('/academic_program')
 def academic_program():
-    return render_template('academic_program.html')
+    return cached_page('academic_program.html')
 
 # =========================================================
 # --- CONTACT FORM ROUTE ---
 # =========================================================
 @app.route('/contact', methods=['POST'])
+@rate_limiter.limit('contact', CONTACT_MESSAGES_PER_HOUR, 3600)
 def contact():
     try:
         name = request.form.get('name')
@@ -436,14 +1431,13 @@ def contact():
             return redirect(url_for('index') + '#contact')
         
         # Save to database
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 INSERT INTO contacts (name, email, subject, message)
                 VALUES (%s, %s, %s, %s)
             """, (name, email, subject, message))
             conn.commit()
-        conn.close()
+            invalidate_count_caches()
         
         flash('Your message has been sent successfully!', 'success')
     except Exception as e:
@@ -456,6 +1450,7 @@ def contact():
 # --- PAYMENT SUBMISSION ROUTES ---
 # =========================================================
 @app.route('/submit-payment', methods=['POST'])
+@payment_rate_limit
 def submit_payment():
     """Public payment submission route (for backwards compatibility)."""
     return handle_payment_submission()
@@ -475,6 +1470,7 @@ def student_payment_form():
 
 @app.route('/student/submit-payment', methods=['POST'])
 @student_login_required
+@payment_rate_limit
 def student_submit_payment():
     """Student payment submission route."""
     return handle_payment_submission()
@@ -518,38 +1514,47 @@ def handle_payment_submission():
         if payment_date_str:
             payment_date = datetime.strptime(payment_date_str, '%Y-%m-%d').date()
         
-        # Handle file upload
-        receipt_filename = None
-        if 'receipt' in request.files:
-            file = request.files['receipt']
-            if file and file.filename:
-                if not allowed_file(file.filename):
-                    return jsonify({'success': False, 'error': 'Invalid file type. Only PNG, JPG, JPEG, and PDF are allowed.'})
-                filename = secure_filename(f"{matric_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}")
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
-                receipt_filename = filename
+        file = request.files.get('receipt')
+        if file and file.filename and not allowed_file(file.filename):
+            return jsonify({'success': False, 'error': 'Invalid file type. Only PNG, JPG, JPEG, and PDF are allowed.'})
         
-        # Check if matric number already exists
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        # Check if matric number already exists, before anything is written to storage
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("SELECT id FROM payments WHERE matric_number = %s", (matric_number,))
             if cur.fetchone():
-                conn.close()
                 return jsonify({'success': False, 'error': 'Payment already exists for this matric number'})
-            
-            # Insert payment
-            cur.execute("""
-                INSERT INTO payments (full_name, matric_number, level, email, phone_number, 
-                                    payment_items, total_amount, transaction_ref, payment_date, receipt_filename)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (full_name, matric_number, level, email, phone_number, payment_items, 
-                  total_amount, transaction_ref, payment_date, receipt_filename))
-            
-            payment_id = cur.fetchone()['id']
-            conn.commit()
-        conn.close()
+        
+        # Handle file upload (outside the transaction, so no connection is held while it is written)
+        stored = None
+        receipt_filename = None
+        if file and file.filename:
+            stored = receipt_storage.save(file.stream, file.filename.rsplit('.', 1)[1])
+            receipt_filename = stored.key
+        
+        try:
+            with get_db_connection() as conn, conn.cursor() as cur:
+                # Insert payment
+                cur.execute("""
+                    INSERT INTO payments (full_name, matric_number, level, email, phone_number, 
+                                        payment_items, total_amount, transaction_ref, payment_date, receipt_filename)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id, created_at, level, status, total_amount
+                """, (full_name, matric_number, level, email, phone_number, payment_items, 
+                      total_amount, transaction_ref, payment_date, receipt_filename))
+                
+                payment = cur.fetchone()
+                payment_id = payment['id']
+                add_to_payment_stats(cur, [payment])
+                conn.commit()
+        except Exception:
+            # Receipts are shared by content; only remove one this request created
+            if stored is not None and stored.created:
+                receipt_storage.delete(stored.key)
+            raise
+        invalidate_count_caches()
+        
+        if receipt_filename:
+            receipt_thumbnails.submit(receipt_filename)
         
         return jsonify({
             'success': True, 
@@ -566,6 +1571,8 @@ def handle_payment_submission():
 # --- STUDENT AUTHENTICATION ROUTES ---
 # =========================================================
 @app.route('/student/login', methods=['GET', 'POST'])
+@rate_limiter.limit('student-login', LOGIN_ATTEMPTS_PER_MINUTE, 60,
+                    account_field='email', per_account=ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE)
 def student_login():
     if request.method == 'POST':
         email = request.form.get('email')  # safer than request.form['email']
@@ -575,23 +1582,30 @@ def student_login():
             flash("Both email and password are required.", "error")
             return render_template("login.html")
 
-        conn = get_db_connection()
-        cur = conn.cursor()
-
-        cur.execute("SELECT * FROM students WHERE email = %s", (email,))
-        student = cur.fetchone()
-
-        cur.close()
-        conn.close()
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT * FROM students WHERE email = %s", (email,))
+            student = cur.fetchone()
 
         if not student:
             flash("Invalid email or password.", "error")
             return render_template("login.html")
 
-        if not check_password_hash(student['password_hash'], password):
+        try:
+            valid, new_hash = password_hasher.verify_and_update(student['password_hash'], password)
+        except HashingBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("login.html"), 503
+
+        if not valid:
             flash("Invalid email or password.", "error")
             return render_template("login.html")
 
+        if new_hash:
+            # Stored with old hash parameters; upgrade while we have the password
+            with get_db_connection() as conn, conn.cursor() as cur:
+                cur.execute("UPDATE students SET password_hash = %s WHERE id = %s", (new_hash, student['id']))
+                conn.commit()
+
         if not bool(student['is_active']):
             flash("Your account is not yet approved by the admin.", "error")
             return render_template("login.html")
@@ -606,6 +1620,7 @@ def student_login():
 
 
 @app.route('/student/register', methods=['GET', 'POST'])
+@rate_limiter.limit('register', REGISTRATIONS_PER_HOUR, 3600)
 def student_register():
     if request.method == 'POST':
         name = request.form['name']
@@ -616,31 +1631,32 @@ def student_register():
         phone = request.form['phone']
         password = request.form['password']
 
-        password_hash = generate_password_hash(password)
-
         try:
-            conn = get_db_connection()
-            cur = conn.cursor()
+            password_hash = password_hasher.hash(password)
+        except HashingBusy:
+            flash("The server is busy. Please try again in a moment.", "error")
+            return render_template("register.html"), 503
 
-            # Make sure matric and email are unique
-            cur.execute("SELECT * FROM students WHERE email = %s OR matric_number = %s",
-                        (email, matric_number))
-            existing = cur.fetchone()
+        try:
+            with get_db_connection() as conn, conn.cursor() as cur:
+                # Make sure matric and email are unique
+                cur.execute("SELECT * FROM students WHERE email = %s OR matric_number = %s",
+                            (email, matric_number))
+                existing = cur.fetchone()
 
-            if existing:
-                flash("Student with this email or matric number already exists.", "error")
-                return render_template("register.html")
+                if existing:
+                    flash("Student with this email or matric number already exists.", "error")
+                    return render_template("register.html")
 
-            # Insert with is_active = FALSE
-            cur.execute("""
-                INSERT INTO students
-                (name, matric_number, level, department, email, phone, password_hash, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, FALSE)
-            """, (name, matric_number, level, department, email, phone, password_hash))
+                # Insert with is_active = FALSE
+                cur.execute("""
+                    INSERT INTO students
+                    (name, matric_number, level, department, email, phone, password_hash, is_active)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, FALSE)
+                """, (name, matric_number, level, department, email, phone, password_hash))
 
-            conn.commit()
-            cur.close()
-            conn.close()
+                conn.commit()
+                invalidate_count_caches()
 
             flash("Registration successful! Please wait for admin approval.", "success")
             return redirect(url_for('student_login'))
@@ -679,29 +1695,49 @@ def student_dashboard():
                              sessions=[],
                              current_session=None,
                              grouped_results={},
-                             gpa_data={})
+                             gpa_data={},
+                             cgpa=0.0)
+    
+    # Pages with pending flash messages are rendered fresh and not cached
+    use_cache = not session.get('_flashes')
+    if use_cache:
+        page = result_page_cache.get(student['id'], student['results_version'])
+        if page is not None:
+            return page
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Get all sessions
-            cur.execute("SELECT * FROM sessions ORDER BY session_name DESC")
-            all_sessions = cur.fetchall()
-            
-            # Get current session
-            cur.execute("SELECT * FROM sessions WHERE is_current = TRUE LIMIT 1")
-            current_session = cur.fetchone()
-            
-            # Get results for this student
-            cur.execute("""
+        queries = [
+            ("SELECT * FROM sessions ORDER BY session_name DESC", None),
+            ("""
                 SELECT r.*, s.session_name 
                 FROM results r
                 LEFT JOIN sessions s ON r.session_id = s.id
                 WHERE r.student_id = %s
                 ORDER BY s.session_name DESC, r.semester, r.course_code
-            """, (student['id'],))
-            results = cur.fetchall()
-        conn.close()
+            """, (student['id'],)),
+            # Per-semester GPA and running CGPA are maintained on upload
+            ("""
+                SELECT ss.semester, ss.total_units, ss.gpa, ss.cgpa, s.session_name
+                FROM student_semester_summary ss
+                JOIN sessions s ON ss.session_id = s.id
+                WHERE ss.student_id = %s
+                ORDER BY s.session_name DESC, ss.semester
+            """, (student['id'],)),
+        ]
+        if replica_router.configured:
+            # A lagging replica may not have the results this version refers to yet;
+            # rendering from it would cache a stale page under the new version. The
+            # version is read before the results: replay only moves forward, so reads
+            # after it see at least that version (run alongside them, the check could
+            # see a newer snapshot than the concurrent reads did)
+            version = run_read_queries([("SELECT results_version FROM students WHERE id = %s",
+                                         (student['id'],))])[0]
+            stale = not version or version[0]['results_version'] < student['results_version']
+            rows = run_read_queries(queries, primary=stale)
+        else:
+            rows = run_read_queries(queries)
+        all_sessions, results, summaries = rows
+        current_session = next((s for s in all_sessions if s['is_current']), None)
         
         # Group results by session and semester
         grouped_results = {}
@@ -713,21 +1749,27 @@ def student_dashboard():
                 grouped_results[key] = []
             grouped_results[key].append(result)
         
-        # Calculate GPA for each group
         gpa_data = {}
-        for key, res_list in grouped_results.items():
-            total_points = sum(float(r['grade_point']) * r['course_unit'] for r in res_list)
-            total_units = sum(r['course_unit'] for r in res_list)
-            gpa = round(total_points / total_units, 2) if total_units > 0 else 0.0
-            gpa_data[key] = {'gpa': gpa, 'units': total_units}
+        for summary in summaries:
+            key = f"{summary['session_name']}_S{summary['semester']}"
+            gpa_data[key] = {'gpa': float(summary['gpa']),
+                             'cgpa': float(summary['cgpa']),
+                             'units': summary['total_units']}
+        # The running CGPA of the latest semester is the overall CGPA
+        latest = max(summaries, key=lambda row: (row['session_name'], row['semester']), default=None)
+        cgpa = float(latest['cgpa']) if latest else 0.0
         
-        return render_template('student_dashboard.html',
+        page = render_template('student_dashboard.html',
                              student=student,
                              has_payment=True,
                              sessions=all_sessions,
                              current_session=current_session,
                              grouped_results=grouped_results,
-                             gpa_data=gpa_data)
+                             gpa_data=gpa_data,
+                             cgpa=cgpa)
+        if use_cache:
+            result_page_cache.set(student['id'], student['results_version'], page)
+        return page
     except Exception as e:
         app.logger.error(f"Error loading student dashboard: {e}")
         flash('Error loading dashboard', 'error')
@@ -737,6 +1779,8 @@ def student_dashboard():
 # --- ADMIN AUTHENTICATION ROUTES ---
 # =========================================================
 @app.route('/admin/login', methods=['GET', 'POST'])
+@rate_limiter.limit('admin-login', LOGIN_ATTEMPTS_PER_MINUTE, 60,
+                    account_field='username', per_account=ACCOUNT_LOGIN_ATTEMPTS_PER_MINUTE)
 def admin_login():
     """Admin login route - separate from student."""
     if ADMIN_SESSION_KEY in session:
@@ -747,27 +1791,34 @@ def admin_login():
         password = request.form.get('password', '')
         
         try:
-            conn = get_db_connection()
-            with conn.cursor() as cur:
+            with get_db_connection() as conn, conn.cursor() as cur:
                 cur.execute("SELECT * FROM admins WHERE username = %s", (username,))
                 admin = cur.fetchone()
+            
+            # Verify with the connection back in the pool; waiting for a hashing slot can take a while
+            valid, new_hash = (password_hasher.verify_and_update(admin['password_hash'], password)
+                               if admin else (False, None))
+            if valid:
+                if new_hash:
+                    # Stored with old hash parameters; upgrade while we have the password
+                    with get_db_connection() as conn, conn.cursor() as cur:
+                        cur.execute("UPDATE admins SET password_hash = %s WHERE id = %s", (new_hash, admin['id']))
+                        conn.commit()
+                if not admin.get('is_active', True):
+                    flash('Your account is inactive.', 'error')
+                    return render_template('admin_login.html')
                 
-                if admin and check_password_hash(admin['password_hash'], password):
-                    if not admin.get('is_active', True):
-                        flash('Your account is inactive.', 'error')
-                        conn.close()
-                        return render_template('admin_login.html')
-                    
-                    # Set admin session
-                    session[ADMIN_SESSION_KEY] = admin['id']
-                    session.permanent = True
-                    flash(f'Welcome, {admin["name"]}!', 'success')
-                    conn.close()
-                    
-                    return redirect(url_for('admin_dashboard'))
-                else:
-                    flash('Invalid username or password', 'error')
-            conn.close()
+                # Set admin session
+                session[ADMIN_SESSION_KEY] = admin['id']
+                session.permanent = True
+                flash(f'Welcome, {admin["name"]}!', 'success')
+                
+                return redirect(url_for('admin_dashboard'))
+            else:
+                flash('Invalid username or password', 'error')
+        except HashingBusy:
+            flash('The server is busy. Please try again in a moment.', 'error')
+            return render_template('admin_login.html'), 503
         except Exception as e:
             flash('Error during login. Please try again.', 'error')
             app.logger.error(f"Admin login error: {e}")
@@ -784,6 +1835,34 @@ def admin_logout():
 # =========================================================
 # --- ADMIN DASHBOARD AND ROUTES ---
 # =========================================================
+def load_dashboard_data():
+    """Load dashboard counters in one aggregate query, plus the recent submissions."""
+    with get_request_db().cursor() as cur:
+        cur.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM students) AS total_students,
+                (SELECT COUNT(*) FROM contacts) AS total_contacts,
+                (SELECT COUNT(*) FROM results) AS total_results,
+                p.total_payments,
+                p.pending_payments,
+                p.approved_payments
+            FROM (
+                SELECT COALESCE(SUM(payment_count), 0) AS total_payments,
+                       COALESCE(SUM(payment_count) FILTER (WHERE status = 'pending'), 0) AS pending_payments,
+                       COALESCE(SUM(payment_count) FILTER (WHERE status = 'approved'), 0) AS approved_payments
+                FROM payment_daily_stats
+            ) p
+        """)
+        data = dict(cur.fetchone())
+        
+        # Recent submissions
+        cur.execute("SELECT * FROM contacts ORDER BY created_at DESC LIMIT 5")
+        data['recent_contacts'] = cur.fetchall()
+        
+        cur.execute("SELECT * FROM payments ORDER BY created_at DESC LIMIT 5")
+        data['recent_payments'] = cur.fetchall()
+    return data
+
 @app.route('/admin/dashboard')
 @admin_login_required
 def admin_dashboard():
@@ -793,45 +1872,9 @@ def admin_dashboard():
         return redirect(url_for('admin_login'))
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Get statistics
-            cur.execute("SELECT COUNT(*) as count FROM students")
-            total_students = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(*) as count FROM contacts")
-            total_contacts = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(*) as count FROM payments")
-            total_payments = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(*) as count FROM results")
-            total_results = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(*) as count FROM payments WHERE status = 'pending'")
-            pending_payments = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(*) as count FROM payments WHERE status = 'approved'")
-            approved_payments = cur.fetchone()['count']
-            
-            # Recent submissions
-            cur.execute("SELECT * FROM contacts ORDER BY created_at DESC LIMIT 5")
-            recent_contacts = cur.fetchall()
-            
-            cur.execute("SELECT * FROM payments ORDER BY created_at DESC LIMIT 5")
-            recent_payments = cur.fetchall()
-        conn.close()
+        data = dashboard_cache.get_or_set('admin_dashboard', load_dashboard_data)
         
-        return render_template('admin/admin_dashboard.html',
-                             admin=admin,
-                             total_students=total_students,
-                             total_contacts=total_contacts,
-                             total_payments=total_payments,
-                             total_results=total_results,
-                             pending_payments=pending_payments,
-                             approved_payments=approved_payments,
-                             recent_contacts=recent_contacts,
-                             recent_payments=recent_payments)
+        return render_template('admin/admin_dashboard.html', admin=admin, **data)
     except Exception as e:
         app.logger.error(f"Error loading admin dashboard: {e}")
         flash('Error loading dashboard', 'error')
@@ -844,32 +1887,14 @@ def admin_dashboard():
 @admin_login_required
 def admin_contacts():
     """View all contacts."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    offset = (page - 1) * per_page
-    
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) as count FROM contacts")
-            total = cur.fetchone()['count']
-            
-            cur.execute("""
-                SELECT * FROM contacts 
-                ORDER BY created_at DESC 
-                LIMIT %s OFFSET %s
-            """, (per_page, offset))
-            contacts = cur.fetchall()
-        conn.close()
-        
-        total_pages = (total + per_page - 1) // per_page
+        page = load_list_page('contacts')
         
         return render_template('admin/admin_contacts.html',
-                             contacts=contacts,
-                             page=page,
-                             total_pages=total_pages,
-                             has_prev=page > 1,
-                             has_next=page < total_pages)
+                             contacts=page['items'],
+                             total=page['total'],
+                             prev_token=page['prev_token'],
+                             next_token=page['next_token'])
     except Exception as e:
         app.logger.error(f"Error loading contacts: {e}")
         flash('Error loading contacts', 'error')
@@ -880,11 +1905,9 @@ def admin_contacts():
 def admin_view_contact(contact_id):
     """View contact details."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("SELECT * FROM contacts WHERE id = %s", (contact_id,))
             contact = cur.fetchone()
-        conn.close()
         
         if not contact:
             flash('Contact not found', 'error')
@@ -901,11 +1924,10 @@ def admin_view_contact(contact_id):
 def admin_delete_contact(contact_id):
     """Delete a contact."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("DELETE FROM contacts WHERE id = %s", (contact_id,))
             conn.commit()
-        conn.close()
+            invalidate_count_caches()
         
         flash('Contact deleted successfully!', 'success')
     except Exception as e:
@@ -921,45 +1943,19 @@ def admin_delete_contact(contact_id):
 @admin_login_required
 def admin_payments():
     """View all payments."""
-    page = request.args.get('page', 1, type=int)
     status_filter = request.args.get('status', '')
-    per_page = 20
-    offset = (page - 1) * per_page
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            if status_filter:
-                cur.execute("SELECT COUNT(*) as count FROM payments WHERE status = %s", (status_filter,))
-                total = cur.fetchone()['count']
-                
-                cur.execute("""
-                    SELECT * FROM payments 
-                    WHERE status = %s
-                    ORDER BY created_at DESC 
-                    LIMIT %s OFFSET %s
-                """, (status_filter, per_page, offset))
-            else:
-                cur.execute("SELECT COUNT(*) as count FROM payments")
-                total = cur.fetchone()['count']
-                
-                cur.execute("""
-                    SELECT * FROM payments 
-                    ORDER BY created_at DESC 
-                    LIMIT %s OFFSET %s
-                """, (per_page, offset))
-            
-            payments = cur.fetchall()
-        conn.close()
-        
-        total_pages = (total + per_page - 1) // per_page
+        if status_filter:
+            page = load_list_page('payments', 'status = %s', (status_filter,))
+        else:
+            page = load_list_page('payments')
         
         return render_template('admin/admin_payments.html',
-                             payments=payments,
-                             page=page,
-                             total_pages=total_pages,
-                             has_prev=page > 1,
-                             has_next=page < total_pages,
+                             payments=page['items'],
+                             total=page['total'],
+                             prev_token=page['prev_token'],
+                             next_token=page['next_token'],
                              status_filter=status_filter)
     except Exception as e:
         app.logger.error(f"Error loading payments: {e}")
@@ -971,11 +1967,9 @@ def admin_payments():
 def admin_view_payment(payment_id):
     """View payment details."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("SELECT * FROM payments WHERE id = %s", (payment_id,))
             payment = cur.fetchone()
-        conn.close()
         
         if not payment:
             flash('Payment not found', 'error')
@@ -1000,20 +1994,35 @@ def admin_update_payment_status(payment_id):
     """Update payment status."""
     new_status = request.form.get('status')
     
-    if new_status not in ['pending', 'approved', 'rejected']:
+    if new_status not in PAYMENT_STATUSES:
         flash('Invalid status!', 'error')
         return redirect(url_for('admin_view_payment', payment_id=payment_id))
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
+            # Lock and read the current status first; a self-join would report
+            # the pre-lock status when another admin changed it concurrently
             cur.execute("""
-                UPDATE payments 
+                WITH old AS (
+                    SELECT id, status FROM payments
+                    WHERE id = %s AND status IS DISTINCT FROM %s
+                    FOR UPDATE
+                )
+                UPDATE payments p
                 SET status = %s, updated_at = CURRENT_TIMESTAMP 
-                WHERE id = %s
-            """, (new_status, payment_id))
+                FROM old
+                WHERE p.id = old.id
+                RETURNING p.full_name, p.matric_number, p.email, p.total_amount, p.status,
+                          p.created_at, p.level, old.status AS previous_status
+            """, (payment_id, new_status, new_status))
+            payment = cur.fetchone()
+            if payment:
+                move_payment_stats(cur, [payment])
+                queue_email(cur, *payment_status_email(payment))
             conn.commit()
-        conn.close()
+            invalidate_count_caches()
+        if payment:
+            email_outbox.wake()
         
         flash(f'Payment status updated to {new_status}!', 'success')
     except Exception as e:
@@ -1022,46 +2031,173 @@ def admin_update_payment_status(payment_id):
     
     return redirect(url_for('admin_view_payment', payment_id=payment_id))
 
+def bulk_update_payment_status(cur, new_status, ids=None, level=None, status=None, has_transaction_ref=None):
+    """Set ``new_status`` on every payment matching the IDs and/or filters in one UPDATE.
+
+    Rows already in ``new_status`` are left alone. The stats rollup and the
+    status e-mails for the changed rows are updated in the same transaction. Returns
+    ``(changed_rows, counts_by_previous_status)``.
+    """
+    conditions = []
+    params = []
+    if ids is not None:
+        conditions.append("p.id = ANY(%s)")
+        params.append(list(ids))
+    if level is not None:
+        conditions.append("p.level = %s")
+        params.append(level)
+    if status is not None:
+        conditions.append("p.status = %s")
+        params.append(status)
+    if has_transaction_ref is not None:
+        conditions.append("(COALESCE(p.transaction_ref, '') <> '') = %s")
+        params.append(has_transaction_ref)
+    if not conditions:
+        raise ValueError('Select payments or give at least one filter')
+    
+    # Lock the matching rows (in id order, so concurrent bulk updates cannot
+    # deadlock) and read their current status before updating; a self-join
+    # would report the pre-lock status of rows another admin just changed
+    cur.execute(f"""
+        WITH old AS (
+            SELECT p.id, p.status FROM payments p
+            WHERE p.status IS DISTINCT FROM %s AND {' AND '.join(conditions)}
+            ORDER BY p.id
+            FOR UPDATE
+        )
+        UPDATE payments p
+        SET status = %s, updated_at = CURRENT_TIMESTAMP
+        FROM old
+        WHERE p.id = old.id
+        RETURNING p.id, p.full_name, p.matric_number, p.email, p.total_amount, p.status,
+                  p.created_at, p.level, old.status AS previous_status
+    """, [new_status] + params + [new_status])
+    rows = cur.fetchall()
+    move_payment_stats(cur, rows)
+    
+    counts = {}
+    for row in rows:
+        counts[row['previous_status']] = counts.get(row['previous_status'], 0) + 1
+    queue_emails(cur, [payment_status_email(row) for row in rows])
+    return rows, counts
+
+@app.route('/admin/payments/bulk-status', methods=['POST'])
+@admin_login_required
+def admin_bulk_update_payment_status():
+    """Approve/reject many payments at once, by selected IDs or by filter.
+
+    Accepts a form post from the payments page or JSON such as
+    ``{"status": "approved", "ids": [1, 2]}`` or
+    ``{"status": "approved", "filter": {"level": 100, "status": "pending", "has_transaction_ref": true}}``.
+    """
+    data = request.get_json(silent=True) if request.is_json else None
+    wants_json = data is not None or request.accept_mimetypes.best == 'application/json'
+    
+    def fail(message, code=400):
+        if wants_json:
+            return jsonify({'success': False, 'error': message}), code
+        flash(message, 'error')
+        return redirect(url_for('admin_payments', status=request.form.get('return_status', '')))
+    
+    try:
+        if data is not None:
+            new_status = data.get('status')
+            ids = data.get('ids')
+            filters = data.get('filter') or {}
+            ids = [int(i) for i in ids] if ids is not None else None
+        else:
+            new_status = request.form.get('new_status')
+            ids = [int(i) for i in request.form.getlist('ids')] if request.form.get('scope') != 'filter' else None
+            filters = {}
+            if request.form.get('scope') == 'filter':
+                filters = {
+                    'level': request.form.get('filter_level') or None,
+                    'status': request.form.get('filter_status') or None,
+                    'has_transaction_ref': {'yes': True, 'no': False}.get(request.form.get('filter_transaction_ref')),
+                }
+        level = int(filters['level']) if filters.get('level') not in (None, '') else None
+        status = filters.get('status') or None
+        has_transaction_ref = filters.get('has_transaction_ref')
+        if has_transaction_ref is not None:
+            has_transaction_ref = bool(has_transaction_ref)
+    except (TypeError, ValueError, AttributeError):
+        return fail('Invalid payment IDs or filter')
+    
+    if new_status not in PAYMENT_STATUSES or (status is not None and status not in PAYMENT_STATUSES):
+        return fail('Invalid status!')
+    if ids is not None and not ids:
+        return fail('No payments selected')
+    
+    try:
+        with get_db_connection() as conn, conn.cursor() as cur:
+            rows, counts = bulk_update_payment_status(cur, new_status, ids=ids, level=level, status=status,
+                                                      has_transaction_ref=has_transaction_ref)
+            conn.commit()
+    except ValueError as e:
+        return fail(str(e))
+    except Exception as e:
+        app.logger.error(f"Error bulk updating payment status: {e}")
+        return fail('Error updating payment status', 500)
+    
+    if rows:
+        invalidate_count_caches()
+        email_outbox.wake()
+    
+    unchanged = len(set(ids)) - len(rows) if ids is not None else None
+    if wants_json:
+        return jsonify({'success': True, 'status': new_status, 'updated': len(rows),
+                        'previous_status': counts, 'unchanged': unchanged})
+    
+    summary = ', '.join(f"{count} {previous}" for previous, count in sorted(counts.items())) or 'none'
+    message = f"{len(rows)} payment(s) set to {new_status} (previously: {summary})."
+    if unchanged:
+        message += f" {unchanged} selected payment(s) were already {new_status} or no longer exist."
+    flash(message, 'success')
+    return redirect(url_for('admin_payments', status=request.form.get('return_status', '')))
+
 @app.route('/admin/payments/<int:payment_id>/edit', methods=['GET', 'POST'])
 @admin_login_required
 def admin_edit_payment(payment_id):
     """Edit payment details."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        with get_db_connection() as conn, conn.cursor() as cur:
             cur.execute("SELECT * FROM payments WHERE id = %s", (payment_id,))
             payment = cur.fetchone()
-        
-        if not payment:
-            conn.close()
-            flash('Payment not found', 'error')
-            return redirect(url_for('admin_payments'))
-        
-        if request.method == 'POST':
-            full_name = request.form.get('full_name')
-            matric_number = request.form.get('matric_number')
-            level = int(request.form.get('level', 0))
-            email = request.form.get('email')
-            phone_number = request.form.get('phone_number')
-            total_amount = float(request.form.get('total_amount', 0))
-            transaction_ref = request.form.get('transaction_ref')
             
-            with conn.cursor() as cur:
+            if not payment:
+                flash('Payment not found', 'error')
+                return redirect(url_for('admin_payments'))
+            
+            if request.method == 'POST':
+                full_name = request.form.get('full_name')
+                matric_number = request.form.get('matric_number')
+                level = int(request.form.get('level', 0))
+                email = request.form.get('email')
+                phone_number = request.form.get('phone_number')
+                total_amount = float(request.form.get('total_amount', 0))
+                transaction_ref = request.form.get('transaction_ref')
+                
                 cur.execute("""
-                    UPDATE payments 
+                    WITH old AS (
+                        SELECT id, level, total_amount FROM payments WHERE id = %s FOR UPDATE
+                    )
+                    UPDATE payments p
                     SET full_name = %s, matric_number = %s, level = %s, 
                         email = %s, phone_number = %s, total_amount = %s, 
                         transaction_ref = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (full_name, matric_number, level, email, phone_number,
-                      total_amount, transaction_ref, payment_id))
+                    FROM old
+                    WHERE p.id = old.id
+                    RETURNING p.created_at, p.level, p.status, p.total_amount,
+                              old.level AS previous_level, old.total_amount AS previous_amount
+                """, (payment_id, full_name, matric_number, level, email, phone_number,
+                      total_amount, transaction_ref))
+                move_payment_stats(cur, cur.fetchall())
                 conn.commit()
-            conn.close()
-            
-            flash('Payment updated successfully!', 'success')
-            return redirect(url_for('admin_view_payment', payment_id=payment_id))
+                invalidate_count_caches()
+                
+                flash('Payment updated successfully!', 'success')
+                return redirect(url_for('admin_view_payment', payment_id=payment_id))
         
-        conn.close()
         return render_template('admin/admin_edit_payment.html', payment=payment)
     except Exception as e:
         app.logger.error(f"Error editing payment: {e}")
@@ -1073,20 +2209,26 @@ def admin_edit_payment(payment_id):
 def admin_delete_payment(payment_id):
     """Delete a payment."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Get payment to find receipt file
-            cur.execute("SELECT receipt_filename FROM payments WHERE id = %s", (payment_id,))
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM payments WHERE id = %s
+                RETURNING receipt_filename, created_at, level, status, total_amount
+            """, (payment_id,))
             payment = cur.fetchone()
+            if payment:
+                add_to_payment_stats(cur, [payment], sign=-1)
             
+            # Receipts are deduplicated, so only remove the file once nothing else refers to it
+            orphaned = False
             if payment and payment['receipt_filename']:
-                receipt_path = os.path.join('uploads/receipts', payment['receipt_filename'])
-                if os.path.exists(receipt_path):
-                    os.remove(receipt_path)
-            
-            cur.execute("DELETE FROM payments WHERE id = %s", (payment_id,))
+                cur.execute("SELECT 1 FROM payments WHERE receipt_filename = %s LIMIT 1", (payment['receipt_filename'],))
+                orphaned = cur.fetchone() is None
             conn.commit()
-        conn.close()
+            invalidate_count_caches()
+            
+            if orphaned:
+                receipt_storage.delete(payment['receipt_filename'])
+                receipt_storage.delete(thumbnail_key(payment['receipt_filename']))
         
         flash('Payment deleted successfully!', 'success')
     except Exception as e:
@@ -1098,77 +2240,108 @@ def admin_delete_payment(payment_id):
 @app.route('/admin/receipts/<filename>')
 @admin_login_required
 def admin_view_receipt(filename):
-    """View receipt file."""
-    receipt_path = os.path.join('uploads/receipts', filename)
-    if os.path.exists(receipt_path):
-        return send_file(receipt_path)
-    else:
+    """View receipt file (supports Range and conditional requests)."""
+    try:
+        path = receipt_storage.local_path(filename)
+        source = path if path else receipt_storage.open(filename)
+        modified_at = receipt_storage.modified_at(filename)
+    except (FileNotFoundError, ValueError):
         flash('Receipt file not found!', 'error')
         return redirect(url_for('admin_payments'))
+    
+    # Content keys are hashes of the file, so they make a strong validator
+    response = send_file(source, download_name=filename, conditional=True,
+                         etag=filename.split('.', 1)[0] if is_content_key(filename) else True,
+                         last_modified=modified_at, max_age=RECEIPT_MAX_AGE)
+    response.headers['Cache-Control'] = f'private, max-age={RECEIPT_MAX_AGE}'
+    return response
+
+@app.route('/admin/receipts/<filename>/thumbnail')
+@admin_login_required
+def admin_receipt_thumbnail(filename):
+    """Small JPEG preview of a receipt (first page for PDFs), rendered on demand if missing."""
+    try:
+        thumb = receipt_thumbnails.get(filename)
+        if thumb is None:
+            return "No preview available", 404
+        path = receipt_storage.local_path(thumb)
+        response = send_file(path if path else receipt_storage.open(thumb), mimetype='image/jpeg',
+                             conditional=True, etag=True if path else thumb,
+                             last_modified=receipt_storage.modified_at(thumb), max_age=RECEIPT_MAX_AGE)
+    except (FileNotFoundError, ValueError):
+        return "No preview available", 404
+    response.headers['Cache-Control'] = f'private, max-age={RECEIPT_MAX_AGE}'
+    return response
 
 # =========================================================
 # --- ADMIN EXPORT ROUTES ---
 # =========================================================
+CSV_EXPORT_BATCH_SIZE = 1000
+
+def stream_csv_export(query, header, columns):
+    """Yield a CSV export chunk by chunk from a server-side cursor.
+
+    The header goes out before the query runs, then each batch of
+    ``CSV_EXPORT_BATCH_SIZE`` rows is formatted with the csv module and
+    yielded, so memory use does not grow with the table.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+    
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+    
+    writer.writerow(header)
+    yield flush()
+    
+    try:
+        with get_db_connection() as conn, conn.cursor(name='csv_export') as cur:
+            cur.execute(query)
+            while True:
+                rows = cur.fetchmany(CSV_EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                writer.writerows([('' if row[c] is None else row[c]) for c in columns] for row in rows)
+                yield flush()
+    except Exception as e:
+        app.logger.error(f"Error streaming CSV export: {e}")
+        raise
+
+def csv_export_response(prefix, query, header, columns):
+    """Build a streamed CSV attachment response."""
+    filename = f"{prefix}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    return Response(
+        stream_with_context(stream_csv_export(query, header, columns)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+    )
+
 @app.route('/admin/export/contacts')
 @admin_login_required
 def admin_export_contacts():
     """Export contacts to CSV."""
-    try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM contacts ORDER BY created_at DESC")
-            contacts = cur.fetchall()
-        conn.close()
-        
-        # Create CSV content
-        csv_content = "ID,Name,Email,Subject,Message,Created At\n"
-        for contact in contacts:
-            message_escaped = str(contact['message']).replace('"', '""')
-            csv_content += f'"{contact["id"]}","{contact["name"]}","{contact["email"]}","{contact["subject"]}","{message_escaped}","{contact["created_at"]}"\n'
-        
-        # Save to file
-        filename = f"contacts_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = os.path.join('uploads', filename)
-        os.makedirs('uploads', exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
-        
-        return send_file(filepath, as_attachment=True, download_name=filename)
-    except Exception as e:
-        app.logger.error(f"Error exporting contacts: {e}")
-        flash('Error exporting contacts', 'error')
-        return redirect(url_for('admin_contacts'))
+    return csv_export_response(
+        'contacts',
+        "SELECT * FROM contacts ORDER BY created_at DESC",
+        ['ID', 'Name', 'Email', 'Subject', 'Message', 'Created At'],
+        ['id', 'name', 'email', 'subject', 'message', 'created_at'],
+    )
 
 @app.route('/admin/export/payments')
 @admin_login_required
 def admin_export_payments():
     """Export payments to CSV."""
-    try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM payments ORDER BY created_at DESC")
-            payments = cur.fetchall()
-        conn.close()
-        
-        # Create CSV content
-        csv_content = "ID,Full Name,Matric Number,Level,Email,Phone,Total Amount,Status,Transaction Ref,Created At\n"
-        for payment in payments:
-            csv_content += f'"{payment["id"]}","{payment["full_name"]}","{payment["matric_number"]}","{payment["level"]}","{payment["email"]}","{payment["phone_number"]}","{payment["total_amount"]}","{payment["status"]}","{payment.get("transaction_ref", "")}","{payment["created_at"]}"\n'
-        
-        # Save to file
-        filename = f"payments_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = os.path.join('uploads', filename)
-        os.makedirs('uploads', exist_ok=True)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
-        
-        return send_file(filepath, as_attachment=True, download_name=filename)
-    except Exception as e:
-        app.logger.error(f"Error exporting payments: {e}")
-        flash('Error exporting payments', 'error')
-        return redirect(url_for('admin_payments'))
+    return csv_export_response(
+        'payments',
+        "SELECT * FROM payments ORDER BY created_at DESC",
+        ['ID', 'Full Name', 'Matric Number', 'Level', 'Email', 'Phone',
+         'Total Amount', 'Status', 'Transaction Ref', 'Created At'],
+        ['id', 'full_name', 'matric_number', 'level', 'email', 'phone_number',
+         'total_amount', 'status', 'transaction_ref', 'created_at'],
+    )
 
 # =========================================================
 # --- ADMIN STUDENTS ROUTES ---
@@ -1177,32 +2350,14 @@ def admin_export_payments():
 @admin_login_required
 def admin_students():
     """View all students with approve/reject options."""
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    offset = (page - 1) * per_page
-    
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) as count FROM students")
-            total = cur.fetchone()['count']
-            
-            cur.execute("""
-                SELECT * FROM students 
-                ORDER BY created_at DESC 
-                LIMIT %s OFFSET %s
-            """, (per_page, offset))
-            students = cur.fetchall()
-        conn.close()
-        
-        total_pages = (total + per_page - 1) // per_page
+        page = load_list_page('students')
         
         return render_template('admin/admin_students.html',
-                             students=students,
-                             page=page,
-                             total_pages=total_pages,
-                             has_prev=page > 1,
-                             has_next=page < total_pages)
+                             students=page['items'],
+                             total=page['total'],
+                             prev_token=page['prev_token'],
+                             next_token=page['next_token'])
     except Exception as e:
         app.logger.error(f"Error loading students: {e}")
         flash('Error loading students', 'error')
@@ -1213,25 +2368,20 @@ def admin_students():
 def admin_student_results(student_id):
     """View a student's results."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT * FROM students WHERE id = %s", (student_id,))
-            student = cur.fetchone()
-            
-            if not student:
-                flash('Student not found', 'error')
-                conn.close()
-                return redirect(url_for('admin_students'))
-            
-            cur.execute("""
+        students, results = run_read_queries([
+            ("SELECT * FROM students WHERE id = %s", (student_id,)),
+            ("""
                 SELECT r.*, s.session_name 
                 FROM results r
                 LEFT JOIN sessions s ON r.session_id = s.id
                 WHERE r.student_id = %s
                 ORDER BY s.session_name DESC, r.semester, r.course_code
-            """, (student_id,))
-            results = cur.fetchall()
-        conn.close()
+            """, (student_id,)),
+        ])
+        if not students:
+            flash('Student not found', 'error')
+            return redirect(url_for('admin_students'))
+        student = students[0]
         
         return render_template('admin/admin_student_results.html',
                              student=student,
@@ -1246,9 +2396,8 @@ def admin_student_results(student_id):
 def admin_toggle_student_status(student_id):
     """Approve or reject (activate/deactivate) a student account."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("SELECT is_active FROM students WHERE id = %s", (student_id,))
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT is_active, name, matric_number, email FROM students WHERE id = %s", (student_id,))
             student = cur.fetchone()
             
             if student:
@@ -1258,17 +2407,52 @@ def admin_toggle_student_status(student_id):
                     SET is_active = %s 
                     WHERE id = %s
                 """, (new_status, student_id))
+                if new_status:
+                    queue_email(cur, *account_approved_email(student))
                 conn.commit()
+                invalidate_count_caches()
+                email_outbox.wake()
                 
                 status_text = 'approved' if new_status else 'rejected'
                 flash(f'Student account {status_text} successfully!', 'success')
-        conn.close()
     except Exception as e:
         app.logger.error(f"Error toggling student status: {e}")
         flash('Error updating student status', 'error')
     
     return redirect(url_for('admin_students'))
 
+@app.route('/admin/results/<int:result_id>/delete', methods=['POST'])
+@admin_login_required
+def admin_delete_result(result_id):
+    """Delete a single result."""
+    student_id = None
+    try:
+        with get_db_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM results WHERE id = %s
+                RETURNING student_id, session_id, semester, course_unit, grade_point
+            """, (result_id,))
+            result = cur.fetchone()
+            
+            if result:
+                student_id = result['student_id']
+                if result['session_id'] is not None:
+                    remove_from_semester_summaries(cur, [(student_id, result['session_id'], result['semester'],
+                                                          result['course_unit'], result['grade_point'])])
+                bump_results_version(cur, [student_id])
+                conn.commit()
+                invalidate_count_caches()
+                flash('Result deleted successfully!', 'success')
+            else:
+                flash('Result not found', 'error')
+    except Exception as e:
+        app.logger.error(f"Error deleting result: {e}")
+        flash('Error deleting result', 'error')
+    
+    if student_id:
+        return redirect(url_for('admin_student_results', student_id=student_id))
+    return redirect(url_for('admin_students'))
+
 # =========================================================
 # --- ADMIN RESULTS ROUTES ---
 # =========================================================
@@ -1277,6 +2461,7 @@ def admin_toggle_student_status(student_id):
 def admin_upload_results():
     """Upload results for students."""
     admin = get_current_admin()
+    conn = get_request_db()
     
     if request.method == 'POST':
         try:
@@ -1292,15 +2477,14 @@ def admin_upload_results():
                 flash('All fields are required', 'error')
                 return redirect(url_for('admin_upload_results'))
             
-            conn = get_db_connection()
             with conn.cursor() as cur:
                 # Get student by matric number
-                cur.execute("SELECT id, level FROM students WHERE matric_number = %s", (student_matric,))
+                cur.execute("SELECT id, level, name, matric_number, email FROM students WHERE matric_number = %s",
+                            (student_matric,))
                 student = cur.fetchone()
                 
                 if not student:
                     flash('Student not found', 'error')
-                    conn.close()
                     return redirect(url_for('admin_upload_results'))
                 
                 student_id = student['id']
@@ -1317,21 +2501,27 @@ def admin_upload_results():
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """, (student_id, course_code, course_title, course_unit, 
                       score, grade, grade_point, semester, session_id, admin['id']))
+                add_to_semester_summaries(cur, [(student_id, session_id, semester, course_unit, grade_point)])
+                bump_results_version(cur, [student_id])
+                queue_email(cur, *results_published_email(student), delay=RESULT_NOTICE_DELAY, coalesce=True)
                 conn.commit()
-            conn.close()
+                invalidate_count_caches()
             
             flash('Result uploaded successfully!', 'success')
             return redirect(url_for('admin_upload_results'))
+        except psycopg.errors.UniqueViolation:
+            conn.rollback()
+            flash('This student already has a result for that course, session and semester. '
+                  'Delete it first to upload a correction.', 'error')
         except Exception as e:
+            conn.rollback()
             app.logger.error(f"Error uploading result: {e}")
             flash('Error uploading result', 'error')
     
     try:
-        conn = get_db_connection()
         with conn.cursor() as cur:
             cur.execute("SELECT * FROM sessions ORDER BY session_name DESC")
             sessions = cur.fetchall()
-        conn.close()
         
         return render_template('admin/admin_upload_results.html', sessions=sessions)
     except Exception as e:
@@ -1339,9 +2529,252 @@ def admin_upload_results():
         flash('Error loading form', 'error')
         return redirect(url_for('admin_dashboard'))
 
+# =========================================================
+# --- BULK RESULT UPLOAD ---
+# =========================================================
+RESULT_SHEET_EXTENSIONS = {'csv', 'xlsx'}
+RESULT_SHEET_COLUMNS = ('matric_number', 'course_code', 'score', 'semester', 'session')
+RESULT_SHEET_ALIASES = {
+    'matric': 'matric_number',
+    'matric_no': 'matric_number',
+    'course': 'course_code',
+    'session_name': 'session',
+}
+
+# Grades and grade points only depend on the (integer) score and whether the
+# student is in 100 level, so they are tabulated once and looked up per row.
+LETTER_GRADES = [get_letter_grade(score) for score in range(101)]
+GRADE_POINTS_100L = [calculate_grade_points(score, 100) for score in range(101)]
+GRADE_POINTS = [calculate_grade_points(score, 200) for score in range(101)]
+
+def _normalize_sheet_header(name):
+    key = re.sub(r'\W+', '_', str(name or '').strip().lower()).strip('_')
+    return RESULT_SHEET_ALIASES.get(key, key)
+
+def read_result_sheet(file):
+    """Read an uploaded CSV/XLSX result sheet into a list of row dicts."""
+    extension = file.filename.rsplit('.', 1)[-1].lower()
+    if extension == 'xlsx':
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError('XLSX uploads need the openpyxl package; upload a CSV instead.')
+        workbook = load_workbook(file.stream, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize_sheet_header(h) for h in next(rows, ())]
+        records = [dict(zip(header, row)) for row in rows if any(v is not None for v in row)]
+        workbook.close()
+    else:
+        reader = csv.reader(io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline=''))
+        header = [_normalize_sheet_header(h) for h in next(reader, [])]
+        records = [dict(zip(header, row)) for row in reader if any(cell.strip() for cell in row)]
+    
+    missing = [column for column in RESULT_SHEET_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return records
+
+def import_result_rows(conn, records, uploaded_by):
+    """Validate result rows and COPY the valid ones into ``results``.
+
+    Matric numbers, course codes and session names are each resolved with a
+    single query, the semester summaries are updated to match and each
+    affected student gets a (coalesced) results e-mail queued. Returns a per-row report (sheet line number, status and
+    message) and the number of rows inserted. The caller owns the transaction.
+    """
+    report = []
+    parsed = []
+    for line, record in enumerate(records, start=2):
+        matric = str(record.get('matric_number') or '').strip()
+        course_code = str(record.get('course_code') or '').strip().upper()
+        session_name = str(record.get('session') or '').strip()
+        try:
+            score = int(float(record.get('score')))
+            semester = int(float(record.get('semester')))
+        except (TypeError, ValueError, OverflowError):  # OverflowError: int(float('inf'))
+            report.append({'line': line, 'matric_number': matric, 'course_code': course_code,
+                           'status': 'error', 'message': 'Score and semester must be numbers'})
+            continue
+        
+        error = None
+        if not all([matric, course_code, session_name]):
+            error = 'Matric number, course code and session are required'
+        elif not 0 <= score <= 100:
+            error = 'Score must be between 0 and 100'
+        elif semester not in (1, 2):
+            error = 'Semester must be 1 or 2'
+        if error:
+            report.append({'line': line, 'matric_number': matric, 'course_code': course_code,
+                           'status': 'error', 'message': error})
+            continue
+        parsed.append((line, matric, course_code, score, semester, session_name))
+    
+    with conn.cursor() as cur:
+        cur.execute("SELECT id, matric_number, level, name, email FROM students WHERE matric_number = ANY(%s)",
+                    (list({row[1] for row in parsed}),))
+        students_by_matric = {row['matric_number']: row for row in cur.fetchall()}
+        
+        cur.execute("SELECT course_code, course_title, course_unit FROM courses WHERE course_code = ANY(%s)",
+                    (list({row[2] for row in parsed}),))
+        courses_by_code = {row['course_code']: row for row in cur.fetchall()}
+        
+        cur.execute("SELECT id, session_name FROM sessions WHERE session_name = ANY(%s)",
+                    (list({row[5] for row in parsed}),))
+        session_ids = {row['session_name']: row['id'] for row in cur.fetchall()}
+        
+        # One result per student, course, session and semester, also within the sheet
+        cur.execute("""
+            SELECT student_id, course_code, session_id, semester FROM results
+            WHERE student_id = ANY(%s) AND course_code = ANY(%s)
+        """, ([row['id'] for row in students_by_matric.values()], list(courses_by_code)))
+        existing = {tuple(row.values()) for row in cur.fetchall()}
+        
+        rows_to_insert = []
+        for line, matric, course_code, score, semester, session_name in parsed:
+            student = students_by_matric.get(matric)
+            course = courses_by_code.get(course_code)
+            session_id = session_ids.get(session_name)
+            key = (student and student['id'], course_code, session_id, semester)
+            error = ('Student not found' if not student else
+                     'Unknown course code' if not course else
+                     'Unknown session' if not session_id else
+                     'Result already uploaded for this course, session and semester' if key in existing else None)
+            if error:
+                report.append({'line': line, 'matric_number': matric, 'course_code': course_code,
+                               'status': 'error', 'message': error})
+                continue
+            
+            existing.add(key)
+            grade_points = GRADE_POINTS_100L if student['level'] == 100 else GRADE_POINTS
+            rows_to_insert.append((student['id'], course_code, course['course_title'], course['course_unit'],
+                                   score, LETTER_GRADES[score], grade_points[score], semester,
+                                   session_id, uploaded_by))
+            report.append({'line': line, 'matric_number': matric, 'course_code': course_code,
+                           'status': 'ok', 'message': f'{LETTER_GRADES[score]} ({score})'})
+        
+        if rows_to_insert:
+            with cur.copy("""
+                COPY results (student_id, course_code, course_title, course_unit,
+                              score, grade, grade_point, semester, session_id, uploaded_by)
+                FROM STDIN
+            """) as copy:
+                for row in rows_to_insert:
+                    copy.write_row(row)
+            
+            add_to_semester_summaries(cur, [(row[0], row[8], row[7], row[3], row[6]) for row in rows_to_insert])
+            bump_results_version(cur, {row[0] for row in rows_to_insert})
+            
+            notified = {row[0] for row in rows_to_insert}
+            queue_emails(cur, [results_published_email(student) for student in students_by_matric.values()
+                               if student['id'] in notified],
+                         delay=RESULT_NOTICE_DELAY, coalesce=True)
+    
+    report.sort(key=lambda entry: entry['line'])
+    return report, len(rows_to_insert)
+
+@app.route('/admin/results/upload/bulk', methods=['POST'])
+@admin_login_required
+def admin_bulk_upload_results():
+    """Upload a CSV/XLSX sheet of results in one transaction."""
+    admin = get_current_admin()
+    conn = get_request_db()
+    file = request.files.get('results_file')
+    
+    if not file or not file.filename:
+        flash('Please choose a CSV or XLSX file', 'error')
+        return redirect(url_for('admin_upload_results'))
+    if file.filename.rsplit('.', 1)[-1].lower() not in RESULT_SHEET_EXTENSIONS:
+        flash('Invalid file type. Only CSV and XLSX are allowed.', 'error')
+        return redirect(url_for('admin_upload_results'))
+    
+    try:
+        records = read_result_sheet(file)
+        report, inserted = import_result_rows(conn, records, admin['id'])
+        conn.commit()
+        invalidate_count_caches()
+    except ValueError as e:
+        conn.rollback()
+        flash(str(e), 'error')
+        return redirect(url_for('admin_upload_results'))
+    except Exception as e:
+        conn.rollback()
+        app.logger.error(f"Error bulk uploading results: {e}")
+        flash('Error uploading results', 'error')
+        return redirect(url_for('admin_upload_results'))
+    
+    failed = len(report) - inserted
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({'inserted': inserted, 'rejected': failed, 'rows': report})
+    
+    flash(f'{inserted} result(s) uploaded, {failed} row(s) rejected.', 'success' if not failed else 'warning')
+    with conn.cursor() as cur:
+        cur.execute("SELECT * FROM sessions ORDER BY session_name DESC")
+        sessions = cur.fetchall()
+    return render_template('admin/admin_upload_results.html', sessions=sessions, bulk_report=report)
+
 # =========================================================
 # --- API ROUTES ---
 # =========================================================
+COURSE_INDEX_TTL = float(os.environ.get('COURSE_INDEX_TTL', 300))
+_course_index = None
+_course_index_lock = threading.Lock()
+
+def _course_index_is_stale():
+    return _course_index is None or time.monotonic() - _course_index.loaded_at > COURSE_INDEX_TTL
+
+_course_index_refreshing = False
+COURSE_INDEX_QUERY = "SELECT course_code, course_title, course_unit, level, semester FROM courses"
+
+def get_course_index():
+    """Get the in-process course search index, (re)loading it from the courses table when stale.
+
+    With ASYNC_READS an expired index keeps serving while a fresh one is
+    loaded in the background, so searches never wait on the database
+    except for the very first load after start-up or an invalidation.
+    """
+    global _course_index
+    if _course_index_is_stale():
+        if ASYNC_READS and _course_index is not None:
+            refresh_course_index_async()
+            return _course_index
+        with _course_index_lock:
+            if _course_index_is_stale():
+                with get_db_connection() as conn, conn.cursor() as cur:
+                    cur.execute(COURSE_INDEX_QUERY)
+                    _course_index = CourseSearchIndex(cur.fetchall())
+    return _course_index
+
+def refresh_course_index_async():
+    """Reload the course index on the async pool, unless a reload is already running."""
+    global _course_index_refreshing
+    with _course_index_lock:
+        if _course_index_refreshing:
+            return
+        _course_index_refreshing = True
+    
+    def loaded(future):
+        global _course_index, _course_index_refreshing
+        try:
+            _course_index = CourseSearchIndex(future.result()[0])
+        except Exception as e:
+            app.logger.error(f"Error reloading course index: {e}")
+        finally:
+            _course_index_refreshing = False
+    
+    try:
+        pool = get_async_read_pool()
+        pool.submit(pool.fetch(COURSE_INDEX_QUERY)).add_done_callback(loaded)
+    except BaseException:
+        # The callback will never run; let the next stale read try again
+        with _course_index_lock:
+            _course_index_refreshing = False
+        raise
+
+def invalidate_course_index():
+    """Force the course index to reload on the next search (call after courses change)."""
+    global _course_index
+    _course_index = None
+
 @app.route('/api/courses/search')
 @admin_login_required
 def api_search_courses():
@@ -1352,18 +2785,7 @@ def api_search_courses():
         return jsonify([])
     
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT course_code, course_title, course_unit, level, semester
-                FROM courses
-                WHERE LOWER(course_code) LIKE LOWER(%s) 
-                   OR LOWER(course_title) LIKE LOWER(%s)
-                ORDER BY course_code
-                LIMIT 20
-            """, (f'%{query}%', f'%{query}%'))
-            courses = cur.fetchall()
-        conn.close()
+        courses = get_course_index().search(query, limit=20)
         
         return jsonify([{
             'course_code': c['course_code'],
@@ -1376,50 +2798,76 @@ def api_search_courses():
         app.logger.error(f"Error searching courses: {e}")
         return jsonify([])
 
+@app.route('/api/payments')
+@admin_login_required
+def api_list_payments():
+    """Page through payments; pass ``next_token``/``prev_token`` back as ``after``/``before``."""
+    status_filter = request.args.get('status', '')
+    if status_filter:
+        page = load_list_page('payments', 'status = %s', (status_filter,))
+    else:
+        page = load_list_page('payments')
+    return jsonify(page)
+
+@app.route('/api/students')
+@admin_login_required
+def api_list_students():
+    """Page through students; pass ``next_token``/``prev_token`` back as ``after``/``before``."""
+    page = load_list_page('students')
+    for student in page['items']:
+        student.pop('password_hash', None)
+    return jsonify(page)
+
+@app.route('/api/contacts')
+@admin_login_required
+def api_list_contacts():
+    """Page through contacts; pass ``next_token``/``prev_token`` back as ``after``/``before``."""
+    return jsonify(load_list_page('contacts'))
+
+@app.route('/api/db/pool-stats')
+@admin_login_required
+def api_db_pool_stats():
+    """Connection pool usage and saturation metrics."""
+    return jsonify(get_db_pool_stats())
+
+@app.route('/admin/perf', methods=['GET', 'POST'])
+@admin_login_required
+def admin_perf():
+    """Request latency percentiles per endpoint and the latest slow requests (all workers on this host)."""
+    if request.method == 'POST':
+        endpoint_stats.reset()
+        flash('Performance statistics cleared.', 'success')
+        return redirect(url_for('admin_perf'))
+    
+    endpoints = endpoint_stats.summary()
+    slow_requests = endpoint_stats.slow_requests()
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({'endpoints': endpoints, 'slow_requests': slow_requests})
+    return render_template('admin/admin_perf.html', endpoints=endpoints, slow_requests=slow_requests,
+                           slow_request_ms=SLOW_REQUEST_MS, profiling_enabled=PROFILING_ENABLED)
+
 # =========================================================
 # --- ADMIN STATISTICS ROUTE ---
 # =========================================================
+STATS_TREND_DAYS = int(os.environ.get('STATS_TREND_DAYS', 30))
+
 @app.route('/admin/stats')
 @admin_login_required
 def admin_stats():
-    """View statistics."""
+    """Payment statistics, read from the ``payment_daily_stats`` rollup."""
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
-            # Payment statistics by level
-            cur.execute("""
-                SELECT level, COUNT(*) as count, SUM(total_amount) as total
-                FROM payments
-                GROUP BY level
-                ORDER BY level
-            """)
-            level_stats = cur.fetchall()
-            
-            # Payment statistics by status
-            cur.execute("""
-                SELECT status, COUNT(*) as count, SUM(total_amount) as total
-                FROM payments
-                GROUP BY status
-                ORDER BY status
-            """)
-            status_stats = cur.fetchall()
-            
-            # Monthly payment trends
-            cur.execute("""
-                SELECT TO_CHAR(created_at, 'YYYY-MM') as month, 
-                       COUNT(*) as count, 
-                       SUM(total_amount) as total
-                FROM payments
-                GROUP BY month
-                ORDER BY month
-            """)
-            monthly_stats = cur.fetchall()
-        conn.close()
+        level_stats, status_stats, monthly_stats, daily_stats = run_read_queries(stats_queries(STATS_TREND_DAYS))
         
+        status_totals = {row['status']: row['count'] for row in status_stats}
         return render_template('admin_stats.html',
                              level_stats=level_stats,
                              status_stats=status_stats,
-                             monthly_stats=monthly_stats)
+                             monthly_stats=monthly_stats,
+                             daily_stats=daily_stats,
+                             trend_days=STATS_TREND_DAYS,
+                             approved_count=status_totals.get('approved', 0),
+                             pending_count=status_totals.get('pending', 0),
+                             total_amount=sum(row['total'] or 0 for row in status_stats))
     except Exception as e:
         app.logger.error(f"Error loading statistics: {e}")
         flash('Error loading statistics', 'error')
@@ -1429,14 +2877,14 @@ def admin_stats():
 # --- MAIN EXECUTION BLOCK ---
 # =========================================================
 if __name__ == '__main__':
-    # Initialize database on startup
+    # Apply pending schema migrations (a single version query when there are none)
     try:
         create_tables()
-        seed_database()
         app.logger.info("✅ Database initialized successfully")
     except Exception as e:
         app.logger.error(f"❌ Failed to initialize database: {e}")
         raise
     
-    # Run the application
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs gunicorn with gunicorn.conf.py (see procfile)
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)),
+            debug=os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes'))
@@ -0,0 +1,253 @@
+"""Fingerprinted, minified and pre-compressed JS/CSS bundles.
+
+Each bundle is the concatenation of a few files under ``static``. It is
+minified, named after a hash of its contents (``public.1a2b3c4d5e.js``) and
+kept in memory together with gzip and (if the ``brotli`` package is
+installed) brotli encodings, so a request only picks the right bytes.
+Bundles are rebuilt automatically when one of their sources changes.
+
+``python assets.py`` writes the same files to disk (with ``.gz``/``.br``
+siblings) for serving from a front-end proxy.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always produced
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+BUNDLES = {
+    'public.js': ['js/src/site.js'],
+    'payment.js': ['js/src/site.js', 'js/src/payment.js'],
+    'portal.js': ['js/src/portal.js'],
+    'style.css': ['css/style.css'],
+}
+
+DIGEST_LENGTH = 10
+MIME_TYPES = {'.js': 'application/javascript', '.css': 'text/css'}
+
+# Characters after which a '/' starts a regular expression literal rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete', 'new')
+
+
+def compress(content):
+    """Return ``{content_encoding: bytes}`` for ``content`` (gzip, plus brotli when available)."""
+    encodings = {'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(content, quality=11)
+    return encodings
+
+
+def minify_js(source):
+    """Strip comments and indentation from JavaScript.
+
+    Line breaks are kept (so automatic semicolon insertion still applies)
+    and strings, template literals and regular expressions are copied
+    untouched.
+    """
+    out = []
+    i, n = 0, len(source)
+    templates = []  # brace depth inside each open template literal ${ ... }
+    last = ''  # last significant character written
+
+    def space(token):
+        if not out:
+            return
+        if out[-1] in (' ', '\n'):
+            if token == '\n':
+                out[-1] = token
+        else:
+            out.append(token)
+
+    def prev_word():
+        match = re.search(r'(?<![\w$])([A-Za-z_$][\w$]*)[ \n]*$', ''.join(out[-16:]))
+        return match.group(1) if match else ''
+
+    while i < n:
+        c = source[i]
+        if c in '"\'':
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            i, last = j + 1, c
+        elif c == '`' or (c == '}' and templates and templates[-1] == 0):
+            if c == '}':
+                templates.pop()
+            j = i + 1
+            while j < n and source[j] != '`':
+                if source[j] == '\\':
+                    j += 2
+                elif source.startswith('${', j):
+                    templates.append(0)
+                    j += 2
+                    break
+                else:
+                    j += 1
+            else:
+                j += 1
+            out.append(source[i:j])
+            i, last = j, '`'
+        elif source.startswith('//', i):
+            while i < n and source[i] != '\n':
+                i += 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            space(' ')
+        elif c == '/' and (not last or last in _REGEX_PRECEDERS or prev_word() in _REGEX_KEYWORDS):
+            j, in_class = i + 1, False
+            while j < n and (in_class or source[j] != '/') and source[j] != '\n':
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and source[j].isalpha():
+                j += 1
+            out.append(source[i:j])
+            i, last = j, '/'
+        elif c in ' \t\r\n':
+            j = i
+            while j < n and source[j] in ' \t\r\n':
+                j += 1
+            space('\n' if '\n' in source[i:j] else ' ')
+            i = j
+        else:
+            if templates:
+                if c == '{':
+                    templates[-1] += 1
+                elif c == '}':
+                    templates[-1] -= 1
+            out.append(c)
+            i, last = i + 1, c
+
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(source):
+    """Strip comments and insignificant whitespace from CSS, leaving strings alone."""
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', source)
+    for k in range(0, len(parts), 2):
+        text = re.sub(r'/\*.*?\*/', '', parts[k], flags=re.S)
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+        text = re.sub(r':\s+', ':', text)
+        parts[k] = text.replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+
+class Bundle:
+    """One built bundle: the hashed name and its identity/gzip/brotli bytes."""
+
+    __slots__ = ('name', 'filename', 'stamps', 'content', 'encodings')
+
+    def __init__(self, name, filename, stamps, content, encodings):
+        self.name = name
+        self.filename = filename
+        self.stamps = stamps
+        self.content = content
+        self.encodings = encodings
+
+    @property
+    def mimetype(self):
+        return MIME_TYPES[os.path.splitext(self.name)[1]]
+
+
+class AssetBundles:
+    """Builds ``BUNDLES`` from ``static_dir`` and keeps the results in memory."""
+
+    def __init__(self, static_dir, bundles=BUNDLES):
+        self.static_dir = static_dir
+        self.bundles = bundles
+        self._built = {}
+        self._by_filename = {}
+        self._lock = threading.Lock()
+
+    def _stamps(self, name):
+        stamps = []
+        for source in self.bundles[name]:
+            stat = os.stat(os.path.join(self.static_dir, source))
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        return stamps
+
+    def _build(self, name, stamps):
+        chunks = []
+        for source in self.bundles[name]:
+            with open(os.path.join(self.static_dir, source), encoding='utf-8') as f:
+                chunks.append(f.read())
+        stem, ext = os.path.splitext(name)
+        minify = minify_css if ext == '.css' else minify_js
+        content = ''.join(minify(chunk) for chunk in chunks).encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()[:DIGEST_LENGTH]
+        return Bundle(name, f"{stem}.{digest}{ext}", stamps, content, compress(content))
+
+    def get(self, name):
+        """Return the current ``Bundle`` for logical ``name`` (e.g. ``'public.js'``)."""
+        stamps = self._stamps(name)
+        bundle = self._built.get(name)
+        if bundle is not None and bundle.stamps == stamps:
+            return bundle
+        with self._lock:
+            bundle = self._built.get(name)
+            if bundle is None or bundle.stamps != stamps:
+                bundle = self._build(name, stamps)
+                self._built[name] = bundle
+                self._by_filename[bundle.filename] = bundle
+                logger.info(f"Built asset bundle {bundle.filename} ({len(bundle.content)} bytes)")
+        return bundle
+
+    def find(self, filename):
+        """Return the bundle whose hashed filename is ``filename``, or None."""
+        bundle = self._by_filename.get(filename)
+        if bundle is None:
+            stem = filename.split('.', 1)[0]
+            for name in self.bundles:
+                if name.split('.', 1)[0] == stem:
+                    self.get(name)
+            bundle = self._by_filename.get(filename)
+        return bundle
+
+    def write(self, out_dir):
+        """Write every bundle plus ``.gz``/``.br`` siblings and a manifest.json to ``out_dir``."""
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = {}
+        for name in self.bundles:
+            bundle = self.get(name)
+            manifest[name] = bundle.filename
+            files = {bundle.filename: bundle.content}
+            suffixes = {'gzip': '.gz', 'br': '.br'}
+            for encoding, data in bundle.encodings.items():
+                files[bundle.filename + suffixes[encoding]] = data
+            for filename, data in files.items():
+                with open(os.path.join(out_dir, filename), 'wb') as f:
+                    f.write(data)
+        with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build fingerprinted asset bundles.')
+    parser.add_argument('--static', default='static')
+    parser.add_argument('--out', default=os.path.join('static', 'dist'))
+    args = parser.parse_args()
+
+    bundles = AssetBundles(args.static)
+    for name, filename in bundles.write(args.out).items():
+        bundle = bundles.get(name)
+        sizes = ', '.join(f"{encoding} {len(data)}" for encoding, data in bundle.encodings.items())
+        print(f"{name} -> {filename} ({len(bundle.content)} bytes; {sizes})")
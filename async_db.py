@@ -0,0 +1,105 @@
+"""Concurrent read-only queries on a psycopg ``AsyncConnectionPool``.
+
+Flask handlers are synchronous, so ``AsyncReadPool`` runs its own event
+loop on a background thread and owns an ``AsyncConnectionPool`` bound to
+that loop. A handler hands it a batch of independent queries with
+``fetch_many``; they run concurrently, each on its own pooled connection,
+and the handler waits for the whole batch instead of one round trip per
+query. Because one loop multiplexes every request thread in the process,
+the number of database connections is set by the pool size, not by the
+number of worker threads.
+
+The loop and pool are started on first use and restarted if the process
+has forked since (e.g. gunicorn workers forked from a preloaded app).
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from psycopg import AsyncCursor
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReadPool:
+    """An ``AsyncConnectionPool`` on a private event-loop thread, usable from synchronous code."""
+
+    def __init__(self, conninfo, min_size=2, max_size=10, timeout=10.0, name='async-read'):
+        self.conninfo = conninfo
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.name = name
+        self._loop = None
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name=self.name, daemon=True).start()
+        pool = AsyncConnectionPool(
+            self.conninfo,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            timeout=self.timeout,
+            kwargs={'row_factory': dict_row, 'autocommit': True, 'cursor_factory': AsyncCursor},
+            check=AsyncConnectionPool.check_connection,
+            name=self.name,
+            open=False,
+        )
+        asyncio.run_coroutine_threadsafe(pool.open(), loop).result()
+        self._loop, self._pool, self._pid = loop, pool, os.getpid()
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Anything inherited across a fork belongs to the parent; start afresh
+                    self._loop = self._pool = None
+                    self._start()
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the pool's loop; returns a ``concurrent.futures.Future``."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro):
+        """Run ``coro`` on the pool's loop and wait for its result."""
+        return self.submit(coro).result()
+
+    async def fetch(self, query, params=None):
+        """``(rows, seconds)`` for one query on a connection of its own."""
+        async with self._pool.connection() as conn:
+            started = time.perf_counter()
+            cur = await conn.execute(query, params)
+            rows = await cur.fetchall()
+            return rows, time.perf_counter() - started
+
+    async def _gather(self, queries):
+        return await asyncio.gather(*(self.fetch(query, params) for query, params in queries))
+
+    def fetch_many(self, queries):
+        """Run independent ``(query, params)`` pairs concurrently; returns ``[(rows, seconds), ...]`` in order."""
+        return self.run(self._gather(queries))
+
+    def stats(self):
+        if self._pool is None or self._pid != os.getpid():
+            return {'pool_open': False}
+        stats = self._pool.get_stats()
+        stats['pool_open'] = True
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                try:
+                    asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result(timeout=5)
+                except Exception as e:
+                    logger.warning(f"Error closing async pool {self.name}: {e}")
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = self._pool = self._pid = None
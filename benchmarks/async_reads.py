@@ -0,0 +1,196 @@
+"""Throughput of the heavy read pages with synchronous vs. async reads.
+
+Starts the app under gunicorn twice, with ASYNC_READS=false and then
+ASYNC_READS=true, and drives each read endpoint with CONCURRENCY
+keep-alive clients for DURATION seconds. It reports requests/sec and
+latency percentiles for each mode. A benchmark student (with an approved
+payment and a semester of results) is created on first run. Run from the
+repo root against a migrated database:
+
+    DATABASE_URL=postgresql://... python benchmarks/async_reads.py
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from profiling import percentile  # noqa: E402
+
+CONCURRENCY = 500
+DURATION = 10
+PORT = 8765
+BENCH_MATRIC = 'BENCH/0001'
+BENCH_EMAIL = 'bench.student@example.com'
+BENCH_PASSWORD = 'bench-password'
+
+
+def ensure_fixture():
+    """Create the benchmark student with an approved payment and results; returns the student id."""
+    from werkzeug.security import generate_password_hash
+
+    from app import add_to_payment_stats, create_tables, get_db_connection, import_result_rows
+
+    create_tables()
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM students WHERE matric_number = %s", (BENCH_MATRIC,))
+            row = cur.fetchone()
+            if row:
+                return row['id']
+            cur.execute("""
+                INSERT INTO students (name, matric_number, level, email, password_hash)
+                VALUES ('Benchmark Student', %s, 100, %s, %s) RETURNING id
+            """, (BENCH_MATRIC, BENCH_EMAIL, generate_password_hash(BENCH_PASSWORD)))
+            student_id = cur.fetchone()['id']
+            cur.execute("""
+                INSERT INTO payments (full_name, matric_number, level, email, phone_number, payment_items,
+                                      total_amount, status)
+                VALUES ('Benchmark Student', %s, 100, %s, '0', '[]', 5000, 'approved')
+                RETURNING id, created_at, level, status, total_amount
+            """, (BENCH_MATRIC, BENCH_EMAIL))
+            add_to_payment_stats(cur, cur.fetchall())
+            cur.execute("SELECT course_code FROM courses ORDER BY course_code LIMIT 12")
+            courses = [r['course_code'] for r in cur.fetchall()]
+            cur.execute("SELECT session_name FROM sessions ORDER BY session_name DESC LIMIT 1")
+            session_name = cur.fetchone()['session_name']
+        records = [{'matric_number': BENCH_MATRIC, 'course_code': code, 'score': 40 + i * 5,
+                    'semester': 1 + i % 2, 'session': session_name} for i, code in enumerate(courses)]
+        import_result_rows(conn, records, None)
+        conn.commit()
+    return student_id
+
+
+def start_server(async_reads, workers, threads):
+    env = dict(os.environ, ASYNC_READS='true' if async_reads else 'false', PROFILING_ENABLED='false',
+               LOG_LEVEL='WARNING')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-k', 'gthread', '-w', str(workers), '--threads', str(threads),
+         '--worker-connections', str(CONCURRENCY * 2), '--backlog', str(CONCURRENCY * 2),
+         '-b', f'127.0.0.1:{PORT}', '--log-level', 'warning', 'app:app'],
+        cwd=ROOT, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', PORT), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start')
+
+
+async def request(reader, writer, method, path, cookie='', body=b''):
+    """One HTTP/1.1 keep-alive request; returns ``(status, headers, body)``."""
+    head = f'{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: keep-alive\r\n'
+    if cookie:
+        head += f'Cookie: {cookie}\r\n'
+    if body:
+        head += f'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n'
+    writer.write(head.encode() + b'\r\n' + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.setdefault(name.strip().lower(), []).append(value.strip())
+    length = int(headers.get('content-length', ['0'])[0])
+    payload = await reader.readexactly(length) if length else b''
+    return int(status_line.split()[1]), headers, payload
+
+
+async def login(path, form):
+    reader, writer = await asyncio.open_connection('127.0.0.1', PORT)
+    try:
+        _, headers, _ = await request(reader, writer, 'POST', path, body=urllib.parse.urlencode(form).encode())
+    finally:
+        writer.close()
+    return '; '.join(c.split(';', 1)[0] for c in headers.get('set-cookie', []))
+
+
+async def load(path, cookie, concurrency, duration):
+    """``(requests/sec, sorted latencies, errors)`` for ``concurrency`` clients hitting ``path``."""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client():
+        nonlocal errors
+        reader = writer = None
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            reused = writer is not None
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection('127.0.0.1', PORT)
+                status, headers, _ = await request(reader, writer, 'GET', path, cookie)
+                if status != 200:
+                    errors += 1
+                if 'close' in headers.get('connection', []):
+                    writer.close()
+                    writer = None
+            except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+                # Like a browser, retry on a new connection when the server closed an idle
+                # keep-alive one (e.g. a gunicorn worker being recycled)
+                errors += not reused
+                writer = None
+                continue
+            latencies.append(time.perf_counter() - started)
+        if writer is not None:
+            writer.close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return len(latencies) / (time.monotonic() - started), sorted(latencies), errors
+
+
+async def run_mode(student_id, concurrency, duration):
+    admin = await login('/admin/login', {'username': 'admin', 'password': 'aeeAdmin'})
+    student = await login('/student/login', {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD})
+    endpoints = [
+        ('student_dashboard', '/student/dashboard', student),
+        ('admin_student_results', f'/admin/students/{student_id}/results', admin),
+        ('admin_stats', '/admin/stats', admin),
+        ('api_search_courses', '/api/courses/search?q=AGE', admin),
+    ]
+    results = {}
+    for name, path, cookie in endpoints:
+        results[name] = await load(path, cookie, concurrency, duration)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DURATION)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    student_id = ensure_fixture()
+    print(f"{args.concurrency} clients, {args.duration:g}s per endpoint, "
+          f"gunicorn gthread {args.workers}x{args.threads}")
+    print(f"{'endpoint':<24}{'mode':<7}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for async_reads in (False, True):
+        server = start_server(async_reads, args.workers, args.threads)
+        try:
+            results = asyncio.run(run_mode(student_id, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        for name, (rps, latencies, errors) in results.items():
+            print(f"{name:<24}{'async' if async_reads else 'sync':<7}{rps:>9.1f}"
+                  f"{percentile(latencies, 0.50) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Latency benchmark for the in-process course search index.
+
+Builds a synthetic 5,000-course catalogue and times CourseSearchIndex.search
+for the kinds of queries the autocomplete sends. Run from the repo root:
+
+    python benchmarks/course_search.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_search import CourseSearchIndex  # noqa: E402
+
+CATALOGUE_SIZE = 5000
+ITERATIONS = 2000
+
+DEPARTMENTS = ['AGE', 'CHE', 'CVE', 'EEE', 'MEE', 'PEE', 'WRM', 'FST', 'ABE', 'ENV']
+WORDS = ['Introduction', 'Engineering', 'Mechanics', 'Fluid', 'Thermodynamics', 'Soil', 'Water',
+         'Farm', 'Power', 'Machinery', 'Processing', 'Design', 'Drawing', 'Mathematics', 'Physics',
+         'Chemistry', 'Hydrology', 'Irrigation', 'Drainage', 'Structures', 'Materials', 'Systems',
+         'Environmental', 'Control', 'Instrumentation', 'Renewable', 'Energy', 'Storage', 'Analysis']
+
+QUERIES = {
+    'exact code': ['AGE 101', 'CVE 305', 'EEE 2204'],
+    'code prefix': ['age', 'cve 3', 'mee4'],
+    'title words': ['farm mach', 'soil', 'renew ener'],
+    'substring': ['ydrol', 'ineer', 'ics'],
+    'no match': ['zzq', 'xylophone'],
+}
+
+
+def build_catalogue(size, seed=42):
+    rng = random.Random(seed)
+    courses = []
+    for i in range(size):
+        department = DEPARTMENTS[i % len(DEPARTMENTS)]
+        number = 100 + i // len(DEPARTMENTS)
+        courses.append({
+            'course_code': f"{department} {number}",
+            'course_title': ' '.join(rng.sample(WORDS, rng.randint(2, 5))),
+            'course_unit': rng.choice([1, 2, 3, 4, 6]),
+            'level': min(500, (number // 100) * 100),
+            'semester': rng.choice([1, 2]),
+        })
+    return courses
+
+
+def main():
+    courses = build_catalogue(CATALOGUE_SIZE)
+    started = time.perf_counter()
+    index = CourseSearchIndex(courses)
+    print(f"indexed {len(index)} courses in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"{'query kind':<14}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}")
+
+    for kind, queries in QUERIES.items():
+        timings = []
+        for i in range(ITERATIONS):
+            query = queries[i % len(queries)]
+            started = time.perf_counter()
+            index.search(query, limit=20)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{kind:<14}{statistics.median(timings):>10.3f}{p99:>10.3f}{timings[-1]:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Plan regression check for the hot queries.
+
+Runs EXPLAIN on each query the result portal and payment pages depend on
+and fails if it no longer uses the index it was tuned for. Sequential
+scans are disabled for the check, so a small development database still
+shows which index the planner *can* use. Run from the repo root against a
+migrated database:
+
+    DATABASE_URL=postgresql://... python benchmarks/query_plans.py
+
+tests/test_query_plans.py runs the same checks under pytest.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# name: (query, params, index the plan must use)
+HOT_QUERIES = {
+    'student results (dashboard, admin view)': (
+        """SELECT r.*, s.session_name FROM results r LEFT JOIN sessions s ON r.session_id = s.id
+           WHERE r.student_id = %s ORDER BY s.session_name DESC, r.semester, r.course_code""",
+        (1,), 'results_student_course_session_semester_key'),
+    'semester summaries': (
+        """SELECT ss.semester, ss.total_units, ss.gpa, ss.cgpa, s.session_name
+           FROM student_semester_summary ss JOIN sessions s ON ss.session_id = s.id
+           WHERE ss.student_id = %s ORDER BY s.session_name DESC, ss.semester""",
+        (1,), 'student_semester_summary_pkey'),
+    'approved payment check': (
+        "SELECT 1 FROM payments WHERE matric_number = %s AND status = 'approved' LIMIT 1",
+        ('AGE/2020/001',), 'idx_payments_approved_matric'),
+    'payments by status, newest first': (
+        "SELECT * FROM payments WHERE status = %s ORDER BY created_at DESC, id DESC LIMIT 20",
+        ('pending',), 'idx_payments_status_created'),
+    'duplicate payment check': (
+        "SELECT id FROM payments WHERE matric_number = %s",
+        ('AGE/2020/001',), 'idx_payments_matric'),
+    'student login': (
+        "SELECT * FROM students WHERE email = %s",
+        ('student@example.com',), 'idx_students_email'),
+    'student lookup by matric number': (
+        "SELECT id, level, name, matric_number, email FROM students WHERE matric_number = %s",
+        ('AGE/2020/001',), 'students_matric_number_key'),
+    'results referencing a session': (
+        "SELECT 1 FROM results WHERE session_id = %s LIMIT 1",
+        (1,), 'idx_results_session'),
+    'results uploaded by an admin': (
+        "SELECT 1 FROM results WHERE uploaded_by = %s LIMIT 1",
+        (1,), 'idx_results_uploaded_by'),
+}
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def check(cur, query, params, index):
+    """Return ``(ok, indexes used, sequential scans)`` for one query."""
+    cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    nodes = list(plan_nodes(cur.fetchone()['QUERY PLAN'][0]['Plan']))
+    used = sorted({node['Index Name'] for node in nodes if 'Index Name' in node})
+    seq_scans = sorted({node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan'})
+    return index in used, used, seq_scans
+
+
+def main():
+    from app import get_db_connection
+
+    failures = 0
+    with get_db_connection() as conn, conn.cursor() as cur:
+        cur.execute("SET LOCAL enable_seqscan = off")
+        for name, (query, params, index) in HOT_QUERIES.items():
+            ok, used, seq_scans = check(cur, query, params, index)
+            failures += not ok
+            detail = f"uses {', '.join(used) or 'no index'}"
+            if seq_scans:
+                detail += f"; seq scan on {', '.join(seq_scans)}"
+            print(f"{'ok  ' if ok else 'FAIL'} {name:<42} {detail}" + ('' if ok else f" (expected {index})"))
+        conn.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
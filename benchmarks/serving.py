@@ -0,0 +1,88 @@
+"""Throughput of the production gunicorn setup vs. the development server.
+
+Starts main.py's launcher (Werkzeug's server, with FLASK_DEBUG=1 as it
+used to run) and then gunicorn with gunicorn.conf.py. It drives a public
+page, the student dashboard, an admin page and the course search with
+CONCURRENCY keep-alive clients for DURATION seconds per endpoint. It
+reports requests/sec and latency percentiles for each. Run from the repo
+root against a migrated database:
+
+    DATABASE_URL=postgresql://... python benchmarks/serving.py
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from async_reads import PORT, ROOT, ensure_fixture, load, login
+
+from profiling import percentile  # noqa: E402  (async_reads puts the repo root on sys.path)
+
+CONCURRENCY = 100
+DURATION = 10
+
+LAUNCHERS = {
+    'dev server': ([sys.executable, 'main.py'], {'FLASK_DEBUG': '1'}),
+    'gunicorn': ([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'], {}),
+}
+
+
+def start(command, extra_env):
+    env = dict(os.environ, PORT=str(PORT), PROFILING_ENABLED='false', LOG_LEVEL='WARNING', **extra_env)
+    # Own process group: the debug reloader runs the app in a child process
+    server = subprocess.Popen(command, cwd=ROOT, env=env, start_new_session=True,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', PORT), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    stop(server)
+    raise RuntimeError(f"{command} did not start")
+
+
+def stop(server):
+    os.killpg(server.pid, signal.SIGTERM)
+    server.wait()
+
+
+async def run(student_id, concurrency, duration):
+    admin = await login('/admin/login', {'username': 'admin', 'password': 'aeeAdmin'})
+    student = await login('/student/login', {'email': 'bench.student@example.com', 'password': 'bench-password'})
+    endpoints = [
+        ('index', '/', ''),
+        ('student_dashboard', '/student/dashboard', student),
+        ('admin_student_results', f'/admin/students/{student_id}/results', admin),
+        ('api_search_courses', '/api/courses/search?q=AGE', admin),
+    ]
+    return {name: await load(path, cookie, concurrency, duration) for name, path, cookie in endpoints}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DURATION)
+    args = parser.parse_args()
+
+    student_id = ensure_fixture()
+    print(f"{args.concurrency} clients, {args.duration:g}s per endpoint, {os.cpu_count()} CPUs")
+    print(f"{'endpoint':<24}{'launcher':<12}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for launcher, (command, extra_env) in LAUNCHERS.items():
+        server = start(command, extra_env)
+        try:
+            results = asyncio.run(run(student_id, args.concurrency, args.duration))
+        finally:
+            stop(server)
+        for name, (rps, latencies, errors) in results.items():
+            print(f"{name:<24}{launcher:<12}{rps:>9.1f}"
+                  f"{percentile(latencies, 0.50) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""In-process search index over the course catalogue, used for autocomplete."""
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+
+MAX_PREFIX_LENGTH = 12
+
+
+def _compact(text):
+    """Lowercase and drop everything but letters and digits ('AGE 101' -> 'age101')."""
+    return re.sub(r'[^a-z0-9]', '', str(text).lower())
+
+
+def _words(text):
+    return re.findall(r'[a-z0-9]+', str(text).lower())
+
+
+def _ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class CourseSearchIndex:
+    """Ranked prefix/substring search over courses.
+
+    Matches are ranked as: exact course code, course code prefix, title words
+    starting with every query word, then any substring of code or title.
+    Within a rank, courses are ordered by course code. Substring candidates
+    come from a bigram/trigram index, so no lookup scans the whole catalogue.
+    """
+
+    def __init__(self, courses=()):
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.load(courses)
+
+    def load(self, courses):
+        """Replace the indexed catalogue with ``courses`` (dicts with at least course_code and course_title)."""
+        courses = sorted((dict(c) for c in courses), key=lambda c: c['course_code'])
+        codes = [_compact(c['course_code']) for c in courses]
+        texts = [f"{c['course_code']} {c['course_title']}".lower() for c in courses]
+        word_prefixes = defaultdict(set)
+        grams = defaultdict(set)
+
+        for i, course in enumerate(courses):
+            for word in _words(course['course_title']):
+                for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1):
+                    word_prefixes[word[:length]].add(i)
+            for text in (texts[i], codes[i]):
+                for gram in _ngrams(text, 2) | _ngrams(text, 3):
+                    grams[gram].add(i)
+
+        # Swap everything in at once so concurrent searches see a consistent index
+        with self._lock:
+            self._courses = courses
+            self._codes = codes
+            self._sorted_codes = sorted((code, i) for i, code in enumerate(codes))
+            self._texts = texts
+            self._word_prefixes = dict(word_prefixes)
+            self._grams = dict(grams)
+            self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self._courses)
+
+    def search(self, query, limit=20):
+        """Return up to ``limit`` course dicts matching ``query``, best first."""
+        with self._lock:
+            courses, codes, sorted_codes = self._courses, self._codes, self._sorted_codes
+            texts, word_prefixes, grams = self._texts, self._word_prefixes, self._grams
+
+        text = ' '.join(str(query).lower().split())
+        compact = _compact(text)
+        if not compact:
+            return []
+
+        results = []
+        seen = set()
+
+        def take(indexes):
+            for i in indexes:
+                if i not in seen:
+                    seen.add(i)
+                    results.append(courses[i])
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        # 1 + 2. Exact course code, then course codes starting with the query
+        start = bisect.bisect_left(sorted_codes, (compact, -1))
+        exact = []
+        prefixed = []
+        for code, i in sorted_codes[start:]:
+            if not code.startswith(compact) or len(exact) + len(prefixed) >= limit:
+                break
+            (exact if code == compact else prefixed).append(i)
+        if take(exact) or take(prefixed):
+            return results
+
+        # 3. Every query word starts a word of the title
+        words = _words(text)
+        word_sets = []
+        for word in words:
+            matches = word_prefixes.get(word[:MAX_PREFIX_LENGTH], set())
+            if len(word) > MAX_PREFIX_LENGTH:
+                matches = {i for i in matches if any(w.startswith(word) for w in _words(courses[i]['course_title']))}
+            word_sets.append(matches)
+        if word_sets and take(sorted(set.intersection(*word_sets))):
+            return results
+
+        # 4. Substring of the code or title
+        n = 3 if len(text) >= 3 else 2
+        query_grams = _ngrams(text, n) if len(text) >= 2 else set()
+        candidates = None
+        for gram in sorted(query_grams, key=lambda g: len(grams.get(g, ()))):
+            candidates = set(grams.get(gram, ())) if candidates is None else candidates & grams.get(gram, set())
+            if not candidates:
+                break
+        if candidates:
+            take(sorted(i for i in candidates if text in texts[i] or compact in codes[i]))
+        return results
@@ -0,0 +1,77 @@
+"""Production gunicorn settings (``gunicorn -c gunicorn.conf.py app:app``, as in the procfile).
+
+Every setting can be overridden from the environment:
+
+- PORT / GUNICORN_BIND: listen address (default ``0.0.0.0:$PORT``, PORT 8000)
+- WEB_CONCURRENCY: worker processes (default 2 x CPUs + 1, at most 8)
+- GUNICORN_WORKER_CLASS: ``gthread`` (default) or ``gevent`` (needs gevent installed)
+- GUNICORN_THREADS: threads per gthread worker (default 4)
+- DB_POOL_MAX_SIZE: connections per pool in each worker (default threads + 1)
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: recycle a worker after
+  this many requests, to cap memory growth (default 1000 +/- 100)
+- GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT / GUNICORN_KEEPALIVE
+- GUNICORN_ACCESS_LOG: access log path (``-`` for stderr, off by default)
+
+The app is preloaded: imports, asset bundling and page-cache warm-up
+happen once in the master, pending schema migrations are applied once
+in ``when_ready``, and workers are forked from that state. Each worker
+opens its own database pools in ``post_fork``. A worker runs at most
+``threads`` requests at once, so its pools default to one connection per
+thread plus one for the e-mail outbox. Each worker can open a primary
+pool and, with ASYNC_READS, an async pool of that size. The defaults (8
+workers x 2 pools x 5) therefore stay under PostgreSQL's default
+max_connections of 100. Keep WEB_CONCURRENCY x DB_POOL_MAX_SIZE x 2
+under the database's limit when raising either.
+
+Reloading: ``kill -HUP`` restarts the workers gracefully with the
+preloaded code; to deploy new code without dropping requests send
+``USR2`` (starts a new master) and then ``QUIT`` to the old master.
+
+``python benchmarks/serving.py`` compares this setup with the
+development server started by main.py.
+"""
+import multiprocessing
+import os
+import threading
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# Read by app.py, which the preloading master imports after this file
+os.environ.setdefault('DB_POOL_MAX_SIZE', str(threads + 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+# Threads started while the app is imported, finished before forking so
+# workers inherit their results and no lock is held mid-fork
+STARTUP_THREADS = ('page-cache-warm', 'image-prebuild')
+
+
+def when_ready(server):
+    """Apply pending schema migrations once, then release the master's connections before forking."""
+    from app import close_db_pool, create_tables
+
+    create_tables()
+    for thread in threading.enumerate():
+        if thread.name in STARTUP_THREADS:
+            thread.join(30)
+    close_db_pool()
+    server.log.info("Database initialized; forking workers")
+
+
+def post_fork(server, worker):
+    """Give each worker its own database pools."""
+    from app import reset_db_pools_after_fork
+
+    reset_db_pools_after_fork()
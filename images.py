@@ -0,0 +1,257 @@
+"""Responsive image variants for ``static/images``.
+
+Every source image is resized to a fixed set of widths and re-encoded as
+AVIF and WebP, with JPEG (or PNG for images with transparency) as the
+fallback. Variant names carry a hash of the source bytes, for example
+``staff/alabi.3f9c2a1b7e.w320.webp``, so they can be cached forever and
+replacing a source changes every URL that points at it.
+
+Variants are produced the first time they are requested and kept in the
+cache directory. ``python images.py`` generates all of them ahead of time.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import re
+import threading
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; templates fall back to the original files
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDTHS = (80, 160, 320, 640, 960, 1280, 1920)
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+DIGEST_LENGTH = 10
+
+VARIANT_RE = re.compile(
+    r'^(?P<stem>.+)\.(?P<digest>[0-9a-f]{%d})\.w(?P<width>\d+)\.(?P<fmt>avif|webp|jpg|png)$' % DIGEST_LENGTH)
+
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 55, 'speed': 6},
+    'webp': {'format': 'WEBP', 'quality': 78, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpg': 'image/jpeg', 'png': 'image/png'}
+
+
+class SourceImage:
+    """What the pipeline knows about one file under the source directory."""
+
+    __slots__ = ('path', 'stamp', 'digest', 'width', 'height', 'has_alpha')
+
+    def __init__(self, path, stamp, digest, width, height, has_alpha):
+        self.path = path
+        self.stamp = stamp
+        self.digest = digest
+        self.width = width
+        self.height = height
+        self.has_alpha = has_alpha
+
+    @property
+    def fallback_format(self):
+        return 'png' if self.has_alpha else 'jpg'
+
+
+class ImagePipeline:
+    """Resize and re-encode images from ``source_dir`` into ``cache_dir`` on demand."""
+
+    def __init__(self, source_dir, cache_dir, widths=DEFAULT_WIDTHS):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.widths = tuple(sorted(set(widths)))
+        self.available = Image is not None
+        self.formats = ('avif', 'webp') if self.available and features.check('avif') else ('webp',)
+        self._sources = {}
+        self._stems = None
+        self._lock = threading.Lock()
+        self._render_locks = {}
+
+    # --- sources -------------------------------------------------------------
+
+    def _scan(self):
+        stems = {}
+        for root, _, files in os.walk(self.source_dir):
+            for name in sorted(files):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in SOURCE_EXTENSIONS:
+                    rel_dir = os.path.relpath(root, self.source_dir)
+                    rel_stem = stem if rel_dir == '.' else f"{rel_dir.replace(os.sep, '/')}/{stem}"
+                    stems.setdefault(rel_stem, rel_stem + ext)
+        with self._lock:
+            self._stems = stems
+        return stems
+
+    def _resolve_source(self, filename):
+        """Absolute path of ``filename`` if it is inside the source directory."""
+        root = os.path.realpath(self.source_dir)
+        path = os.path.realpath(os.path.join(root, filename))
+        if not path.startswith(root + os.sep) or os.path.splitext(path)[1].lower() not in SOURCE_EXTENSIONS:
+            return None
+        return path
+
+    def source(self, filename):
+        """Return the ``SourceImage`` for ``filename`` (relative to the source directory), or None."""
+        if not self.available:
+            return None
+        path = self._resolve_source(filename)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            info = self._sources.get(filename)
+        if info is not None and info.stamp == stamp:
+            return info
+
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()[:DIGEST_LENGTH]
+            with Image.open(path) as im:
+                im = ImageOps.exif_transpose(im)
+                width, height = im.size
+                has_alpha = im.mode in ('RGBA', 'LA', 'PA') or (im.mode == 'P' and 'transparency' in im.info)
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Cannot read image {filename}: {e}")
+            return None
+
+        info = SourceImage(path, stamp, digest, width, height, has_alpha)
+        with self._lock:
+            self._sources[filename] = info
+        return info
+
+    def digests(self):
+        """``{filename: digest}`` for every source looked up so far, re-checking each file."""
+        with self._lock:
+            filenames = list(self._sources)
+        digests = {}
+        for filename in filenames:
+            info = self.source(filename)
+            if info is not None:
+                digests[filename] = info.digest
+        return digests
+
+    def variant_widths(self, info):
+        """Widths offered for ``info``; never wider than the source."""
+        widths = [w for w in self.widths if w < info.width]
+        largest = min(info.width, self.widths[-1])
+        if largest not in widths:
+            widths.append(largest)
+        return widths
+
+    def variant_formats(self, info):
+        return self.formats + (info.fallback_format,)
+
+    def variant_name(self, filename, width, fmt):
+        info = self.source(filename)
+        if info is None:
+            return None
+        stem = os.path.splitext(filename)[0]
+        return f"{stem}.{info.digest}.w{width}.{fmt}"
+
+    def srcset(self, filename, fmt):
+        """``[(variant_name, width), ...]`` for every width of ``filename`` in ``fmt``."""
+        info = self.source(filename)
+        if info is None:
+            return []
+        stem = os.path.splitext(filename)[0]
+        return [(f"{stem}.{info.digest}.w{w}.{fmt}", w) for w in self.variant_widths(info)]
+
+    # --- derivatives ---------------------------------------------------------
+
+    def parse(self, name):
+        """Split a variant name into ``(source filename, digest, width, fmt)``, or None."""
+        match = VARIANT_RE.match(name)
+        if not match:
+            return None
+        stems = self._stems if self._stems is not None else self._scan()
+        filename = stems.get(match['stem'])
+        if filename is None:
+            filename = self._scan().get(match['stem'])
+            if filename is None:
+                return None
+        return filename, match['digest'], int(match['width']), match['fmt']
+
+    def derivative(self, name):
+        """Path of the cached file for variant ``name``, rendering it first if needed.
+
+        Returns ``(path, None)`` when the variant exists, ``(None, current_name)``
+        when the source has changed since the name was issued, and
+        ``(None, None)`` for names that are not valid variants.
+        """
+        parsed = self.parse(name)
+        if parsed is None:
+            return None, None
+        filename, digest, width, fmt = parsed
+        info = self.source(filename)
+        if info is None or width not in self.variant_widths(info) or fmt not in self.variant_formats(info):
+            return None, None
+        if digest != info.digest:
+            return None, self.variant_name(filename, width, fmt)
+
+        path = os.path.join(self.cache_dir, *name.split('/'))
+        if os.path.exists(path):
+            return path, None
+
+        with self._lock:
+            render_lock = self._render_locks.setdefault(name, threading.Lock())
+        with render_lock:
+            if not os.path.exists(path):
+                self._render(info, width, fmt, path)
+        with self._lock:
+            self._render_locks.pop(name, None)
+        return path, None
+
+    def _render(self, info, width, fmt, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with Image.open(info.path) as im:
+            im = ImageOps.exif_transpose(im)
+            if width < im.width:
+                im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+            if fmt == 'jpg' or not info.has_alpha:
+                im = im.convert('RGB')
+            elif im.mode != 'RGBA':
+                im = im.convert('RGBA')
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            im.save(tmp_path, **SAVE_OPTIONS[fmt])
+        os.replace(tmp_path, path)
+
+    def build(self):
+        """Render every variant of every source image. Returns the number of files written."""
+        written = 0
+        for filename in sorted(self._scan().values()):
+            info = self.source(filename)
+            if info is None:
+                continue
+            for fmt in self.variant_formats(info):
+                for name, _ in self.srcset(filename, fmt):
+                    path = os.path.join(self.cache_dir, *name.split('/'))
+                    if not os.path.exists(path):
+                        self.derivative(name)
+                        written += 1
+        return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pre-render responsive image variants.')
+    parser.add_argument('--source', default=os.path.join('static', 'images'))
+    parser.add_argument('--cache-dir', default=os.environ.get('IMAGE_CACHE_DIR', os.path.join('cache', 'images')))
+    parser.add_argument('--widths', default=os.environ.get('IMAGE_WIDTHS'),
+                        help='comma-separated widths (default: %s)' % ','.join(map(str, DEFAULT_WIDTHS)))
+    args = parser.parse_args()
+
+    if Image is None:
+        parser.error('Pillow is required to render images')
+    widths = [int(w) for w in args.widths.split(',')] if args.widths else DEFAULT_WIDTHS
+    pipeline = ImagePipeline(args.source, args.cache_dir, widths)
+    count = pipeline.build()
+    print(f"Rendered {count} image variants into {args.cache_dir}")
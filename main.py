@@ -1,6 +1,9 @@
-from app import app, create_tables, seed_database
+import os
+
+from app import app, create_tables
+
+# Development server only; production runs gunicorn with gunicorn.conf.py (see procfile)
 if __name__ == "__main__":
     create_tables()
-    seed_database()
-    app.run(host="0.0.0.0", port=5000, debug=True)
-
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)),
+            debug=os.environ.get("FLASK_DEBUG", "").lower() in ("1", "true", "yes"))
@@ -0,0 +1,86 @@
+"""Versioned schema changes, applied once per database.
+
+Each ``Migration`` has a version number, a name and a list of steps; a
+step is an SQL string or a callable taking the cursor (for changes that
+need to fix up data first). ``apply_migrations`` runs every migration
+newer than the highest version recorded in ``schema_migrations``, in
+order, each in the caller's transaction, and records it. It holds a
+transaction-level advisory lock while doing so, so when several workers
+or hosts start together one migrates and the others wait and then find
+nothing to do.
+
+``schema_version`` is the cheap check for start-up: one query, no DDL
+and no locks beyond reading the version table.
+"""
+import logging
+
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key shared by every process migrating this database
+MIGRATION_LOCK_ID = 0x73636865_6d61  # "schema"
+
+
+class Migration:
+    __slots__ = ('version', 'name', 'steps')
+
+    def __init__(self, version, name, steps):
+        self.version = version
+        self.name = name
+        self.steps = steps
+
+
+def schema_version(cur):
+    """Highest applied version, or -1 when nothing has been applied; a single query.
+
+    Rolls back the transaction if the version table does not exist yet.
+    """
+    try:
+        cur.execute("SELECT COALESCE(MAX(version), -1) AS version FROM schema_migrations")
+    except psycopg.errors.UndefinedTable:
+        cur.connection.rollback()
+        return -1
+    return cur.fetchone()['version']
+
+
+def current_version(cur):
+    """Highest applied migration version, -1 if none; creates the version table if needed."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("SELECT COALESCE(MAX(version), -1) AS version FROM schema_migrations")
+    return cur.fetchone()['version']
+
+
+def apply_migrations(cur, migrations):
+    """Apply the pending ``migrations`` with ``cur``; returns the versions applied.
+
+    Takes the migration advisory lock for the rest of the transaction, so
+    the caller should commit promptly. Versions must be unique and
+    increasing.
+    """
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise ValueError(f"Migration versions must be unique and increasing: {versions}")
+
+    cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+    applied = []
+    version = current_version(cur)
+    for migration in migrations:
+        if migration.version <= version:
+            continue
+        logger.info(f"Applying migration {migration.version}: {migration.name}")
+        for step in migration.steps:
+            if callable(step):
+                step(cur)
+            else:
+                cur.execute(step)
+        cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name))
+        applied.append(migration.version)
+    return applied
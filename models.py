@@ -1,6 +1,6 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from passwords import password_hasher
 
 # ------------------- DB -------------------
 db = SQLAlchemy()
@@ -18,6 +18,7 @@ class Contact(db.Model):
         return f"<Contact {self.name} - {self.subject}>"
 
 class Payment(db.Model):
+    __tablename__ = "payments"  # the table app.py writes and payment_daily_stats rolls up
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
     matric_number = db.Column(db.String(20), nullable=False, index=True)
@@ -54,10 +55,14 @@ class Student(db.Model):
     results = db.relationship("Result", backref="student", lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Also upgrades ``password_hash`` (commit to keep it) if it used old hash parameters."""
+        valid, new_hash = password_hasher.verify_and_update(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
 
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -71,10 +76,14 @@ class Admin(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Also upgrades ``password_hash`` (commit to keep it) if it used old hash parameters."""
+        valid, new_hash = password_hasher.verify_and_update(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
 
 class Session(db.Model):
     id = db.Column(db.Integer, primary_key=True)
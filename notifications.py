@@ -0,0 +1,286 @@
+"""Background e-mail delivery through a persistent outbox table.
+
+Request handlers call ``queue_email`` with their own cursor, so a message is
+stored in ``email_outbox`` in the same transaction as the change that caused
+it. ``EmailOutbox`` runs a dispatcher thread that claims batches of due
+messages (``FOR UPDATE SKIP LOCKED``, so several workers can share the
+table), sends them through Flask-Mail on a small thread pool under a rate
+limit, and reschedules failures with exponential backoff.
+
+``LocalSMTPServer`` is a minimal in-process SMTP sink for development and
+tests: ``python notifications.py --port 1025``.
+"""
+import argparse
+import logging
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_mail import Message
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+def queue_email(cur, recipient, subject, body, delay=0, coalesce=False):
+    """Store a message in the outbox using the caller's cursor.
+
+    ``delay`` postpones the first attempt by that many seconds. With
+    ``coalesce``, nothing is queued if an identical subject is already
+    pending for the recipient, so repeated triggers within the delay
+    produce one e-mail.
+    """
+    queue_emails(cur, [(recipient, subject, body)], delay=delay, coalesce=coalesce)
+
+
+def queue_emails(cur, messages, delay=0, coalesce=False):
+    """Queue several ``(recipient, subject, body)`` messages in one pipelined batch."""
+    messages = [m for m in messages if m[0]]
+    if not messages:
+        return
+    if coalesce:
+        cur.executemany("""
+            INSERT INTO email_outbox (recipient, subject, body, next_attempt_at)
+            SELECT %(recipient)s::varchar, %(subject)s::varchar, %(body)s::text,
+                   CURRENT_TIMESTAMP + make_interval(secs => %(delay)s)
+            WHERE NOT EXISTS (
+                SELECT 1 FROM email_outbox
+                WHERE recipient = %(recipient)s::varchar AND subject = %(subject)s::varchar AND status = 'pending'
+            )
+        """, [{'recipient': r, 'subject': s, 'body': b, 'delay': delay} for r, s, b in messages])
+    else:
+        cur.executemany("""
+            INSERT INTO email_outbox (recipient, subject, body, next_attempt_at)
+            VALUES (%s, %s, %s, CURRENT_TIMESTAMP + make_interval(secs => %s))
+        """, [(r, s, b, delay) for r, s, b in messages])
+
+
+class RateLimiter:
+    """Token bucket shared by the sending threads."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class EmailOutbox:
+    """Dispatcher that drains ``email_outbox`` in the background."""
+
+    def __init__(self, app, mail, get_connection, batch_size=50, workers=2, rate=5,
+                 max_attempts=5, backoff=30, poll_interval=10, stale_after=600):
+        self.app = app
+        self.mail = mail
+        self.get_connection = get_connection
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.rate_limiter = RateLimiter(rate)
+        self._executor = None
+        self._thread = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the dispatcher thread (no-op if it is already running in this process)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='email-send')
+            self._thread = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._thread = None
+
+    def wake(self):
+        """Ask the dispatcher to look for new messages now (call after committing)."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception as e:
+                logger.error(f"Error processing email outbox: {e}")
+                processed = 0
+            if not processed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def process_batch(self):
+        """Claim, send and record one batch. Returns the number of messages claimed."""
+        rows = self._claim()
+        if not rows:
+            return 0
+        chunk_size = -(-len(rows) // self.workers)
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        outcomes = []
+        for chunk_outcomes in self._executor.map(self._send_chunk, chunks):
+            outcomes.extend(chunk_outcomes)
+        self._record(outcomes)
+        return len(rows)
+
+    def _claim(self):
+        with self.get_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE email_outbox
+                SET status = 'sending', attempts = attempts + 1, claimed_at = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM email_outbox
+                    WHERE (status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP)
+                       OR (status = 'sending' AND claimed_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, recipient, subject, body, attempts
+            """, (self.stale_after, self.batch_size))
+            return cur.fetchall()
+
+    def _send_chunk(self, rows):
+        """Send rows over one SMTP connection; returns (row, error) pairs."""
+        outcomes = []
+        try:
+            with self.app.app_context(), self.mail.connect() as smtp:
+                for row in rows:
+                    self.rate_limiter.acquire()
+                    try:
+                        smtp.send(Message(subject=row['subject'], recipients=[row['recipient']], body=row['body']))
+                        outcomes.append((row, None))
+                    except Exception as e:
+                        outcomes.append((row, str(e)))
+        except Exception as e:
+            # Connection-level failure: everything not yet attempted failed too
+            done = {row['id'] for row, _ in outcomes}
+            outcomes.extend((row, str(e)) for row in rows if row['id'] not in done)
+        return outcomes
+
+    def _record(self, outcomes):
+        sent = [row['id'] for row, error in outcomes if error is None]
+        failed = [(row, error) for row, error in outcomes if error is not None]
+        with self.get_connection() as conn, conn.cursor() as cur:
+            if sent:
+                cur.execute("""
+                    UPDATE email_outbox SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                    WHERE id = ANY(%s)
+                """, (sent,))
+            if failed:
+                cur.executemany("""
+                    UPDATE email_outbox
+                    SET status = %s, last_error = %s,
+                        next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                    WHERE id = %s
+                """, [('failed' if row['attempts'] >= self.max_attempts else 'pending', error[:1000],
+                       min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** (row['attempts'] - 1)), row['id'])
+                      for row, error in failed])
+        for row, error in failed:
+            logger.warning(f"Email {row['id']} to {row['recipient']} failed (attempt {row['attempts']}): {error}")
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply('220 localhost SMTP sink')
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command[:4].upper()
+            if verb in ('HELO', 'EHLO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].strip(' <>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command[8:].strip(' <>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                self.server.messages.append({'sender': sender, 'recipients': recipients,
+                                             'data': b''.join(data).decode(errors='replace')})
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """SMTP sink that keeps every message it receives in ``messages``.
+
+    Point the app at it with MAIL_SERVER=localhost, MAIL_PORT=<port> and
+    MAIL_USE_TLS=false.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='localhost', port=1025):
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.messages = []
+
+    def start(self):
+        """Serve in a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True).start()
+        return self
+
+
+class _PrintingList(list):
+    def append(self, message):
+        print(f"--- {message['sender']} -> {', '.join(message['recipients'])}\n{message['data']}", flush=True)
+        super().append(message)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local SMTP sink that prints received mail.')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+
+    server = LocalSMTPServer(args.host, args.port)
+    server.messages = _PrintingList()
+    print(f"SMTP sink listening on {args.host}:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,139 @@
+"""Password hashing on a bounded worker pool.
+
+Hashing is deliberately slow. Run inline, a burst of logins occupies
+every request thread and every core. ``PasswordHasher`` runs Werkzeug's
+``generate_password_hash``/``check_password_hash`` on a small thread pool
+(hashlib's scrypt and PBKDF2 release the GIL). At most ``workers`` hashes
+run at once, at most ``max_pending`` wait, and a request that cannot get
+a slot within ``timeout`` seconds gets ``HashingBusy`` instead of queueing
+forever.
+
+The hash method comes from PASSWORD_HASH_METHOD, in Werkzeug's format,
+e.g. ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``. Stored hashes made
+with other parameters still verify, and ``verify_and_update`` returns a
+fresh hash for them so logins upgrade accounts as they come in.
+
+``python passwords.py --target-ms 250`` suggests a method whose cost
+takes about that long on this machine.
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+
+
+class HashingBusy(Exception):
+    """Too many hashes queued, or none finished within the timeout; the caller should ask to retry."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded thread pool."""
+
+    def __init__(self, method=PASSWORD_HASH_METHOD, workers=PASSWORD_HASH_WORKERS,
+                 max_pending=PASSWORD_HASH_MAX_PENDING, timeout=PASSWORD_HASH_TIMEOUT):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._method_prefix = None
+        self.busy = 0
+
+    def _submit(self, fn, *args):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # Worker threads do not survive a fork; start a pool in this process
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                    self._pid = os.getpid()
+        deadline = time.monotonic() + self.timeout
+        if not self._slots.acquire(timeout=self.timeout):
+            self.busy += 1
+            raise HashingBusy(f"{self.workers} hashing workers busy")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            future.cancel()
+            self.busy += 1
+            raise HashingBusy(f"password hash did not finish within {self.timeout:g}s") from None
+
+    def hash(self, password):
+        return self._submit(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._submit(check_password_hash, pwhash, password)
+
+    def method_prefix(self):
+        """The method string new hashes start with, defaults filled in (e.g. ``scrypt:32768:8:1``)."""
+        if self._method_prefix is None:
+            self._method_prefix = self._submit(generate_password_hash, '', self.method).split('$', 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, pwhash):
+        return pwhash.split('$', 1)[0] != self.method_prefix()
+
+    def verify_and_update(self, pwhash, password):
+        """``(ok, new_hash)``; ``new_hash`` is set when the password is right but hashed with old parameters."""
+        if not self.verify(pwhash, password):
+            return False, None
+        if self.needs_rehash(pwhash):
+            return True, self.hash(password)
+        return True, None
+
+    def stats(self):
+        return {'method': self.method, 'workers': self.workers, 'busy_rejections': self.busy}
+
+
+password_hasher = PasswordHasher()
+
+
+def calibrate(algorithm, target):
+    """Method string for ``algorithm`` whose cost takes roughly ``target`` seconds here."""
+    if algorithm == 'pbkdf2':
+        iterations = 100_000
+        while True:
+            started = time.perf_counter()
+            generate_password_hash('calibration', f'pbkdf2:sha256:{iterations}')
+            elapsed = time.perf_counter() - started
+            if elapsed >= target / 2 or iterations > 50_000_000:
+                return f'pbkdf2:sha256:{max(100_000, round(iterations * target / elapsed, -4)):.0f}'
+            iterations *= 2
+    n = 2 ** 14
+    method = f'scrypt:{n}:8:1'
+    # Cost is doubled by raising N; stop before the next doubling would overshoot
+    while n <= 2 ** 20:
+        started = time.perf_counter()
+        generate_password_hash('calibration', f'scrypt:{n}:8:1')
+        if time.perf_counter() - started > target:
+            break
+        method = f'scrypt:{n}:8:1'
+        n *= 2
+    return method
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Suggest a PASSWORD_HASH_METHOD for a target hashing time.')
+    parser.add_argument('--target-ms', type=float, default=250)
+    parser.add_argument('--algorithm', choices=('scrypt', 'pbkdf2'), default='scrypt')
+    args = parser.parse_args()
+
+    method = calibrate(args.algorithm, args.target_ms / 1000)
+    started = time.perf_counter()
+    generate_password_hash('calibration', method)
+    print(f"PASSWORD_HASH_METHOD={method}  # {(time.perf_counter() - started) * 1000:.0f} ms per hash here")
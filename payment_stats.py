@@ -0,0 +1,105 @@
+"""The ``payment_daily_stats`` rollup: payment counts and totals per day, level and status.
+
+Every write to ``payments`` updates the rollup with the same cursor, so
+the rollup commits or rolls back with the change. Both the main app and
+the admin blueprint in admin.py write payments this way. Their
+statistics pages run ``stats_queries``. Those queries read a table sized
+by calendar days, not by the number of payments.
+
+The helpers only need a DB-API cursor that takes ``%s`` parameters. That
+can be a psycopg cursor from the app's pool, or the raw cursor under an
+SQLAlchemy session.
+"""
+
+
+def add_to_payment_stats(cur, payment_rows, sign=1):
+    """Fold payments into ``payment_daily_stats`` (``sign=-1`` takes them back out).
+
+    ``payment_rows`` are mappings with ``created_at``, ``level``, ``status``
+    and ``total_amount``. Call this with the cursor that wrote the payments
+    so the rollup commits or rolls back with them.
+    """
+    deltas = {}
+    for row in payment_rows:
+        key = (row['created_at'].date(), row['level'], row['status'] or 'pending')
+        count, total = deltas.get(key, (0, 0))
+        deltas[key] = (count + sign, total + sign * row['total_amount'])
+    deltas = {key: value for key, value in deltas.items() if value != (0, 0)}
+    if not deltas:
+        return
+
+    # Sorted so concurrent writers lock the rollup rows in the same order
+    cur.executemany("""
+        INSERT INTO payment_daily_stats (day, level, status, payment_count, total_amount)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (day, level, status) DO UPDATE
+        SET payment_count = payment_daily_stats.payment_count + EXCLUDED.payment_count,
+            total_amount = payment_daily_stats.total_amount + EXCLUDED.total_amount
+    """, [key + value for key, value in sorted(deltas.items())])
+    cur.execute("DELETE FROM payment_daily_stats WHERE day = ANY(%s) AND payment_count <= 0",
+                (list({key[0] for key in deltas}),))
+
+
+def rebuild_payment_stats(cur):
+    """Recompute ``payment_daily_stats`` from scratch (after payments were changed outside the app)."""
+    cur.execute("LOCK TABLE payment_daily_stats IN EXCLUSIVE MODE")
+    cur.execute("DELETE FROM payment_daily_stats")
+    cur.execute("""
+        INSERT INTO payment_daily_stats (day, level, status, payment_count, total_amount)
+        SELECT created_at::date, level, COALESCE(status, 'pending'), COUNT(*), SUM(total_amount)
+        FROM payments
+        GROUP BY 1, 2, 3
+    """)
+
+
+def move_payment_stats(cur, changed_rows):
+    """Move payments between rollup buckets after an UPDATE.
+
+    ``changed_rows`` carry the new ``created_at``/``level``/``status``/
+    ``total_amount`` plus the old values as ``previous_level``,
+    ``previous_status`` and ``previous_amount`` (missing ones are unchanged).
+    """
+    old_rows = [{'created_at': row['created_at'],
+                 'level': row.get('previous_level', row['level']),
+                 'status': row.get('previous_status', row['status']),
+                 'total_amount': row.get('previous_amount', row['total_amount'])} for row in changed_rows]
+    add_to_payment_stats(cur, old_rows, sign=-1)
+    add_to_payment_stats(cur, changed_rows)
+
+
+def stats_queries(trend_days):
+    """``[(sql, params), ...]`` for the by-level, by-status, monthly and daily-trend statistics.
+
+    Each query returns ``count`` and ``total`` columns, keyed by
+    ``level``, ``status``, ``month`` or ``day``. The daily trend covers
+    the last ``trend_days`` days, including days without payments.
+    """
+    return [
+        ("""
+            SELECT level, SUM(payment_count) AS count, SUM(total_amount) AS total
+            FROM payment_daily_stats
+            GROUP BY level
+            ORDER BY level
+        """, None),
+        ("""
+            SELECT status, SUM(payment_count) AS count, SUM(total_amount) AS total
+            FROM payment_daily_stats
+            GROUP BY status
+            ORDER BY status
+        """, None),
+        ("""
+            SELECT date_trunc('month', day)::date AS month,
+                   SUM(payment_count) AS count, SUM(total_amount) AS total
+            FROM payment_daily_stats
+            GROUP BY 1
+            ORDER BY 1
+        """, None),
+        ("""
+            SELECT d::date AS day, COALESCE(SUM(s.payment_count), 0) AS count,
+                   COALESCE(SUM(s.total_amount), 0) AS total
+            FROM generate_series(CURRENT_DATE - %s, CURRENT_DATE, INTERVAL '1 day') d
+            LEFT JOIN payment_daily_stats s ON s.day = d::date
+            GROUP BY 1
+            ORDER BY 1
+        """, (trend_days - 1,)),
+    ]
@@ -0,0 +1,313 @@
+"""Per-request query and render timing.
+
+``ProfilingCursor`` is installed as the psycopg ``cursor_factory`` on the
+connection pools. While a request is being profiled (``RequestProfile``
+bound to ``current_profile``), every ``execute``/``executemany``/``copy``
+adds its duration to the profile, which keeps the slowest statements.
+Only the SQL text is kept, with string and numeric literals replaced by
+``?``; parameters are never recorded. Outside a request (background
+threads) the cursor costs one context-variable lookup.
+
+``EndpointStats`` keeps a bounded sample of recent request timings per
+endpoint for percentile reporting, plus a log of recent slow requests.
+They live in a small SQLite database, by default under /dev/shm like the
+rate-limit buckets, so every worker process on the host reports into the
+same figures. Each worker buffers its samples and a background thread
+writes them in one short transaction about once a second.
+"""
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+current_profile = ContextVar('current_profile', default=None)
+
+DEFAULT_PROFILE_STORE = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                                     'aee-request-profiles.sqlite3')
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|(?<![\w$])-?\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def redact_sql(query):
+    """Collapse whitespace and replace literals so a statement can be logged safely."""
+    return _LITERAL_RE.sub('?', _WHITESPACE_RE.sub(' ', query).strip())
+
+
+class RequestProfile:
+    """Timings collected while serving one request."""
+
+    def __init__(self, top=5):
+        self.started = time.perf_counter()
+        self.top = top
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.errors = 0
+        self._slowest = []  # min-heap of (duration, seq, sql)
+        self._render_started = None
+
+    def record_query(self, query, duration, cursor=None):
+        self.queries += 1
+        self.db_time += duration
+        if len(self._slowest) < self.top or duration > self._slowest[0][0]:
+            if isinstance(query, bytes):
+                query = query.decode('utf-8', 'replace')
+            elif not isinstance(query, str):
+                try:
+                    query = query.as_string(cursor)
+                except Exception:
+                    query = repr(query)
+            entry = (duration, self.queries, query)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, entry)
+            else:
+                heapq.heapreplace(self._slowest, entry)
+
+    def record_concurrent(self, timings, wall_time):
+        """Record ``(query, seconds)`` pairs that ran concurrently and took ``wall_time`` together."""
+        db_time = self.db_time
+        for query, duration in timings:
+            self.record_query(query, duration)
+        self.db_time = db_time + wall_time
+
+    def render_started(self):
+        self._render_started = time.perf_counter()
+
+    def render_finished(self):
+        if self._render_started is not None:
+            self.render_time += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def slowest(self):
+        """``[{'sql', 'ms'}, ...]``, slowest first, with literals redacted."""
+        return [{'sql': redact_sql(sql), 'ms': round(duration * 1000, 2)}
+                for duration, _, sql in sorted(self._slowest, reverse=True)]
+
+    def server_timing(self, total):
+        """Value for the ``Server-Timing`` response header."""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+class ProfilingCursor(psycopg.Cursor):
+    """Cursor that adds each statement's duration to the current request profile."""
+
+    def execute(self, query, params=None, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return super().execute(query, params, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            profile.record_query(query, time.perf_counter() - started, self)
+
+    def executemany(self, query, params_seq, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return super().executemany(query, params_seq, **kwargs)
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, params_seq, **kwargs)
+        finally:
+            profile.record_query(query, time.perf_counter() - started, self)
+
+    @contextmanager
+    def copy(self, statement, params=None, **kwargs):
+        profile = current_profile.get()
+        started = time.perf_counter()
+        try:
+            with super().copy(statement, params, **kwargs) as copy:
+                yield copy
+        finally:
+            if profile is not None:
+                profile.record_query(statement, time.perf_counter() - started, self)
+
+
+class ErrorCounter(logging.Handler):
+    """Counts ERROR records logged while a request is profiled (handlers log and carry on)."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.errors += 1
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+
+class EndpointStats:
+    """Recent request timings per endpoint (bounded), and the latest slow requests, shared across processes."""
+
+    def __init__(self, path=DEFAULT_PROFILE_STORE, sample_size=1000, slow_log_size=50, flush_interval=1.0):
+        self.path = path
+        self.sample_size = sample_size
+        self.slow_log_size = slow_log_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_slow = []
+        self._flusher_pid = None
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")  # losing samples in a crash is harmless
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    id INTEGER PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    db_time REAL NOT NULL,
+                    queries INTEGER NOT NULL,
+                    render_time REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS samples_endpoint ON samples (endpoint, id);
+                CREATE TABLE IF NOT EXISTS totals (
+                    endpoint TEXT PRIMARY KEY,
+                    requests INTEGER NOT NULL,
+                    errors INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS slow_requests (
+                    id INTEGER PRIMARY KEY,
+                    entry TEXT NOT NULL
+                );
+            """)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def record(self, endpoint, duration, profile, error=False):
+        sample = (endpoint, duration, profile.db_time, profile.queries, profile.render_time,
+                  bool(error or profile.errors))
+        with self._lock:
+            self._pending.append(sample)
+            if self._flusher_pid != os.getpid():
+                # Threads do not survive a fork; start a flusher in this process
+                threading.Thread(target=self._flush_forever, name='profile-flush', daemon=True).start()
+                self._flusher_pid = os.getpid()
+
+    def add_slow(self, entry):
+        with self._lock:
+            self._pending_slow.append(json.dumps(entry))
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write this process's buffered samples to the shared store, trimming each endpoint's sample."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            pending_slow, self._pending_slow = self._pending_slow, []
+        if not pending and not pending_slow:
+            return
+        totals = {}
+        for endpoint, *_, error in pending:
+            requests, errors = totals.get(endpoint, (0, 0))
+            totals[endpoint] = (requests + 1, errors + error)
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO samples (endpoint, duration, db_time, queries, render_time) VALUES (?, ?, ?, ?, ?)",
+                    [sample[:5] for sample in pending])
+                conn.executemany("""
+                    INSERT INTO totals (endpoint, requests, errors) VALUES (?, ?, ?)
+                    ON CONFLICT (endpoint) DO UPDATE
+                    SET requests = requests + excluded.requests, errors = errors + excluded.errors
+                """, [(endpoint, requests, errors) for endpoint, (requests, errors) in totals.items()])
+                conn.executemany("""
+                    DELETE FROM samples WHERE endpoint = ? AND id <= (
+                        SELECT id FROM samples WHERE endpoint = ? ORDER BY id DESC LIMIT 1 OFFSET ?)
+                """, [(endpoint, endpoint, self.sample_size) for endpoint in totals])
+                if pending_slow:
+                    conn.executemany("INSERT INTO slow_requests (entry) VALUES (?)",
+                                     [(entry,) for entry in pending_slow])
+                    conn.execute("""
+                        DELETE FROM slow_requests WHERE id <= (
+                            SELECT id FROM slow_requests ORDER BY id DESC LIMIT 1 OFFSET ?)
+                    """, (self.slow_log_size,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # Profiling must never fail a request; these samples are dropped
+            logger.error(f"Request profile store unavailable: {e}")
+
+    def slow_requests(self):
+        """The latest slow-request log entries, newest first."""
+        self.flush()
+        rows = self._connection().execute(
+            "SELECT entry FROM slow_requests ORDER BY id DESC LIMIT ?", (self.slow_log_size,)).fetchall()
+        return [json.loads(entry) for entry, in rows]
+
+    def summary(self):
+        """Per-endpoint percentiles in milliseconds, slowest p95 first."""
+        self.flush()
+        conn = self._connection()
+        totals = {endpoint: (requests, errors)
+                  for endpoint, requests, errors in conn.execute("SELECT endpoint, requests, errors FROM totals")}
+        samples = {}
+        for endpoint, *sample in conn.execute(
+                "SELECT endpoint, duration, db_time, queries, render_time FROM samples ORDER BY endpoint"):
+            samples.setdefault(endpoint, []).append(sample)
+        rows = []
+        for endpoint, endpoint_samples in samples.items():
+            count, errors = totals.get(endpoint, (len(endpoint_samples), 0))
+            durations = sorted(s[0] for s in endpoint_samples)
+            n = len(endpoint_samples)
+            rows.append({
+                'endpoint': endpoint,
+                'requests': count,
+                'errors': errors,
+                'sampled': n,
+                'p50_ms': round(percentile(durations, 0.50) * 1000, 1),
+                'p95_ms': round(percentile(durations, 0.95) * 1000, 1),
+                'p99_ms': round(percentile(durations, 0.99) * 1000, 1),
+                'max_ms': round(durations[-1] * 1000, 1),
+                'avg_db_ms': round(sum(s[1] for s in endpoint_samples) / n * 1000, 1),
+                'avg_queries': round(sum(s[2] for s in endpoint_samples) / n, 1),
+                'avg_render_ms': round(sum(s[3] for s in endpoint_samples) / n * 1000, 1),
+            })
+        rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._pending_slow.clear()
+        self._connection().executescript(
+            "BEGIN IMMEDIATE; DELETE FROM samples; DELETE FROM totals; DELETE FROM slow_requests; COMMIT;")
@@ -0,0 +1,188 @@
+"""Token-bucket rate limits shared by every worker process on the host.
+
+Buckets live in a small SQLite database, by default under /dev/shm so it
+stays in memory. Every gunicorn worker opens the same file and sees the
+same counts. A check is one short ``BEGIN IMMEDIATE`` transaction.
+Buckets that have refilled completely are pruned now and then, so the
+table only holds clients that were recently active.
+
+``RequestLimiter.limit`` wraps a Flask view. For POST requests it charges
+buckets keyed by client IP, by account (a form field such as the e-mail
+address) and by uploaded bytes, before the view parses the body, checks a
+password or saves a file. An over-limit request gets the ``on_limit``
+response instead.
+
+``python ratelimit.py [--reset PREFIX]`` lists the active buckets.
+"""
+import argparse
+import functools
+import logging
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                             'aee-rate-limits.sqlite3')
+
+
+class TokenBuckets:
+    """Token buckets in an SQLite file shared between processes."""
+
+    def __init__(self, path=DEFAULT_STORE, prune_interval=60):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._local = threading.local()
+        self._pruned_at = 0.0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")  # losing counts in a crash is harmless
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    full_at REAL NOT NULL
+                )
+            """)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key, rate, capacity, cost=1.0):
+        """Take ``cost`` tokens from ``key``'s bucket; returns ``(allowed, seconds until it would be)``.
+
+        The bucket holds up to ``capacity`` tokens and refills at ``rate``
+        tokens per second. A refused request takes nothing.
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute("""
+                INSERT INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE
+                SET tokens = excluded.tokens, updated = excluded.updated, full_at = excluded.full_at
+            """, (key, tokens, now, now + (capacity - tokens) / rate))
+            if now - self._pruned_at > self.prune_interval:
+                self._pruned_at = now
+                conn.execute("DELETE FROM buckets WHERE full_at < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def active(self, prefix=''):
+        """``[(key, tokens now, seconds until full), ...]`` for buckets that are not full."""
+        now = time.time()
+        rows = self._connection().execute(
+            "SELECT key, tokens, updated, full_at FROM buckets WHERE full_at >= ? AND key LIKE ? ORDER BY key",
+            (now, prefix + '%')).fetchall()
+        return [(key, tokens, full_at - now) for key, tokens, updated, full_at in rows]
+
+    def reset(self, prefix=''):
+        """Refill every bucket whose key starts with ``prefix``; returns how many were reset."""
+        return self._connection().execute("DELETE FROM buckets WHERE key LIKE ?", (prefix + '%',)).rowcount
+
+
+def too_many_requests(retry_after):
+    """Default over-limit response."""
+    return 'Too many requests', 429, {'Retry-After': str(math.ceil(retry_after))}
+
+
+class RequestLimiter:
+    """Per-IP, per-account and upload-size limits for Flask views, backed by ``TokenBuckets``.
+
+    ``proxy_count`` is the number of reverse proxies in front of the app
+    that append to ``X-Forwarded-For``. Client addresses are read from
+    that header only when it is set.
+    """
+
+    def __init__(self, buckets, enabled=True, proxy_count=0, on_limit=too_many_requests):
+        self.buckets = buckets
+        self.enabled = enabled
+        self.proxy_count = proxy_count
+        self.on_limit = on_limit
+        self.rejected = 0
+
+    def client_ip(self):
+        if self.proxy_count:
+            route = request.access_route
+            return route[max(0, len(route) - self.proxy_count)]
+        return request.remote_addr or 'unknown'
+
+    def check(self, scope, per_ip, period, account_field=None, per_account=None, upload_quota=None,
+              upload_period=3600):
+        """Charge the current request to its buckets; returns seconds to wait, or None if allowed.
+
+        ``upload_quota`` is in bytes per ``upload_period`` and is charged
+        the declared Content-Length, so the body is never read. The account
+        field is read last, and only once the IP has passed. That read
+        parses the form.
+        """
+        ip = self.client_ip()
+        try:
+            checks = [(f'{scope}:ip:{ip}', per_ip / period, per_ip, 1)]
+            if upload_quota:
+                size = request.content_length
+                if size is None:
+                    size = request.max_content_length or upload_quota
+                checks.append((f'upload:ip:{ip}', upload_quota / upload_period, upload_quota, size))
+            for key, rate, capacity, cost in checks:
+                allowed, retry_after = self.buckets.take(key, rate, capacity, cost)
+                if not allowed:
+                    return retry_after
+            if account_field:
+                account = (request.form.get(account_field) or '').strip().lower()
+                if account:
+                    allowed, retry_after = self.buckets.take(
+                        f'{scope}:account:{account}', (per_account or per_ip) / period, per_account or per_ip)
+                    if not allowed:
+                        return retry_after
+        except sqlite3.Error as e:
+            # An unavailable store must not lock everyone out
+            logger.error(f"Rate limit store unavailable, allowing request: {e}")
+        return None
+
+    def limit(self, scope, per_ip, period=60, **options):
+        """Decorator: allow ``per_ip`` POSTs per ``period`` seconds per client (see ``check`` for options)."""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapped(*args, **kwargs):
+                if self.enabled and request.method == 'POST':
+                    retry_after = self.check(scope, per_ip, period, **options)
+                    if retry_after is not None:
+                        self.rejected += 1
+                        logger.warning(f"Rate limit '{scope}' hit by {self.client_ip()}")
+                        return self.on_limit(retry_after)
+                return view(*args, **kwargs)
+            return wrapped
+        return decorator
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='List (or reset) the active rate-limit buckets.')
+    parser.add_argument('--store', default=os.environ.get('RATE_LIMIT_STORE', DEFAULT_STORE))
+    parser.add_argument('--reset', metavar='PREFIX', help='refill the buckets whose key starts with PREFIX')
+    args = parser.parse_args()
+
+    buckets = TokenBuckets(args.store)
+    if args.reset is not None:
+        print(f"reset {buckets.reset(args.reset)} bucket(s)")
+    for key, tokens, refill in buckets.active():
+        print(f"{key:<60} {tokens:>12.1f} tokens, full in {refill:.0f}s")
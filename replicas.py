@@ -0,0 +1,161 @@
+"""Route read-only queries to a streaming replica, with fallback to the primary.
+
+``ReplicaRouter`` hands out connections from the replica pool as long as
+the replica is reachable and its replay lag is within ``max_lag`` seconds.
+Lag is measured at most once per ``check_interval`` and shared by all
+threads. When the replica cannot be reached it is skipped for
+``retry_after`` seconds; in either case reads go to the primary pool, so
+callers never see the difference except in freshness.
+
+Writes must always use the primary pool directly; the router is only for
+queries that can tolerate data up to ``max_lag`` seconds old.
+
+``python replicas.py PRIMARY_URL REPLICA_URL`` prints the replica's lag and
+where reads would currently be routed.
+"""
+import argparse
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg
+from psycopg_pool import PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+# Zero while the replica is streaming and has replayed everything it received.
+# Otherwise it is the age of the last replayed transaction, including when the
+# WAL receiver is disconnected: such a replica has replayed all it received but
+# falls further behind the primary. Infinite when nothing has been replayed yet.
+# 0 on a server that is not a standby.
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+             AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM clock_timestamp() - pg_last_xact_replay_timestamp())::float8,
+                      'Infinity'::float8)
+    END AS lag
+"""
+
+
+class ReplicaRouter:
+    """Chooses between the replica and primary pools for read-only work.
+
+    ``get_primary_pool`` and ``get_replica_pool`` are callables returning
+    ``psycopg_pool.ConnectionPool``-like objects; ``get_replica_pool`` may
+    be None when no replica is configured.
+    """
+
+    def __init__(self, get_primary_pool, get_replica_pool=None, max_lag=5.0, check_interval=2.0, retry_after=30.0,
+                 timeout=1.0):
+        self.get_primary_pool = get_primary_pool
+        self.get_replica_pool = get_replica_pool
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+        self.timeout = timeout  # replica checkout wait before falling back to the primary
+        self._lag = None
+        self._checked_at = 0.0
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    @property
+    def configured(self):
+        return self.get_replica_pool is not None
+
+    def mark_down(self, error):
+        """Stop routing to the replica for ``retry_after`` seconds."""
+        with self._lock:
+            self._down_until = time.monotonic() + self.retry_after
+            self._lag = None
+        logger.warning(f"Read replica unavailable, using primary for {self.retry_after:g}s: {error}")
+
+    def replica_lag(self):
+        """Last measured replica lag in seconds, re-measured if older than ``check_interval``; None if unknown."""
+        if not self.configured:
+            return None
+        now = time.monotonic()
+        if now < self._down_until:
+            return None
+        if now - self._checked_at < self.check_interval:
+            return self._lag
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return self._lag
+            # Claim this check so other threads keep using the previous value meanwhile
+            self._checked_at = time.monotonic()
+        try:
+            with self.get_replica_pool().connection(timeout=self.timeout) as conn:
+                lag = float(conn.execute(LAG_QUERY).fetchone()['lag'])
+        except (psycopg.Error, PoolTimeout) as e:
+            self.mark_down(e)
+            return None
+        with self._lock:
+            self._lag = lag
+        if lag > self.max_lag:
+            logger.warning(f"Read replica is {lag:.1f}s behind (limit {self.max_lag:g}s), using primary")
+        return lag
+
+    def use_replica(self):
+        lag = self.replica_lag()
+        return lag is not None and lag <= self.max_lag
+
+    def getconn(self):
+        """Check out a read connection; returns ``(pool, conn)`` so the caller can ``pool.putconn(conn)``."""
+        if self.use_replica():
+            pool = self.get_replica_pool()
+            try:
+                conn = pool.getconn(timeout=self.timeout)
+                self.replica_reads += 1
+                return pool, conn
+            except (psycopg.OperationalError, PoolTimeout) as e:
+                self.mark_down(e)
+        pool = self.get_primary_pool()
+        conn = pool.getconn()
+        self.primary_reads += 1
+        return pool, conn
+
+    @contextmanager
+    def connection(self):
+        """Like ``pool.connection()``: yields a read connection and returns it afterwards."""
+        pool, conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            try:
+                conn.rollback()
+            finally:
+                pool.putconn(conn)
+
+    def stats(self):
+        return {
+            'replica_configured': self.configured,
+            'replica_lag': self._lag,
+            'replica_down': time.monotonic() < self._down_until,
+            'replica_reads': self.replica_reads,
+            'primary_reads': self.primary_reads,
+        }
+
+
+if __name__ == '__main__':
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+
+    parser = argparse.ArgumentParser(description='Show replica lag and where reads would be routed.')
+    parser.add_argument('primary_url')
+    parser.add_argument('replica_url')
+    parser.add_argument('--max-lag', type=float, default=5.0)
+    args = parser.parse_args()
+
+    pools = {name: ConnectionPool(url, min_size=1, max_size=1, kwargs={'row_factory': dict_row}, open=True)
+             for name, url in (('primary', args.primary_url), ('replica', args.replica_url))}
+    router = ReplicaRouter(lambda: pools['primary'], lambda: pools['replica'], max_lag=args.max_lag)
+    lag = router.replica_lag()
+    print(f"replica lag: {'unreachable' if lag is None else f'{lag:.3f}s'}")
+    print(f"reads go to: {'replica' if router.use_replica() else 'primary'}")
+    for pool in pools.values():
+        pool.close()
@@ -0,0 +1,573 @@
+/**
+ * ================================
+ * PAYMENT PORTAL FUNCTIONALITY
+ * ================================
+ */
+
+/**
+ * Initialize payment portal features
+ */
+function initializePaymentPortal() {
+    // Check if we're on the payment page
+    if (!document.getElementById('payment-main')) return;
+    
+    initializePaymentCalculator();
+    initializeLevelBasedOptions();
+    initializeReceiptUpload();
+    initializePaymentFormValidation();
+    initializePaymentSubmission();
+    console.log('Payment portal initialized successfully');
+}
+
+/**
+ * Initialize payment calculator functionality
+ */
+function initializePaymentCalculator() {
+    const checkboxes = document.querySelectorAll('.payment-checkbox');
+    const totalAmountElement = document.getElementById('totalAmount');
+    const selectedItemsElement = document.getElementById('selectedItems');
+    
+    if (!checkboxes.length || !totalAmountElement) return;
+    
+    checkboxes.forEach(checkbox => {
+        checkbox.addEventListener('change', function() {
+            updatePaymentSummary();
+            updateSelectedItems();
+        });
+    });
+    
+    // Initial calculation
+    updatePaymentSummary();
+    updateSelectedItems();
+}
+
+/**
+ * Update payment summary total
+ */
+function updatePaymentSummary() {
+    const checkboxes = document.querySelectorAll('.payment-checkbox:checked');
+    const totalAmountElement = document.getElementById('totalAmount');
+    
+    let total = 0;
+    checkboxes.forEach(checkbox => {
+        total += parseInt(checkbox.value) || 0;
+        
+        // Add visual feedback to selected items
+        const paymentItem = checkbox.closest('.payment-item');
+        if (paymentItem) {
+            if (checkbox.checked) {
+                paymentItem.classList.add('selected');
+            } else {
+                paymentItem.classList.remove('selected');
+            }
+        }
+    });
+    
+    if (totalAmountElement) {
+        totalAmountElement.textContent = `₦${total.toLocaleString()}`;
+        
+        // Add animation effect
+        totalAmountElement.style.transform = 'scale(1.1)';
+        setTimeout(() => {
+            totalAmountElement.style.transform = 'scale(1)';
+        }, 200);
+    }
+}
+
+/**
+ * Update selected items list
+ */
+function updateSelectedItems() {
+    const checkboxes = document.querySelectorAll('.payment-checkbox:checked');
+    const selectedItemsElement = document.getElementById('selectedItems');
+    
+    if (!selectedItemsElement) return;
+    
+    if (checkboxes.length === 0) {
+        selectedItemsElement.innerHTML = '<small class="text-muted">Selected items will appear here</small>';
+        return;
+    }
+    
+    let itemsHTML = '';
+    checkboxes.forEach(checkbox => {
+        const name = checkbox.getAttribute('data-name') || 'Unknown Item';
+        const amount = parseInt(checkbox.value) || 0;
+        
+        itemsHTML += `
+            <div class="selected-item">
+                <span class="item-name">${name}</span>
+                <span class="item-amount">₦${amount.toLocaleString()}</span>
+            </div>
+        `;
+    });
+    
+    selectedItemsElement.innerHTML = itemsHTML;
+}
+
+/**
+ * Initialize level-based payment options
+ */
+function initializeLevelBasedOptions() {
+    const levelSelect = document.getElementById('level');
+    const industrialTrainingCheckbox = document.getElementById('industrialTraining');
+    const projectSupervisionCheckbox = document.getElementById('projectSupervision');
+    
+    if (!levelSelect) return;
+    
+    levelSelect.addEventListener('change', function() {
+        const selectedLevel = parseInt(this.value);
+        
+        // Update level-specific styling
+        updateLevelStyling(selectedLevel);
+        
+        // Enable/disable level-specific options
+        if (industrialTrainingCheckbox) {
+            if (selectedLevel >= 400) {
+                industrialTrainingCheckbox.disabled = false;
+                industrialTrainingCheckbox.closest('.payment-item').style.opacity = '1';
+            } else {
+                industrialTrainingCheckbox.disabled = true;
+                industrialTrainingCheckbox.checked = false;
+                industrialTrainingCheckbox.closest('.payment-item').style.opacity = '0.6';
+            }
+        }
+        
+        if (projectSupervisionCheckbox) {
+            if (selectedLevel === 500) {
+                projectSupervisionCheckbox.disabled = false;
+                projectSupervisionCheckbox.closest('.payment-item').style.opacity = '1';
+            } else {
+                projectSupervisionCheckbox.disabled = true;
+                projectSupervisionCheckbox.checked = false;
+                projectSupervisionCheckbox.closest('.payment-item').style.opacity = '0.6';
+            }
+        }
+        
+        // Update amounts based on level (if needed)
+        updateLevelBasedAmounts(selectedLevel);
+        
+        // Recalculate totals
+        updatePaymentSummary();
+        updateSelectedItems();
+    });
+}
+
+/**
+ * Update styling based on selected level
+ */
+function updateLevelStyling(level) {
+    const paymentItems = document.querySelectorAll('.payment-item');
+    
+    // Remove existing level classes
+    paymentItems.forEach(item => {
+        item.classList.remove('level-100', 'level-200', 'level-300', 'level-400', 'level-500');
+    });
+    
+    // Add new level class
+    if (level) {
+        paymentItems.forEach(item => {
+            item.classList.add(`level-${level}`);
+        });
+    }
+}
+
+/**
+ * Update amounts based on level (example: different pricing for different levels)
+ */
+function updateLevelBasedAmounts(level) {
+    // Example: Adjust examination fee based on level
+    const examFeeCheckbox = document.getElementById('examFee');
+    const examFeeAmountElement = document.getElementById('examFeeAmount');
+    
+    if (examFeeCheckbox && examFeeAmountElement) {
+        let examFee = 3000; // Base fee
+        
+        // Adjust fee based on level
+        switch(level) {
+            case 500:
+                examFee = 5000; // Higher fee for final year
+                break;
+            case 400:
+                examFee = 4000; // Higher fee for 4th year
+                break;
+            default:
+                examFee = 3000;
+        }
+        
+        examFeeCheckbox.value = examFee;
+        examFeeAmountElement.textContent = `₦${examFee.toLocaleString()}`;
+    }
+}
+
+/**
+ * Initialize receipt upload functionality
+ */
+function initializeReceiptUpload() {
+    const receiptInput = document.getElementById('paymentReceipt');
+    const receiptPreview = document.getElementById('receiptPreview');
+    const receiptImage = document.getElementById('receiptImage');
+    
+    if (!receiptInput) return;
+    
+    receiptInput.addEventListener('change', function(e) {
+        const file = e.target.files[0];
+        
+        if (file) {
+            // Validate file type
+            const allowedTypes = ['image/jpeg', 'image/jpg', 'image/png', 'application/pdf'];
+            if (!allowedTypes.includes(file.type)) {
+                showPaymentError('Please upload a valid file (JPG, PNG, or PDF)');
+                this.value = '';
+                return;
+            }
+            
+            // Validate file size (5MB max)
+            const maxSize = 5 * 1024 * 1024; // 5MB
+            if (file.size > maxSize) {
+                showPaymentError('File size must be less than 5MB');
+                this.value = '';
+                return;
+            }
+            
+            // Show preview for images
+            if (file.type.startsWith('image/')) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    receiptImage.src = e.target.result;
+                    receiptPreview.style.display = 'block';
+                    
+                    // Add success feedback
+                    receiptInput.classList.add('is-valid');
+                    receiptInput.classList.remove('is-invalid');
+                };
+                reader.readAsDataURL(file);
+            } else if (file.type === 'application/pdf') {
+                receiptPreview.style.display = 'none';
+                receiptInput.classList.add('is-valid');
+                receiptInput.classList.remove('is-invalid');
+                showPaymentSuccess('PDF receipt uploaded successfully');
+            }
+        } else {
+            receiptPreview.style.display = 'none';
+            receiptInput.classList.remove('is-valid', 'is-invalid');
+        }
+    });
+    
+    // Drag and drop functionality
+    const uploadArea = receiptInput.closest('.card-body');
+    if (uploadArea) {
+        ['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
+            uploadArea.addEventListener(eventName, preventDefaults, false);
+        });
+        
+        function preventDefaults(e) {
+            e.preventDefault();
+            e.stopPropagation();
+        }
+        
+        ['dragenter', 'dragover'].forEach(eventName => {
+            uploadArea.addEventListener(eventName, highlight, false);
+        });
+        
+        ['dragleave', 'drop'].forEach(eventName => {
+            uploadArea.addEventListener(eventName, unhighlight, false);
+        });
+        
+        function highlight(e) {
+            uploadArea.classList.add('drag-over');
+        }
+        
+        function unhighlight(e) {
+            uploadArea.classList.remove('drag-over');
+        }
+        
+        uploadArea.addEventListener('drop', handleDrop, false);
+        
+        function handleDrop(e) {
+            const dt = e.dataTransfer;
+            const files = dt.files;
+            
+            if (files.length > 0) {
+                receiptInput.files = files;
+                receiptInput.dispatchEvent(new Event('change'));
+            }
+        }
+    }
+}
+
+/**
+ * Initialize form validation for payment portal
+ */
+function initializePaymentFormValidation() {
+    const form = document.getElementById('studentInfoForm');
+    const inputs = form ? form.querySelectorAll('input, select') : [];
+    
+    inputs.forEach(input => {
+        input.addEventListener('blur', function() {
+            validatePaymentField(this);
+        });
+        
+        input.addEventListener('input', function() {
+            // Clear validation state on input
+            this.classList.remove('is-valid', 'is-invalid');
+        });
+    });
+}
+
+/**
+ * Validate individual payment form field
+ */
+function validatePaymentField(field) {
+    const value = field.value.trim();
+    let isValid = true;
+    let errorMessage = '';
+    
+    switch(field.id) {
+        case 'fullName':
+            isValid = value.length >= 2;
+            errorMessage = 'Full name must be at least 2 characters';
+            break;
+            
+        case 'matricNumber':
+            isValid = /^\d{6}$/.test(value);
+            errorMessage = 'Matric number must be 6 digits';
+            break;
+            
+        case 'email':
+            isValid = /^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(value);
+            errorMessage = 'Please enter a valid email address';
+            break;
+            
+        case 'phoneNumber':
+            isValid = /^(\+234|0)[789]\d{9}$/.test(value.replace(/\s/g, ''));
+            errorMessage = 'Please enter a valid Nigerian phone number';
+            break;
+            
+        case 'level':
+            isValid = value !== '';
+            errorMessage = 'Please select your academic level';
+            break;
+    }
+    
+    if (isValid) {
+        field.classList.add('is-valid');
+        field.classList.remove('is-invalid');
+        clearFieldError(field.id);
+    } else {
+        field.classList.add('is-invalid');
+        field.classList.remove('is-valid');
+        showFieldError(field.id, errorMessage);
+    }
+    
+    return isValid;
+}
+
+/**
+ * Initialize payment submission
+ */
+function initializePaymentSubmission() {
+    const submitButton = document.getElementById('submitPayment');
+    
+    if (!submitButton) return;
+    
+    submitButton.addEventListener('click', function() {
+        if (validatePaymentForm()) {
+            submitPaymentForm();
+        }
+    });
+}
+
+/**
+ * Validate entire payment form
+ */
+function validatePaymentForm() {
+    const form = document.getElementById('studentInfoForm');
+    const requiredFields = form ? form.querySelectorAll('input[required], select[required]') : [];
+    const receiptInput = document.getElementById('paymentReceipt');
+    const selectedItems = document.querySelectorAll('.payment-checkbox:checked');
+    
+    let isValid = true;
+    
+    // Validate student information
+    requiredFields.forEach(field => {
+        if (!validatePaymentField(field)) {
+            isValid = false;
+        }
+    });
+    
+    // Validate receipt upload
+    if (!receiptInput.files.length) {
+        showPaymentError('Please upload your payment receipt');
+        receiptInput.classList.add('is-invalid');
+        isValid = false;
+    }
+    
+    // Validate selected items
+    if (selectedItems.length === 0) {
+        showPaymentError('Please select at least one payment item');
+        isValid = false;
+    }
+    
+    return isValid;
+}
+
+/**
+ * Submit payment form
+ */
+function submitPaymentForm() {
+    const submitButton = document.getElementById('submitPayment');
+    const originalText = submitButton.innerHTML;
+    
+    // Show loading state
+    submitButton.innerHTML = '<span class="loading-spinner me-2"></span>Processing...';
+    submitButton.disabled = true;
+    
+    // Collect form data
+    const formData = new FormData();
+    
+    // Student information
+    formData.append('fullName', document.getElementById('fullName').value);
+    formData.append('matricNumber', document.getElementById('matricNumber').value);
+    formData.append('level', document.getElementById('level').value);
+    formData.append('email', document.getElementById('email').value);
+    formData.append('phoneNumber', document.getElementById('phoneNumber').value);
+    
+    // Selected payment items
+    const selectedItems = document.querySelectorAll('.payment-checkbox:checked');
+    const items = Array.from(selectedItems).map(checkbox => ({
+        name: checkbox.getAttribute('data-name'),
+        amount: parseInt(checkbox.value)
+    }));
+    formData.append('paymentItems', JSON.stringify(items));
+    
+    // Total amount
+    const totalAmount = document.getElementById('totalAmount').textContent.replace('₦', '').replace(',', '');
+    formData.append('totalAmount', totalAmount);
+    
+    // Receipt file
+    const receiptFile = document.getElementById('paymentReceipt').files[0];
+    if (receiptFile) {
+        formData.append('receipt', receiptFile);
+    }
+    
+    // Additional information
+    formData.append('transactionRef', document.getElementById('transactionRef').value);
+    formData.append('paymentDate', document.getElementById('paymentDate').value);
+    
+    // Submit form to server
+    fetch('/submit-payment', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showPaymentSuccess(`${data.message} Your submission ID is: ${data.payment_id}`);
+            // Clear form
+            document.getElementById('studentInfoForm').reset();
+            document.getElementById('paymentReceipt').value = '';
+            document.getElementById('transactionRef').value = '';
+            document.getElementById('paymentDate').value = '';
+            document.getElementById('receiptPreview').style.display = 'none';
+            // Reset checkboxes
+            document.querySelectorAll('.payment-checkbox').forEach(cb => {
+                if (!cb.disabled || cb.id === 'departmentalDues' || cb.id === 'examFee') {
+                    cb.checked = cb.disabled;
+                }
+            });
+            updatePaymentSummary();
+            updateSelectedItems();
+        } else {
+            showPaymentError(data.error || 'Error submitting payment. Please try again.');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showPaymentError('Network error. Please check your connection and try again.');
+    })
+    .finally(() => {
+        // Reset button
+        submitButton.innerHTML = originalText;
+        submitButton.disabled = false;
+        
+        // Scroll to message
+        document.querySelector('.alert')?.scrollIntoView({ behavior: 'smooth' });
+    });
+}
+
+/**
+ * Show payment success message
+ */
+function showPaymentSuccess(message) {
+    removeExistingAlerts();
+    
+    const alert = document.createElement('div');
+    alert.className = 'alert alert-success alert-dismissible fade show';
+    alert.innerHTML = `
+        <i class="fas fa-check-circle me-2"></i>
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    const container = document.querySelector('#payment-main .container');
+    if (container) {
+        container.insertBefore(alert, container.firstChild);
+    }
+}
+
+/**
+ * Show payment error message
+ */
+function showPaymentError(message) {
+    removeExistingAlerts();
+    
+    const alert = document.createElement('div');
+    alert.className = 'alert alert-danger alert-dismissible fade show';
+    alert.innerHTML = `
+        <i class="fas fa-exclamation-circle me-2"></i>
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    const container = document.querySelector('#payment-main .container');
+    if (container) {
+        container.insertBefore(alert, container.firstChild);
+    }
+}
+
+/**
+ * Remove existing alert messages
+ */
+function removeExistingAlerts() {
+    const existingAlerts = document.querySelectorAll('#payment-main .alert');
+    existingAlerts.forEach(alert => alert.remove());
+}
+
+/**
+ * Format Nigerian phone number
+ */
+function formatPhoneNumber(phoneInput) {
+    phoneInput.addEventListener('input', function() {
+        let value = this.value.replace(/\D/g, '');
+        
+        if (value.startsWith('234')) {
+            value = '+' + value;
+        } else if (value.startsWith('0')) {
+            value = '+234' + value.substring(1);
+        } else if (value.length === 10) {
+            value = '+234' + value;
+        }
+        
+        this.value = value;
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    initializePaymentPortal();
+
+    // Auto-format phone number if field exists
+    const phoneInput = document.getElementById('phoneNumber');
+    if (phoneInput) {
+        formatPhoneNumber(phoneInput);
+    }
+});
@@ -0,0 +1,527 @@
+
+
+
+
+
+/**
+ * Agricultural and Environmental Engineering Department Website
+ * JavaScript functionality for enhanced user experience
+ */
+
+// DOM Content Loaded Event
+document.addEventListener('DOMContentLoaded', function() {
+    initializeScrollSpy();
+    initializeAnimations();
+    initializeContactFormValidation();
+    initializeNavbarBehavior();
+    initializeSmoothScrolling();
+    initializeFlashMessageHandling();
+    handleContactFormSubmission();
+});
+
+/**
+ * Initialize Bootstrap ScrollSpy for navigation
+ */
+function initializeScrollSpy() {
+    // Bootstrap ScrollSpy is initialized via data attributes in HTML
+    // Additional custom behavior can be added here
+    const navLinks = document.querySelectorAll('.navbar-nav .nav-link');
+    
+    navLinks.forEach(link => {
+        link.addEventListener('click', function() {
+            // Remove active class from all links
+            navLinks.forEach(l => l.classList.remove('active'));
+            // Add active class to clicked link
+            this.classList.add('active');
+            
+            // Close mobile menu if open
+            const navbarCollapse = document.querySelector('.navbar-collapse');
+            if (navbarCollapse.classList.contains('show')) {
+                navbarCollapse.classList.remove('show');
+            }
+        });
+    });
+}
+
+/**
+ * Initialize scroll animations
+ */
+function initializeAnimations() {
+    // Intersection Observer for scroll animations
+    const observerOptions = {
+        threshold: 0.1,
+        rootMargin: '0px 0px -50px 0px'
+    };
+
+    const observer = new IntersectionObserver(function(entries) {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.classList.add('animate');
+            }
+        });
+    }, observerOptions);
+
+    // Observe all animatable elements
+    const animateElements = document.querySelectorAll('.card, .notice-item, .gallery-item');
+    animateElements.forEach(el => {
+        el.classList.add('animate-on-scroll');
+        observer.observe(el);
+    });
+}
+
+/**
+ * Initialize form validation
+ */
+function initializeContactFormValidation() {
+    const contactForm = document.getElementById('contactForm');
+    
+    if (contactForm) {
+        contactForm.addEventListener('submit', function(e) {
+            if (!validateContactForm()) {
+                e.preventDefault();
+                e.stopPropagation();
+            }
+            
+            contactForm.classList.add('was-validated');
+        });
+    }
+}
+
+/**
+ * Validate contact form
+ */
+function validateContactForm() {
+    const name = document.getElementById('name').value.trim();
+    const email = document.getElementById('email').value.trim();
+    const subject = document.getElementById('subject').value;
+    const message = document.getElementById('message').value.trim();
+    
+    let isValid = true;
+    
+    // Name validation
+    if (name.length < 2) {
+        showFieldError('name', 'Name must be at least 2 characters long');
+        isValid = false;
+    } else {
+        clearFieldError('name');
+    }
+    
+    // Email validation
+    const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+    if (!emailRegex.test(email)) {
+        showFieldError('email', 'Please enter a valid email address');
+        isValid = false;
+    } else {
+        clearFieldError('email');
+    }
+    
+    // Subject validation
+    if (subject === '') {
+        showFieldError('subject', 'Please select a subject');
+        isValid = false;
+    } else {
+        clearFieldError('subject');
+    }
+    
+    // Message validation
+    if (message.length < 10) {
+        showFieldError('message', 'Message must be at least 10 characters long');
+        isValid = false;
+    } else {
+        clearFieldError('message');
+    }
+    
+    return isValid;
+}
+
+/**
+ * Show field error
+ */
+function showFieldError(fieldId, message) {
+    const field = document.getElementById(fieldId);
+    const existingError = field.parentNode.querySelector('.field-error');
+    
+    if (existingError) {
+        existingError.textContent = message;
+    } else {
+        const errorDiv = document.createElement('div');
+        errorDiv.className = 'field-error text-danger small mt-1';
+        errorDiv.textContent = message;
+        field.parentNode.appendChild(errorDiv);
+    }
+    
+    field.classList.add('is-invalid');
+}
+
+/**
+ * Clear field error
+ */
+function clearFieldError(fieldId) {
+    const field = document.getElementById(fieldId);
+    const errorDiv = field.parentNode.querySelector('.field-error');
+    
+    if (errorDiv) {
+        errorDiv.remove();
+    }
+    
+    field.classList.remove('is-invalid');
+    field.classList.add('is-valid');
+}
+
+/**
+ * Initialize navbar behavior
+ */
+function initializeNavbarBehavior() {
+    const navbar = document.querySelector('.navbar');
+    let lastScrollTop = 0;
+    
+    window.addEventListener('scroll', function() {
+        const currentScrollTop = window.pageYOffset || document.documentElement.scrollTop;
+        
+        // Add/remove shadow based on scroll position
+        if (currentScrollTop > 50) {
+            navbar.style.boxShadow = '0 2px 20px rgba(0, 0, 0, 0.2)';
+        } else {
+            navbar.style.boxShadow = '0 2px 10px rgba(0, 0, 0, 0.1)';
+        }
+        
+        // Update active navigation link based on scroll position
+        updateActiveNavLink();
+        
+        lastScrollTop = currentScrollTop;
+    });
+}
+
+/**
+ * Update active navigation link based on current section
+ */
+function updateActiveNavLink() {
+    const sections = document.querySelectorAll('section[id]');
+    const navLinks = document.querySelectorAll('.navbar-nav .nav-link');
+    
+    let current = '';
+    const scrollTop = window.pageYOffset;
+    
+    sections.forEach(section => {
+        const sectionTop = section.offsetTop - 100;
+        const sectionHeight = section.offsetHeight;
+        
+        if (scrollTop >= sectionTop && scrollTop < sectionTop + sectionHeight) {
+            current = section.getAttribute('id');
+        }
+    });
+    
+    navLinks.forEach(link => {
+        link.classList.remove('active');
+        if (link.getAttribute('href') === '#' + current) {
+            link.classList.add('active');
+        }
+    });
+}
+
+/**
+ * Initialize smooth scrolling for anchor links
+ */
+function initializeSmoothScrolling() {
+    const anchorLinks = document.querySelectorAll('a[href^="#"]');
+    
+    anchorLinks.forEach(link => {
+        link.addEventListener('click', function(e) {
+            const targetId = this.getAttribute('href').substring(1);
+            const targetElement = document.getElementById(targetId);
+            
+            if (targetElement) {
+                e.preventDefault();
+                
+                const offsetTop = targetElement.offsetTop - 80; // Account for fixed navbar
+                
+                window.scrollTo({
+                    top: offsetTop,
+                    behavior: 'smooth'
+                });
+            }
+        });
+    });
+}
+
+/**
+ * Initialize flash message handling
+ */
+function initializeFlashMessageHandling() {
+    const flashMessages = document.querySelectorAll('.flash-messages .alert');
+    
+    flashMessages.forEach(message => {
+        // Auto-hide success messages after 5 seconds
+        if (message.classList.contains('alert-success')) {
+            setTimeout(() => {
+                message.style.opacity = '0';
+                message.style.transform = 'translateX(100%)';
+                setTimeout(() => {
+                    if (message.parentNode) {
+                        message.parentNode.removeChild(message);
+                    }
+                }, 300);
+            }, 5000);
+        }
+    });
+}
+
+/**
+ * Handle contact form submission with loading state
+ */
+function handleContactFormSubmission() {
+    const contactForm = document.getElementById('contactForm');
+    
+    if (contactForm) {
+        contactForm.addEventListener('submit', function() {
+            const submitButton = contactForm.querySelector('button[type="submit"]');
+            const originalText = submitButton.innerHTML;
+            
+            // Show loading state
+            submitButton.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Sending...';
+            submitButton.disabled = true;
+            
+            // Note: The actual form submission is handled by Flask
+            // This is just for UI feedback
+        });
+    }
+}
+
+/**
+ * Initialize gallery lightbox functionality
+ */
+function initializeGallery() {
+    const galleryItems = document.querySelectorAll('.gallery-item');
+    
+    galleryItems.forEach(item => {
+        item.addEventListener('click', function() {
+            // This would open a lightbox or modal for gallery images
+            // For now, we'll just add a click effect
+            this.style.transform = 'scale(0.95)';
+            setTimeout(() => {
+                this.style.transform = '';
+            }, 150);
+        });
+    });
+}
+
+/**
+ * Initialize search functionality (if needed)
+ */
+function initializeSearch() {
+    const searchInput = document.querySelector('#searchInput');
+    
+    if (searchInput) {
+        searchInput.addEventListener('input', function() {
+            const query = this.value.toLowerCase().trim();
+            
+            if (query.length > 2) {
+                // Implement search logic here
+                highlightSearchResults(query);
+            } else {
+                clearSearchHighlights();
+            }
+        });
+    }
+}
+
+/**
+ * Highlight search results
+ */
+function highlightSearchResults(query) {
+    // This function would highlight search terms in the content
+    const textNodes = getTextNodes(document.body);
+    
+    textNodes.forEach(node => {
+        if (node.textContent.toLowerCase().includes(query)) {
+            // Highlight matching text
+            const parent = node.parentNode;
+            const wrapper = document.createElement('span');
+            wrapper.className = 'search-highlight';
+            
+            const text = node.textContent;
+            const regex = new RegExp(`(${query})`, 'gi');
+            wrapper.innerHTML = text.replace(regex, '<mark>$1</mark>');
+            
+            parent.replaceChild(wrapper, node);
+        }
+    });
+}
+
+/**
+ * Clear search highlights
+ */
+function clearSearchHighlights() {
+    const highlights = document.querySelectorAll('.search-highlight');
+    highlights.forEach(highlight => {
+        const parent = highlight.parentNode;
+        parent.replaceChild(document.createTextNode(highlight.textContent), highlight);
+    });
+}
+
+/**
+ * Get all text nodes in an element
+ */
+function getTextNodes(element) {
+    const textNodes = [];
+    const walker = document.createTreeWalker(
+        element,
+        NodeFilter.SHOW_TEXT,
+        null,
+        false
+    );
+    
+    let node;
+    while (node = walker.nextNode()) {
+        if (node.textContent.trim().length > 0) {
+            textNodes.push(node);
+        }
+    }
+    
+    return textNodes;
+}
+
+/**
+ * Initialize tooltip functionality
+ */
+function initializeTooltips() {
+    // Initialize Bootstrap tooltips if needed
+    const tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));
+    const tooltipList = tooltipTriggerList.map(function (tooltipTriggerEl) {
+        return new bootstrap.Tooltip(tooltipTriggerEl);
+    });
+}
+
+/**
+ * Initialize print functionality
+ */
+function initializePrintFunctionality() {
+    const printButtons = document.querySelectorAll('.print-btn');
+    
+    printButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            window.print();
+        });
+    });
+}
+
+/**
+ * Handle back to top functionality
+ */
+function initializeBackToTop() {
+    // Create back to top button
+    const backToTopButton = document.createElement('button');
+    backToTopButton.innerHTML = '<i class="fas fa-chevron-up"></i>';
+    backToTopButton.className = 'btn btn-primary btn-back-to-top position-fixed';
+    backToTopButton.style.cssText = `
+        bottom: 30px;
+        right: 30px;
+        z-index: 1000;
+        border-radius: 50%;
+        width: 50px;
+        height: 50px;
+        opacity: 0;
+        visibility: hidden;
+        transition: all 0.3s ease;
+    `;
+    
+    document.body.appendChild(backToTopButton);
+    
+    // Show/hide button based on scroll position
+    window.addEventListener('scroll', function() {
+        if (window.pageYOffset > 300) {
+            backToTopButton.style.opacity = '1';
+            backToTopButton.style.visibility = 'visible';
+        } else {
+            backToTopButton.style.opacity = '0';
+            backToTopButton.style.visibility = 'hidden';
+        }
+    });
+    
+    // Smooth scroll to top
+    backToTopButton.addEventListener('click', function() {
+        window.scrollTo({
+            top: 0,
+            behavior: 'smooth'
+        });
+    });
+}
+
+// Initialize back to top on load
+document.addEventListener('DOMContentLoaded', function() {
+    initializeBackToTop();
+});
+
+/**
+ * Utility function to debounce rapid function calls
+ */
+function debounce(func, wait, immediate) {
+    let timeout;
+    return function executedFunction() {
+        const context = this;
+        const args = arguments;
+        
+        const later = function() {
+            timeout = null;
+            if (!immediate) func.apply(context, args);
+        };
+        
+        const callNow = immediate && !timeout;
+        clearTimeout(timeout);
+        timeout = setTimeout(later, wait);
+        
+        if (callNow) func.apply(context, args);
+    };
+}
+
+/**
+ * Initialize accessibility features
+ */
+function initializeAccessibility() {
+    // Add keyboard navigation support
+    document.addEventListener('keydown', function(e) {
+        // Escape key closes any open modals or dropdowns
+        if (e.key === 'Escape') {
+            const openModals = document.querySelectorAll('.modal.show');
+            openModals.forEach(modal => {
+                const bsModal = bootstrap.Modal.getInstance(modal);
+                if (bsModal) bsModal.hide();
+            });
+        }
+        
+        // Enter key on card elements triggers click
+        if (e.key === 'Enter' && e.target.classList.contains('card')) {
+            e.target.click();
+        }
+    });
+    
+    // Add focus indicators for keyboard navigation
+    document.addEventListener('keydown', function(e) {
+        if (e.key === 'Tab') {
+            document.body.classList.add('keyboard-navigation');
+        }
+    });
+    
+    document.addEventListener('mousedown', function() {
+        document.body.classList.remove('keyboard-navigation');
+    });
+}
+
+// Initialize all functionality
+document.addEventListener('DOMContentLoaded', function() {
+    initializeAccessibility();
+    initializeGallery();
+    initializeTooltips();
+    initializePrintFunctionality();
+});
+
+// Performance monitoring
+window.addEventListener('load', function() {
+    console.log('Agricultural Engineering Website loaded successfully');
+    
+    // Log performance metrics
+    if ('performance' in window) {
+        const loadTime = performance.timing.loadEventEnd - performance.timing.navigationStart;
+        console.log(`Page load time: ${loadTime}ms`);
+    }
+});
@@ -0,0 +1,210 @@
+"""Content-addressed storage for uploaded receipts.
+
+An upload is copied in fixed-size chunks and hashed on the way, and its
+key is the SHA-256 of the contents plus the original extension
+(``<sha256>.pdf``). Identical uploads therefore share one stored object,
+and the key doubles as a strong ETag.
+
+``LocalFileStorage`` keeps objects in a sharded directory tree
+(``ab/cd/<key>``) so no single directory grows unbounded.
+``MemoryObjectStore`` is a stand-in for a remote object store with the
+same interface, for development and tests.
+"""
+import hashlib
+import io
+import os
+import re
+import threading
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+KEY_RE = re.compile(r'^[0-9a-f]{64}(\.[a-z0-9]{1,10}){1,2}$')
+
+
+def is_content_key(name):
+    """True if ``name`` is a key produced by a storage backend (not a legacy file name)."""
+    return bool(KEY_RE.match(name or ''))
+
+
+class StoredObject:
+    """Result of ``ReceiptStorage.save``."""
+
+    __slots__ = ('key', 'size', 'created')
+
+    def __init__(self, key, size, created):
+        self.key = key
+        self.size = size
+        self.created = created  # False when an identical object already existed
+
+
+class ReceiptStorage:
+    """Interface shared by the storage backends."""
+
+    def save(self, stream, extension):
+        """Store everything readable from ``stream``; returns a ``StoredObject``."""
+        raise NotImplementedError
+
+    def put(self, key, data):
+        """Store ``data`` under a key derived from an existing object (e.g. its thumbnail)."""
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def open(self, key):
+        """Binary file object for ``key``; raises ``FileNotFoundError`` if missing."""
+        raise NotImplementedError
+
+    def local_path(self, key):
+        """Filesystem path for ``key`` if the backend has one (enables sendfile), else None."""
+        return None
+
+    def modified_at(self, key):
+        """Unix timestamp of when ``key`` was stored."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+
+def _normalize_extension(extension):
+    extension = (extension or 'bin').lower().lstrip('.')
+    if not re.match(r'^[a-z0-9]{1,10}$', extension):
+        raise ValueError(f"Invalid file extension: {extension!r}")
+    return extension
+
+
+class LocalFileStorage(ReceiptStorage):
+    """Objects on the local filesystem under ``root/ab/cd/<key>``.
+
+    Names that are not content keys (receipts saved before this storage
+    existed) are looked up directly under ``root``.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def _path(self, key):
+        if is_content_key(key):
+            return os.path.join(self.root, key[:2], key[2:4], key)
+        if not key or os.path.basename(key) != key or key.startswith('.'):
+            raise ValueError(f"Invalid receipt key: {key!r}")
+        return os.path.join(self.root, key)
+
+    def save(self, stream, extension):
+        extension = _normalize_extension(extension)
+        hasher = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_dir, f"{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}")
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            key = f"{hasher.hexdigest()}.{extension}"
+            path = self._path(key)
+            if os.path.exists(path):
+                return StoredObject(key, size, created=False)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            return StoredObject(key, size, created=True)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(self.tmp_dir, f"{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key):
+        try:
+            return os.path.isfile(self._path(key))
+        except ValueError:
+            return False
+
+    def open(self, key):
+        try:
+            return open(self._path(key), 'rb')
+        except ValueError:
+            raise FileNotFoundError(key)
+
+    def local_path(self, key):
+        return os.path.abspath(self._path(key))
+
+    def modified_at(self, key):
+        return os.path.getmtime(self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except (FileNotFoundError, ValueError):
+            pass
+
+
+class MemoryObjectStore(ReceiptStorage):
+    """In-process object store with the same interface, standing in for S3-style storage."""
+
+    def __init__(self):
+        self._objects = {}
+        self._lock = threading.Lock()
+
+    def save(self, stream, extension):
+        extension = _normalize_extension(extension)
+        hasher = hashlib.sha256()
+        buffer = io.BytesIO()
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            buffer.write(chunk)
+        key = f"{hasher.hexdigest()}.{extension}"
+        with self._lock:
+            if key in self._objects:
+                return StoredObject(key, buffer.tell(), created=False)
+            self._objects[key] = (buffer.getvalue(), time.time())
+        return StoredObject(key, buffer.tell(), created=True)
+
+    def put(self, key, data):
+        with self._lock:
+            self._objects[key] = (bytes(data), time.time())
+
+    def exists(self, key):
+        return key in self._objects
+
+    def open(self, key):
+        try:
+            return io.BytesIO(self._objects[key][0])
+        except KeyError:
+            raise FileNotFoundError(key)
+
+    def modified_at(self, key):
+        try:
+            return self._objects[key][1]
+        except KeyError:
+            raise FileNotFoundError(key)
+
+    def delete(self, key):
+        with self._lock:
+            self._objects.pop(key, None)
+
+
+def create_storage(backend, root):
+    """Build the backend named by ``backend`` ('local' or 'memory')."""
+    if backend == 'local':
+        return LocalFileStorage(root)
+    if backend == 'memory':
+        return MemoryObjectStore()
+    raise ValueError(f"Unknown receipt storage backend: {backend!r}")
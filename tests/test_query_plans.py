@@ -0,0 +1,39 @@
+"""Plan regression tests for the hot queries in benchmarks/query_plans.py.
+
+Each query must still use the index it was tuned for. Pending migrations
+are applied first, so an empty database works. Skipped when DATABASE_URL
+is not set or the database cannot be reached.
+"""
+import os
+
+import pytest
+
+from benchmarks.query_plans import HOT_QUERIES, check
+
+
+@pytest.fixture(scope='module')
+def plan_cursor():
+    if not os.environ.get('DATABASE_URL'):
+        pytest.skip('DATABASE_URL is not set')
+    import psycopg
+
+    from app import create_tables, get_database_url, get_db_connection
+
+    try:
+        psycopg.connect(get_database_url(), connect_timeout=5).close()
+    except psycopg.OperationalError as e:
+        pytest.skip(f'database unavailable: {e}')
+    create_tables()
+    with get_db_connection() as conn, conn.cursor() as cur:
+        # Small test databases would otherwise be scanned sequentially
+        cur.execute("SET LOCAL enable_seqscan = off")
+        yield cur
+        conn.rollback()
+
+
+@pytest.mark.parametrize('name', list(HOT_QUERIES))
+def test_hot_query_uses_its_index(plan_cursor, name):
+    query, params, index = HOT_QUERIES[name]
+    ok, used, seq_scans = check(plan_cursor, query, params, index)
+    assert ok, f"expected {index}; plan uses {', '.join(used) or 'no index'}" + (
+        f", seq scan on {', '.join(seq_scans)}" if seq_scans else '')
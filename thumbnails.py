@@ -0,0 +1,126 @@
+"""Small JPEG previews of uploaded receipts for the admin review queue.
+
+``ReceiptThumbnailer.submit`` renders a thumbnail on a background thread
+right after a receipt is stored; ``get`` renders one on demand if it is
+missing (older receipts, or a worker that died before finishing). PDF
+receipts are previewed from their first page when ``pypdfium2`` is
+installed. Thumbnails live in the same storage backend as the receipts,
+next to the original.
+"""
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; the review queue then shows no previews
+    Image = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # without it PDF receipts have no preview
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (200, 200)
+THUMBNAIL_QUALITY = 70
+
+
+def thumbnail_key(key):
+    """Storage key of the thumbnail for receipt ``key``."""
+    return f"{key.rsplit('.', 1)[0]}.thumb.jpg"
+
+
+class ReceiptThumbnailer:
+    """Renders receipt thumbnails into ``storage`` on a small thread pool."""
+
+    def __init__(self, storage, size=THUMBNAIL_SIZE, workers=2):
+        self.storage = storage
+        self.size = size
+        self.workers = workers
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return Image is not None
+
+    def can_preview(self, key):
+        extension = key.rsplit('.', 1)[-1].lower()
+        return self.available and (extension != 'pdf' or pdfium is not None)
+
+    def submit(self, key):
+        """Queue a thumbnail for ``key`` unless one exists or is already being rendered."""
+        if not self.can_preview(key) or self.storage.exists(thumbnail_key(key)):
+            return
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='thumbnail')
+        self._executor.submit(self._run, key)
+
+    def _run(self, key):
+        try:
+            self.generate(key)
+        except Exception as e:
+            logger.warning(f"Could not render thumbnail for receipt {key}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def get(self, key):
+        """Return the thumbnail key for ``key``, rendering it now if needed; None if no preview is possible."""
+        thumb = thumbnail_key(key)
+        if self.storage.exists(thumb):
+            return thumb
+        if not self.can_preview(key) or not self.storage.exists(key):
+            return None
+        try:
+            return self.generate(key)
+        except Exception as e:
+            logger.warning(f"Could not render thumbnail for receipt {key}: {e}")
+            return None
+
+    def generate(self, key):
+        with self.storage.open(key) as f:
+            data = f.read()
+        if key.lower().endswith('.pdf'):
+            image = self._render_pdf(data)
+        else:
+            image = Image.open(io.BytesIO(data))
+            image.draft('RGB', self.size)  # lets JPEG decode at reduced scale
+            image = ImageOps.exif_transpose(image)
+
+        image.thumbnail(self.size, Image.LANCZOS)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+
+        out = io.BytesIO()
+        image.save(out, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+        thumb = thumbnail_key(key)
+        self.storage.put(thumb, out.getvalue())
+        return thumb
+
+    def _render_pdf(self, data):
+        document = pdfium.PdfDocument(data)
+        try:
+            page = document[0]
+            width, height = page.get_size()
+            scale = max(self.size[0] / width, self.size[1] / height) * 2
+            return page.render(scale=scale).to_pil()
+        finally:
+            document.close()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)